@@ -54,6 +54,7 @@
 import spack.util.crypto
 import spack.util.file_cache as file_cache
 import spack.util.gpg
+import spack.util.hash_index
 import spack.util.parallel
 import spack.util.path
 import spack.util.spack_json as sjson
@@ -61,6 +62,7 @@
 import spack.util.timer as timer
 import spack.util.url as url_util
 import spack.util.web as web_util
+import spack.version as vn
 from spack import traverse
 from spack.caches import misc_cache_location
 from spack.oci.image import (
@@ -111,6 +113,94 @@ def __init__(self, root):
         self._read_transaction_impl = llnl.util.lang.nullcontext
 
 
+class LazyBuildCacheIndex:
+    """Read-only view of a buildcache ``index.json``, backed by a memory-mapped hash index
+    derived from it.
+
+    The derived index is built once per fetched ``index.json``, and allows to look up records
+    by DAG hash without deserializing the entire buildcache index. Concrete specs are constructed
+    on first access, and share their dependency nodes.
+    """
+
+    #: Flag of records that are available for installation, i.e. in the buildcache or external
+    AVAILABLE = 1
+
+    def __init__(self, path: str) -> None:
+        self._index = spack.util.hash_index.HashIndex(path)
+        self._spec_reader = spack_db.reader(
+            vn.StandardVersion.from_string(self._index.metadata["version"])
+        )
+        self._specs: Dict[str, spack.spec.Spec] = {}
+
+    @staticmethod
+    def build(index_json: str, path: str) -> bool:
+        """Derive a hash index from a buildcache ``index.json``.
+
+        Returns False, without writing anything, if the index is not in the current database
+        format.
+        """
+        with open(index_json, "r", encoding="utf-8") as f:
+            db = json.load(f)["database"]
+
+        if vn.Version(db["version"]) != spack_db._DB_VERSION:
+            return False
+
+        records = []
+        for dag_hash, rec in db["installs"].items():
+            node = rec["spec"]
+            node[ht.dag_hash.name] = dag_hash
+            available = node.get("external") or rec.get("in_buildcache", False)
+            data = json.dumps(node, separators=(",", ":")).encode("utf-8")
+            records.append((dag_hash, data, LazyBuildCacheIndex.AVAILABLE if available else 0))
+
+        spack.util.hash_index.write(path, records, {"version": db["version"]})
+        return True
+
+    def close(self) -> None:
+        self._index.close()
+
+    def __contains__(self, dag_hash: str) -> bool:
+        record = self._index.get(dag_hash)
+        return record is not None and bool(record[1] & self.AVAILABLE)
+
+    def hashes(self) -> Iterable[str]:
+        """Iterate over the DAG hashes of the specs available in the buildcache."""
+        return self._index.keys(flags=self.AVAILABLE)
+
+    def spec(self, dag_hash: str) -> Optional[spack.spec.Spec]:
+        """Return the concrete spec with the given hash, if it is available in the buildcache."""
+        if dag_hash not in self:
+            return None
+        return self._node(dag_hash)
+
+    def _node(self, dag_hash: str) -> Optional[spack.spec.Spec]:
+        if dag_hash in self._specs:
+            return self._specs[dag_hash]
+
+        record = self._index.get(dag_hash)
+        if record is None:
+            return None
+
+        node_dict = json.loads(record[0])
+        spec = self._spec_reader.from_node_dict(node_dict)
+        for dname, dhash, dtypes, _, virtuals in self._spec_reader.read_specfile_dep_specs(
+            node_dict.get("dependencies", [])
+        ):
+            child = self._node(dhash)
+            if child is None:
+                tty.warn(
+                    f"Missing dependency not in buildcache index: "
+                    f"{spec.cformat('{name}{/hash:7}')} needs {dname}-{dhash[:7]}"
+                )
+                continue
+            spec._add_dependency(child, depflag=dt.canonicalize(dtypes), virtuals=virtuals)
+
+        # Dependencies are complete at this point, so hashes can be cached safely
+        spec._mark_root_concrete()
+        self._specs[dag_hash] = spec
+        return spec
+
+
 class FetchCacheError(Exception):
     """Error thrown when fetching the cache failed, usually a composite error list."""
 
@@ -172,6 +262,9 @@ def __init__(self, cache_root: Optional[str] = None):
         # whether the fetch succeeded or not.
         self._last_fetch_times: Dict[str, float] = {}
 
+        # mapping from mirror urls to the memory-mapped views of their cached indices
+        self._mirror_indices: Dict[str, LazyBuildCacheIndex] = {}
+
         # _mirrors_for_spec is a dictionary mapping DAG hashes to lists of
         # entries indicating mirrors where that concrete spec can be found.
         # Each entry is a dictionary consisting of:
@@ -199,6 +292,7 @@ def _init_local_index_cache(self):
     def clear(self):
         """For testing purposes we need to be able to empty the cache and
         clear associated data structures."""
+        self._close_mirror_indices()
         if self._index_file_cache:
             self._index_file_cache.destroy()
             self._index_file_cache = None
@@ -207,6 +301,11 @@ def clear(self):
         self._last_fetch_times = {}
         self._mirrors_for_spec = {}
 
+    def _close_mirror_indices(self):
+        for index in self._mirror_indices.values():
+            index.close()
+        self._mirror_indices = {}
+
     def _write_local_index_cache(self):
         self._init_local_index_cache()
         cache_key = self._index_contents_key
@@ -223,15 +322,48 @@ def regenerate_spec_cache(self, clear_existing=False):
         if clear_existing:
             self._specs_already_associated = set()
             self._mirrors_for_spec = {}
+            self._close_mirror_indices()
 
         for mirror_url in self._local_index_cache:
             cache_entry = self._local_index_cache[mirror_url]
             cached_index_path = cache_entry["index_path"]
             cached_index_hash = cache_entry["index_hash"]
             if cached_index_hash not in self._specs_already_associated:
-                self._associate_built_specs_with_mirror(cached_index_path, mirror_url)
+                if not self._load_mirror_index(cached_index_path, mirror_url):
+                    self._associate_built_specs_with_mirror(cached_index_path, mirror_url)
                 self._specs_already_associated.add(cached_index_hash)
 
+    def _load_mirror_index(self, cache_key, mirror_url) -> bool:
+        """Map in memory the hash index derived from a cached ``index.json``, deriving it first
+        if needed. Returns False if the cached index can't be read this way."""
+        assert self._index_file_cache is not None, "the local index cache is not initialized"
+        derived_path = self._index_file_cache.cache_path(_derived_index_key(cache_key))
+        try:
+            if not os.path.exists(derived_path):
+                self._index_file_cache.init_entry(cache_key)
+                with self._index_file_cache.read_transaction(cache_key):
+                    cache_path = self._index_file_cache.cache_path(cache_key)
+                    if not LazyBuildCacheIndex.build(cache_path, derived_path):
+                        return False
+            index = LazyBuildCacheIndex(derived_path)
+        except (OSError, ValueError, KeyError, spack.error.SpackError) as e:
+            tty.debug(f"Cannot use a hash index for the buildcache index of {mirror_url}: {e}")
+            return False
+
+        old_index = self._mirror_indices.pop(mirror_url, None)
+        if old_index is not None:
+            old_index.close()
+        self._mirror_indices[mirror_url] = index
+        return True
+
+    def _remove_cached_index(self, cache_key):
+        self._index_file_cache.remove(cache_key)
+        derived_path = self._index_file_cache.cache_path(_derived_index_key(cache_key))
+        try:
+            os.remove(derived_path)
+        except OSError:
+            pass
+
     def _associate_built_specs_with_mirror(self, cache_key, mirror_url):
         tmpdir = tempfile.mkdtemp()
 
@@ -284,6 +416,13 @@ def get_all_built_specs(self):
             if len(self._mirrors_for_spec[dag_hash]) > 0:
                 spec_list.append(self._mirrors_for_spec[dag_hash][0]["spec"])
 
+        seen = set(self._mirrors_for_spec)
+        for index in self._mirror_indices.values():
+            for dag_hash in index.hashes():
+                if dag_hash not in seen:
+                    seen.add(dag_hash)
+                    spec_list.append(index.spec(dag_hash))
+
         return spec_list
 
     def find_built_spec(self, spec, mirrors_to_check=None):
@@ -327,9 +466,14 @@ def find_by_hash(self, find_hash, mirrors_to_check=None):
             mirrors_to_check: Optional mapping containing mirrors to check.  If
                 None, just assumes all configured mirrors.
         """
-        if find_hash not in self._mirrors_for_spec:
-            return []
-        results = self._mirrors_for_spec[find_hash]
+        results = list(self._mirrors_for_spec.get(find_hash, []))
+        for mirror_url, index in self._mirror_indices.items():
+            if any(r["mirror_url"] == mirror_url for r in results):
+                continue
+            spec = index.spec(find_hash)
+            if spec is not None:
+                results.append({"mirror_url": mirror_url, "spec": spec})
+
         if not mirrors_to_check:
             return results
         mirror_urls = mirrors_to_check.values()
@@ -449,7 +593,7 @@ def update(self, with_cooldown=False):
         for item in items_to_remove:
             url = item["url"]
             cache_key = item["cache_key"]
-            self._index_file_cache.remove(cache_key)
+            self._remove_cached_index(cache_key)
             del self._local_index_cache[url]
 
         # Iterate the configured mirrors now.  Any mirror urls we do not
@@ -542,13 +686,18 @@ def _fetch_and_cache_index(self, mirror_url, cache_entry={}):
         # clean up the old cache_key if necessary
         old_cache_key = cache_entry.get("index_path", None)
         if old_cache_key:
-            self._index_file_cache.remove(old_cache_key)
+            self._remove_cached_index(old_cache_key)
 
         # We fetched an index and updated the local index cache, we should
         # regenerate the spec cache as a result.
         return True
 
 
+def _derived_index_key(cache_key: str) -> str:
+    """Return the key of the hash index derived from a cached ``index.json``"""
+    return f"{os.path.splitext(cache_key)[0]}.hidx"
+
+
 def binary_index_location():
     """Set up a BinaryCacheIndex for remote buildcache dbs in the user's homedir."""
     cache_root = os.path.join(misc_cache_location(), "indices")
@@ -2136,6 +2285,24 @@ def fetch_url_to_mirror(url):
     return None
 
 
+def prefetch_tarball(spec, unsigned: Optional[bool] = False, mirrors_for_spec=None):
+    """Download the binary tarball for a spec like :func:`download_tarball`, and compute the
+    checksum of the tarball, so that extraction does not need to read it again. Meant to be run
+    in a background thread, ahead of the extraction.
+
+    Returns ``None`` if the tarball could not be downloaded, or the result of
+    :func:`download_tarball` with an additional ``tarball_checksum`` entry.
+    """
+    download_result = download_tarball(spec, unsigned, mirrors_for_spec)
+    if download_result is None:
+        return None
+
+    download_result["tarball_checksum"] = spack.util.crypto.checksum(
+        hashlib.sha256, download_result["tarball_stage"].save_filename
+    )
+    return download_result
+
+
 def dedupe_hardlinks_if_necessary(root, buildinfo):
     """Updates a buildinfo dict for old archives that did not dedupe hardlinks. De-duping hardlinks
     is necessary when relocating files in parallel and in-place. This means we must preserve inodes
@@ -2252,17 +2419,22 @@ def relocate_package(spec: spack.spec.Spec) -> None:
     links = [os.path.join(spec_prefix, f) for f in buildinfo.get("relocate_links", [])]
 
     platform = spack.platforms.by_name(spec.platform)
-    if "macho" in platform.binary_formats:
+    is_macho = "macho" in platform.binary_formats
+    if is_macho:
         relocate.relocate_macho_binaries(binaries, prefix_to_prefix)
-    elif "elf" in platform.binary_formats:
-        relocate.relocate_elf_binaries(binaries, prefix_to_prefix)
 
     relocate.relocate_links(links, prefix_to_prefix)
-    relocate.relocate_text(textfiles, prefix_to_prefix)
-    changed_files = relocate.relocate_text_bin(binaries, prefix_to_prefix)
+
+    # Files are relocated in place by worker processes, which is safe since hardlinks are deduped
+    changed_files = relocate.relocate_text_and_binaries(
+        textfiles,
+        binaries,
+        prefix_to_prefix,
+        elf=not is_macho and "elf" in platform.binary_formats,
+    )
 
     # Add ad-hoc signatures to patched macho files when on macOS.
-    if "macho" in platform.binary_formats and sys.platform == "darwin":
+    if is_macho and sys.platform == "darwin":
         codesign = which("codesign")
         if not codesign:
             return
@@ -2427,8 +2599,10 @@ def extract_tarball(spec, download_result, force=False, timer=timer.NULL_TIMER):
                 "or configure the mirror with signed: false."
             )
 
-        # compute the sha256 checksum of the tarball
-        local_checksum = spack.util.crypto.checksum(hashlib.sha256, tarfile_path)
+        # compute the sha256 checksum of the tarball, unless it was done while prefetching
+        local_checksum = download_result.get("tarball_checksum") or spack.util.crypto.checksum(
+            hashlib.sha256, tarfile_path
+        )
         expected = bchecksum["hash"]
 
         # if the checksums don't match don't install
@@ -1235,6 +1235,17 @@ def _make_runnable(self, dep: spack.spec.Spec, env: EnvironmentModifications):
                 env.prepend_path("PATH", bin_dir)
 
 
+def _limit_build_jobs(jobs: int) -> None:
+    """Cap the number of jobs used by the build in the current process to ``jobs``."""
+    if "command_line" in spack.config.CONFIG.scopes:
+        # A -j argument on the command line has precedence over any other scope
+        spack.config.set("config:build_jobs", jobs, scope="command_line")
+    else:
+        spack.config.CONFIG.push_scope(
+            spack.config.InternalConfigScope("build_jobs", {"config": {"build_jobs": jobs}})
+        )
+
+
 def _setup_pkg_and_run(
     serialized_pkg: "spack.subprocess_context.PackageInstallContext",
     function: Callable,
@@ -1293,6 +1304,10 @@ def _setup_pkg_and_run(
 
         pkg = serialized_pkg.restore()
 
+        # The parent may run multiple builds at once, and share its job budget among them
+        if kwargs.get("build_jobs") is not None:
+            _limit_build_jobs(kwargs["build_jobs"])
+
         if not kwargs.get("fake", False):
             kwargs["unmodified_env"] = os.environ.copy()
             kwargs["env_modifications"] = setup_package(
@@ -1362,30 +1377,102 @@ def _setup_pkg_and_run(
             input_pipe.close()
 
 
-def start_build_process(pkg, function, kwargs):
-    """Create a child process to do part of a spack build.
+class BuildProcess:
+    """A child process, created by ``spawn_build_process()``, that runs part of a Spack build.
 
-    Args:
+    The parent can check without blocking whether the child is done with ``poll()``, and then
+    collect its result with ``complete()``.
+    """
 
-        pkg (spack.package_base.PackageBase): package whose environment we should set up the
-            child process for.
-        function (typing.Callable): argless function to run in the child
-            process.
+    def __init__(
+        self,
+        pkg: spack.package_base.PackageBase,
+        process: multiprocessing.Process,
+        read_pipe: Connection,
+    ) -> None:
+        self.pkg = pkg
+        self.process = process
+        self.read_pipe = read_pipe
 
-    Usage::
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
 
-        def child_fun():
-            # do stuff
-        build_env.start_build_process(pkg, child_fun)
+    @property
+    def sentinel(self) -> Connection:
+        """Object that becomes ready, in the sense of ``multiprocessing.connection.wait``,
+        once the child has sent its result or died.
+        """
+        return self.read_pipe
+
+    def poll(self) -> bool:
+        """Return True if the child process has sent its result, or has exited."""
+        return self.read_pipe.poll() or not self.process.is_alive()
+
+    def terminate(self) -> None:
+        """Terminate the child process, and wait for it to exit."""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.read_pipe.close()
+
+    def _exitcode_msg(self) -> str:
+        exitcode = self.process.exitcode
+        if exitcode is None:
+            return "still running"
+        typ = "exit" if exitcode >= 0 else "signal"
+        return f"{typ} {abs(exitcode)}"
+
+    def complete(self):
+        """Wait for the child process to finish, and return the value returned by the function
+        that it ran. Errors in the child are raised in the parent.
+        """
+        try:
+            child_result = self.read_pipe.recv()
+        except EOFError:
+            self.process.join()
+            raise InstallError(f"The process has stopped unexpectedly ({self._exitcode_msg()})")
+        finally:
+            self.read_pipe.close()
 
-    The child process is run with the build environment set up by
-    spack.build_environment.  This allows package authors to have full
-    control over the environment, etc. without affecting other builds
-    that might be executed in the same spack call.
+        self.process.join()
 
-    If something goes wrong, the child process catches the error and
-    passes it to the parent wrapped in a ChildError.  The parent is
-    expected to handle (or re-raise) the ChildError.
+        # If returns a StopPhase, raise it
+        if isinstance(child_result, spack.error.StopPhase):
+            # do not print
+            raise child_result
+
+        # let the caller know which package went wrong.
+        if isinstance(child_result, InstallError):
+            child_result.pkg = self.pkg
+
+        if isinstance(child_result, ChildError):
+            # If the child process raised an error, print its output here rather
+            # than waiting until the call to SpackError.die() in main(). This
+            # allows exception handling output to be logged from within Spack.
+            # see spack.main.SpackCommand.
+            child_result.print_context()
+            raise child_result
+
+        # Fallback. Usually caught beforehand in EOFError above.
+        if self.process.exitcode != 0:
+            raise InstallError(f"The process failed unexpectedly ({self._exitcode_msg()})")
+
+        return child_result
+
+
+def spawn_build_process(pkg, function, kwargs, *, forward_stdin: bool = True) -> BuildProcess:
+    """Create a child process to do part of a spack build, and return without waiting for it.
+
+    Args:
+        pkg (spack.package_base.PackageBase): package whose environment we should set up the
+            child process for.
+        function (typing.Callable): argless function to run in the child process.
+        kwargs: keyword arguments passed to ``function``
+        forward_stdin: whether to forward stdin to the child, to allow toggling verbosity. This
+            should be disabled when multiple build processes run at the same time.
+
+    See ``start_build_process()`` for a blocking version of this function.
     """
     read_pipe, write_pipe = multiprocessing.Pipe(duplex=False)
     input_fd = None
@@ -1396,9 +1483,14 @@ def child_fun():
 
     try:
         # Forward sys.stdin when appropriate, to allow toggling verbosity
-        if sys.platform != "win32" and sys.stdin.isatty() and hasattr(sys.stdin, "fileno"):
+        if (
+            forward_stdin
+            and sys.platform != "win32"
+            and sys.stdin.isatty()
+            and hasattr(sys.stdin, "fileno")
+        ):
             input_fd = Connection(os.dup(sys.stdin.fileno()))
-        mflags = os.environ.get("MAKEFLAGS", False)
+        mflags = os.environ.get("MAKEFLAGS")
         if mflags:
             m = re.search(r"--jobserver-[^=]*=(\d),(\d)", mflags)
             if m:
@@ -1435,40 +1527,35 @@ def child_fun():
         if input_fd is not None:
             input_fd.close()
 
-    def exitcode_msg(p):
-        typ = "exit" if p.exitcode >= 0 else "signal"
-        return f"{typ} {abs(p.exitcode)}"
+    return BuildProcess(pkg, p, read_pipe)
 
-    try:
-        child_result = read_pipe.recv()
-    except EOFError:
-        p.join()
-        raise InstallError(f"The process has stopped unexpectedly ({exitcode_msg(p)})")
-
-    p.join()
-
-    # If returns a StopPhase, raise it
-    if isinstance(child_result, spack.error.StopPhase):
-        # do not print
-        raise child_result
-
-    # let the caller know which package went wrong.
-    if isinstance(child_result, InstallError):
-        child_result.pkg = pkg
-
-    if isinstance(child_result, ChildError):
-        # If the child process raised an error, print its output here rather
-        # than waiting until the call to SpackError.die() in main(). This
-        # allows exception handling output to be logged from within Spack.
-        # see spack.main.SpackCommand.
-        child_result.print_context()
-        raise child_result
-
-    # Fallback. Usually caught beforehand in EOFError above.
-    if p.exitcode != 0:
-        raise InstallError(f"The process failed unexpectedly ({exitcode_msg(p)})")
-
-    return child_result
+
+def start_build_process(pkg, function, kwargs):
+    """Create a child process to do part of a spack build, and wait for its result.
+
+    Args:
+
+        pkg (spack.package_base.PackageBase): package whose environment we should set up the
+            child process for.
+        function (typing.Callable): argless function to run in the child
+            process.
+
+    Usage::
+
+        def child_fun():
+            # do stuff
+        build_env.start_build_process(pkg, child_fun)
+
+    The child process is run with the build environment set up by
+    spack.build_environment.  This allows package authors to have full
+    control over the environment, etc. without affecting other builds
+    that might be executed in the same spack call.
+
+    If something goes wrong, the child process catches the error and
+    passes it to the parent wrapped in a ChildError.  The parent is
+    expected to handle (or re-raise) the ChildError.
+    """
+    return spawn_build_process(pkg, function, kwargs).complete()
 
 
 CONTEXT_BASES = (spack.package_base.PackageBase, spack.builder.Builder)
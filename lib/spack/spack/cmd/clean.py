@@ -12,6 +12,7 @@
 import spack.caches
 import spack.cmd
 import spack.config
+import spack.solver.concretization_cache
 import spack.stage
 import spack.store
 import spack.util.path
@@ -49,6 +50,9 @@ def setup_parser(subparser):
         action="store_true",
         help="remove long-lived caches, like the virtual package index",
     )
+    subparser.add_argument(
+        "--concretization-cache", action="store_true", help="remove cached concretization results"
+    )
     subparser.add_argument(
         "-p",
         "--python-cache",
@@ -95,6 +99,7 @@ def clean(parser, args):
             args.downloads,
             args.failures,
             args.misc_cache,
+            args.concretization_cache,
             args.python_cache,
             args.bootstrap,
         ]
@@ -127,6 +132,15 @@ def clean(parser, args):
         tty.msg("Removing cached information on repositories")
         spack.caches.MISC_CACHE.destroy()
 
+    if args.concretization_cache:
+        cache = spack.solver.concretization_cache.ConcretizationCache(spack.caches.MISC_CACHE)
+        stats = cache.stats()
+        tty.msg(
+            f"Removing {stats['entries']} cached concretization results "
+            f"[hits: {stats['hits']}, misses: {stats['misses']}, evictions: {stats['evictions']}]"
+        )
+        cache.destroy()
+
     if args.python_cache:
         tty.msg("Removing python cache files")
         remove_python_cache()
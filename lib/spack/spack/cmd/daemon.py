@@ -0,0 +1,42 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+
+import os
+import sys
+
+import llnl.util.filesystem as fs
+import llnl.util.tty as tty
+
+description = "serve Spack commands from a long-lived process"
+section = "admin"
+level = "long"
+
+
+def setup_parser(subparser):
+    subparser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=None,
+        help="path of the Unix socket to listen on\n"
+        "(default: daemon.sock in the user cache directory)",
+    )
+
+
+def daemon(parser, args):
+    if sys.platform == "win32":
+        tty.die("spack daemon is not supported on Windows")
+
+    import spack.daemon
+
+    socket_path = os.path.abspath(args.socket or spack.daemon.DEFAULT_SOCKET_PATH)
+    if os.path.exists(socket_path):
+        if spack.daemon.socket_in_use(socket_path):
+            tty.die(f"another spack daemon is listening on {socket_path}")
+        os.unlink(socket_path)
+    fs.mkdirp(os.path.dirname(socket_path))
+
+    server = spack.daemon.Daemon(socket_path)
+    server.load_state()
+    tty.msg(f"Run commands in this daemon with:  export SPACK_DAEMON={socket_path}")
+    server.serve()
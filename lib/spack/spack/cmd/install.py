@@ -63,6 +63,7 @@ def install_kwargs_from_args(args):
         "unsigned": args.unsigned,
         "install_deps": ("dependencies" in args.things_to_install),
         "install_package": ("package" in args.things_to_install),
+        "concurrent_packages": args.concurrent_packages,
     }
 
 
@@ -182,6 +183,14 @@ def setup_parser(subparser):
         help="display verbose build output while installing",
     )
     subparser.add_argument("--fake", action="store_true", help="fake install for debug purposes")
+    subparser.add_argument(
+        "-p",
+        "--concurrent-packages",
+        type=int,
+        default=None,
+        metavar="N",
+        help="build up to N packages at the same time (overrides config:concurrent_packages)",
+    )
     subparser.add_argument(
         "--only-concrete",
         action="store_true",
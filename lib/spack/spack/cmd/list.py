@@ -17,7 +17,7 @@
 import spack.deptypes as dt
 import spack.repo
 from spack.cmd.common import arguments
-from spack.version import VersionList
+from spack.version import VersionList, ver
 
 description = "list and search available packages"
 section = "basic"
@@ -116,9 +116,9 @@ def match(p, f):
                 if f.match(p):
                     return True
 
-                pkg_cls = spack.repo.PATH.get_pkg_class(p)
-                if pkg_cls.__doc__:
-                    return f.match(pkg_cls.__doc__)
+                description = spack.repo.PATH.package_directives(p).description
+                if description:
+                    return f.match(description)
                 return False
 
         else:
@@ -156,11 +156,15 @@ def rows_for_ncols(elts, ncols):
         yield row
 
 
-def get_dependencies(pkg):
+def get_dependencies(directives):
     all_deps = {}
     for deptype in dt.ALL_TYPES:
-        deps = pkg.dependencies_of_type(dt.flag_from_string(deptype))
-        all_deps[deptype] = [d for d in deps]
+        depflag = dt.flag_from_string(deptype)
+        all_deps[deptype] = [
+            name
+            for name, conditions in sorted(directives.dependencies.items())
+            if any(flag & depflag for _, flag in conditions)
+        ]
 
     return all_deps
 
@@ -168,7 +172,7 @@ def get_dependencies(pkg):
 @formatter
 def version_json(pkg_names, out):
     """Print all packages with their latest versions."""
-    pkg_classes = [spack.repo.PATH.get_pkg_class(name) for name in pkg_names]
+    pkg_directives = [spack.repo.PATH.package_directives(name) for name in pkg_names]
 
     out.write("[\n")
 
@@ -183,15 +187,15 @@ def version_json(pkg_names, out):
             '   "maintainers": {5},\n'
             '   "dependencies": {6}'
             "}}".format(
-                pkg_cls.name,
-                VersionList(pkg_cls.versions).preferred(),
-                json.dumps([str(v) for v in reversed(sorted(pkg_cls.versions))]),
-                pkg_cls.homepage,
-                github_url(pkg_cls),
-                json.dumps(pkg_cls.maintainers),
-                json.dumps(get_dependencies(pkg_cls)),
+                directives.name,
+                VersionList([ver(v) for v in directives.versions]).preferred(),
+                json.dumps(directives.versions),
+                directives.homepage,
+                github_url(directives),
+                json.dumps(directives.maintainers),
+                json.dumps(get_dependencies(directives)),
             )
-            for pkg_cls in pkg_classes
+            for directives in pkg_directives
         ]
     )
     out.write(pkg_latest)
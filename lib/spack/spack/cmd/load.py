@@ -2,10 +2,13 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
+import contextlib
+import os
 import sys
 
 import spack.cmd
 import spack.cmd.common
+import spack.config
 import spack.environment as ev
 import spack.store
 import spack.user_environment as uenv
@@ -73,6 +76,32 @@ def setup_parser(subparser):
         help="show loaded packages: same as `spack find --loaded`",
     )
 
+    subparser.add_argument(
+        "--print-cache-stats",
+        action="store_true",
+        default=False,
+        help="print statistics of the cache of environment modifications to stderr",
+    )
+
+
+def print_cache_stats():
+    """Print the statistics of the cache of environment modifications to stderr, so that they
+    are not evaluated by the shell."""
+    stats = uenv.CACHE_STATS
+    directory = uenv.cache_directory()
+    sizes = []
+    with contextlib.suppress(OSError):
+        sizes = [e.stat().st_size for e in os.scandir(directory) if e.name.endswith(".pickle")]
+    enabled = spack.config.get("config:environment_modifications_cache", False)
+    sys.stderr.write(
+        f"environment modifications cache: {'enabled' if enabled else 'disabled'}\n"
+        f"  hits:        {stats.hits}\n"
+        f"  misses:      {stats.misses}\n"
+        f"  invalidated: {stats.invalidated}\n"
+        f"  time:        {stats.seconds:.3f} s\n"
+        f"  entries:     {len(sizes)} ({sum(sizes) / 1024:.1f} KiB in {directory})\n"
+    )
+
 
 def load(parser, args):
     env = ev.active_environment()
@@ -97,9 +126,12 @@ def load(parser, args):
         return 1
 
     with spack.store.STORE.db.read_transaction():
-        env_mod = uenv.environment_modifications_for_specs(*specs)
+        env_mod = uenv.cached_environment_modifications_for_specs(*specs)
         for spec in specs:
             env_mod.prepend_path(uenv.spack_loaded_hashes_var, spec.dag_hash())
         cmds = env_mod.shell_modifications(args.shell)
 
         sys.stdout.write(cmds)
+
+    if args.print_cache_stats:
+        print_cache_stats()
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 import sys
+import time
 
 import llnl.util.lang as lang
 import llnl.util.tty as tty
@@ -14,6 +15,7 @@
 import spack.config
 import spack.environment as ev
 import spack.mirrors.mirror
+import spack.mirrors.probe
 import spack.mirrors.utils
 import spack.repo
 import spack.spec
@@ -230,6 +232,9 @@ def setup_parser(subparser):
         "--scope", action=arguments.ConfigScope, help="configuration scope to read from"
     )
 
+    # Stats
+    sp.add_parser("stats", help=mirror_stats.__doc__)
+
 
 def _configure_access_pair(
     args, id_tok, id_variable_tok, secret_tok, secret_variable_tok, default=None
@@ -457,6 +462,37 @@ def mirror_list(args):
     mirrors.display()
 
 
+def mirror_stats(args):
+    """show the latency and failures of source mirrors, recorded when racing them"""
+    stats = spack.mirrors.probe.read_stats()
+    if not stats:
+        tty.msg("No mirror statistics recorded, set config:race_mirrors to collect them.")
+        return
+
+    names = {
+        mirror.fetch_url: mirror.name
+        for mirror in spack.mirrors.mirror.MirrorCollection(source=True).values()
+    }
+    rows = [
+        (
+            names.get(url, url),
+            str(int(entry["probes"])),
+            str(int(entry["failures"])),
+            f"{entry['latency'] * 1000:.1f}",
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_probe"])),
+        )
+        for url, entry in sorted(stats.items(), key=lambda x: spack.mirrors.probe.sort_key(x[1]))
+    ]
+    header = ("Mirror", "Probes", "Failures", "Latency (ms)", "Last probe")
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+    for row in (header, *rows):
+        name, *numbers, last = row
+        cells = [name.ljust(widths[0])]
+        cells.extend(x.rjust(w) for x, w in zip(numbers, widths[1:]))
+        cells.append(last)
+        print("  ".join(cells))
+
+
 def specs_from_text_file(filename, concretize=False):
     """Return a list of specs read from a text file.
 
@@ -701,6 +737,7 @@ def mirror(parser, args):
         "set-url": mirror_set_url,
         "set": mirror_set,
         "list": mirror_list,
+        "stats": mirror_stats,
     }
 
     if args.no_checksum:
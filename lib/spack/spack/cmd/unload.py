@@ -88,7 +88,7 @@ def unload(parser, args):
         )
         return 1
 
-    env_mod = uenv.environment_modifications_for_specs(*specs).reversed()
+    env_mod = uenv.cached_environment_modifications_for_specs(*specs).reversed()
     for spec in specs:
         env_mod.remove_path(uenv.spack_loaded_hashes_var, spec.dag_hash())
     cmds = env_mod.shell_modifications(args.shell)
@@ -2,10 +2,12 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 import argparse
+import concurrent.futures
 
 import llnl.util.tty as tty
 
 import spack.cmd
+import spack.config
 import spack.environment as ev
 import spack.store
 import spack.verify
@@ -25,6 +27,17 @@ def setup_parser(subparser):
         "-j", "--json", action="store_true", help="ouptut json-formatted errors"
     )
     subparser.add_argument("-a", "--all", action="store_true", help="verify all packages")
+    subparser.add_argument(
+        "--fast",
+        action="store_true",
+        help="don't hash files whose size, mtime, ctime and inode match the manifest",
+    )
+    subparser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of threads hashing files (default: number of available cpus)",
+    )
     subparser.add_argument(
         "specs_or_files", nargs=argparse.REMAINDER, help="specs or files to verify"
     )
@@ -90,11 +103,40 @@ def verify(parser, args):
         setup_parser.parser.print_help()
         return 1
 
-    for spec in specs:
-        tty.debug("Verifying package %s")
-        results = spack.verify.check_spec_manifest(spec)
+    jobs = args.jobs or spack.config.determine_number_of_jobs(parallel=True)
+
+    def _check(spec):
+        tty.debug(f"Verifying package {spec.format('{name}/{hash:7}')}")
+        # With many specs, threads work on different specs rather than on files of the same one
+        return spack.verify.check_spec_manifest(
+            spec, trust_stat=args.fast, jobs=1 if len(specs) > 1 else jobs
+        )
+
+    if len(specs) > 1 and jobs > 1:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="spack-verify"
+        )
+        futures = [executor.submit(_check, spec) for spec in specs]
+        all_results = (future.result() for future in futures)
+    else:
+        executor = None
+        futures = []
+        all_results = (_check(spec) for spec in specs)
+
+    try:
+        return _report(specs, all_results, args.json)
+    finally:
+        if executor is not None:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+def _report(specs, all_results, json: bool):
+    """Report the results of the first spec that failed verification, in the given order."""
+    for spec, results in zip(specs, all_results):
         if results.has_errors():
-            if args.json:
+            if json:
                 print(results.json_string())
             else:
                 tty.msg("In package %s" % spec.format("{name}/{hash:7}"))
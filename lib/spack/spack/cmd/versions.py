@@ -36,25 +36,29 @@ def setup_parser(subparser):
 
 def versions(parser, args):
     spec = spack.spec.Spec(args.package)
-    pkg_cls = spack.repo.PATH.get_pkg_class(spec.name)
-    pkg = pkg_cls(spec)
-
-    safe_versions = pkg.versions
 
     if not (args.remote or args.new):
+        # Read safe versions from the directives index, without importing the package
+        safe_versions = [ver(v) for v in spack.repo.PATH.package_directives(spec.name).versions]
+
         if sys.stdout.isatty():
             tty.msg("Safe versions (already checksummed):")
 
         if not safe_versions:
             if sys.stdout.isatty():
-                tty.warn(f"Found no versions for {pkg.name}")
+                tty.warn(f"Found no versions for {spec.name}")
                 tty.debug("Manually add versions to the package.")
         else:
-            colify(sorted(safe_versions, reverse=True), indent=2)
+            colify(safe_versions, indent=2)
 
         if args.safe:
             return
 
+    pkg_cls = spack.repo.PATH.get_pkg_class(spec.name)
+    pkg = pkg_cls(spec)
+
+    safe_versions = pkg.versions
+
     fetched_versions = pkg.fetch_remote_versions(args.jobs)
 
     if args.new:
@@ -2,10 +2,11 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 """High-level functions to concretize list of specs"""
+import itertools
 import sys
 import time
 from contextlib import contextmanager
-from typing import Iterable, List, Optional, Sequence, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import llnl.util.tty as tty
 
@@ -134,17 +135,6 @@ def concretize_separately(
     with ensure_bootstrap_configuration():
         ensure_clingo_importable_or_raise()
 
-    # Ensure all the indexes have been built or updated, since
-    # otherwise the processes in the pool may timeout on waiting
-    # for a write lock. We do this indirectly by retrieving the
-    # provider index, which should in turn trigger the update of
-    # all the indexes if there's any need for that.
-    _ = spack.repo.PATH.provider_index
-
-    # Ensure we have compilers in compilers.yaml to avoid that
-    # processes try to write the config file in parallel
-    _ = spack.compilers.all_compilers_config(spack.config.CONFIG)
-
     # Early return if there is nothing to do
     if len(args) == 0:
         # Still have to combine the things that were passed in as abstract with the things
@@ -153,6 +143,11 @@ def concretize_separately(
             (abstract, concrete) for abstract, concrete in spec_list if concrete
         ]
 
+    # Schedule the largest solves first, so that the pool is not waiting on a few of them at
+    # the end
+    sizes: Dict[str, int] = {}
+    args.sort(key=lambda x: _solve_size_estimate(to_concretize[x[0]], sizes), reverse=True)
+
     # Solve the environment in parallel on Linux
     # TODO: support parallel concretization on macOS and Windows
     num_procs = min(len(args), spack.config.determine_number_of_jobs(parallel=True))
@@ -162,18 +157,40 @@ def concretize_separately(
         msg += f" pool with {num_procs} processes"
     tty.msg(msg)
 
-    for j, (i, concrete, duration) in enumerate(
-        spack.util.parallel.imap_unordered(
-            _concretize_task, args, processes=num_procs, debug=tty.is_debug(), maxtaskperchild=1
-        )
-    ):
-        ret.append((i, concrete))
-        percentage = (j + 1) / len(args) * 100
-        tty.verbose(
-            f"{duration:6.1f}s [{percentage:3.0f}%] {concrete.cformat('{hash:7}')} "
-            f"{to_concretize[i].colored_str}"
-        )
-        sys.stdout.flush()
+    global _WORKER_SOLVER
+    _WORKER_SOLVER = _warm_solver()
+
+    durations = []
+    try:
+        # With multi-shot solves, each worker grounds a single problem for a batch of roots
+        if spack.config.get("concretizer:multi_shot", False):
+            batches = [args[k::num_procs] for k in range(num_procs)]
+            results: Iterable[Tuple[int, Spec, float]] = itertools.chain.from_iterable(
+                spack.util.parallel.imap_unordered(
+                    _concretize_batch_task, batches, processes=num_procs, debug=tty.is_debug()
+                )
+            )
+        else:
+            results = spack.util.parallel.imap_unordered(
+                _concretize_task, args, processes=num_procs, debug=tty.is_debug()
+            )
+
+        for j, (i, concrete, duration) in enumerate(results):
+            ret.append((i, concrete))
+            durations.append((duration, i))
+            percentage = (j + 1) / len(args) * 100
+            tty.verbose(
+                f"{duration:6.1f}s [{percentage:3.0f}%] {concrete.cformat('{hash:7}')} "
+                f"{to_concretize[i].colored_str}"
+            )
+            sys.stdout.flush()
+    finally:
+        _WORKER_SOLVER = None
+
+    if tty.is_verbose():
+        tty.verbose("Slowest solves:")
+        for duration, i in sorted(durations, reverse=True)[:10]:
+            tty.verbose(f"{duration:6.1f}s {to_concretize[i].colored_str}")
 
     # Add specs in original order
     ret.sort(key=lambda x: x[0])
@@ -183,14 +200,91 @@ def concretize_separately(
     ]
 
 
+#: Solver used by the workers of concretize_separately. It is created before the workers are
+#: forked, and reused by all the tasks of a worker.
+_WORKER_SOLVER = None
+
+
+def _warm_solver():
+    """Load everything that is shared by the solves of different roots, and return a solver
+    whose reusable specs are read only once.
+    """
+    from spack.solver.asp import Solver
+
+    # Ensure all the indexes have been built or updated, since
+    # otherwise the processes in the pool may timeout on waiting
+    # for a write lock. We do this indirectly by retrieving the
+    # provider index, which should in turn trigger the update of
+    # all the indexes if there's any need for that.
+    _ = spack.repo.PATH.provider_index
+
+    # Ensure we have compilers in compilers.yaml to avoid that
+    # processes try to write the config file in parallel
+    _ = spack.compilers.all_compilers_config(spack.config.CONFIG)
+
+    # Read the configuration sections used by the solver
+    for section in ("concretizer", "packages", "compilers", "mirrors"):
+        _ = spack.config.CONFIG.get(section)
+
+    solver = Solver()
+    solver.selector.preload()
+    return solver
+
+
+def _solve_size_estimate(spec: Spec, cache: Dict[str, int]) -> int:
+    """Estimate the cost of solving for an abstract spec, with the number of packages that
+    are reachable from its root through dependency directives.
+    """
+    if spec.name in cache:
+        return cache[spec.name]
+
+    visited, stack = set(), [spec.name]
+    while stack:
+        name = stack.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+        if not spack.repo.PATH.exists(name):
+            continue
+        directives = spack.repo.PATH.package_directives(name)
+        stack.extend(x for x in directives.dependencies if x not in visited)
+
+    cache[spec.name] = len(visited)
+    return cache[spec.name]
+
+
 def _concretize_task(packed_arguments: Tuple[int, str, TestsType]) -> Tuple[int, Spec, float]:
     index, spec_str, tests = packed_arguments
     with tty.SuppressOutput(msg_enabled=False):
         start = time.time()
-        spec = concretize_one(Spec(spec_str), tests=tests)
+        spec = _concretize_one(Spec(spec_str), tests=tests, solver=_WORKER_SOLVER)
         return index, spec, time.time() - start
 
 
+def _concretize_batch_task(
+    batch: List[Tuple[int, str, TestsType]],
+) -> List[Tuple[int, Spec, float]]:
+    assert _WORKER_SOLVER is not None
+    tests = batch[0][2]
+    allow_deprecated = spack.config.get("config:deprecated", False)
+    result = []
+    with tty.SuppressOutput(msg_enabled=False):
+        start = time.time()
+        specs = [Spec(spec_str).lookup_hash() for _, spec_str, _ in batch]
+        for spec in specs:
+            if not spec.concrete:
+                _ensure_named(spec)
+
+        solves = _WORKER_SOLVER.solve_separately(
+            [s for s in specs if not s.concrete], tests=tests, allow_deprecated=allow_deprecated
+        )
+        for (index, _, _), spec in zip(batch, specs):
+            concrete = spec.copy() if spec.concrete else _root_of(spec, next(solves))
+            result.append((index, concrete, time.time() - start))
+            start = time.time()
+    return result
+
+
 def concretize_one(spec: Union[str, Spec], tests: TestsType = False) -> Spec:
     """Return a concretized copy of the given spec.
 
@@ -198,7 +292,11 @@ def concretize_one(spec: Union[str, Spec], tests: TestsType = False) -> Spec:
         tests: if False disregard 'test' dependencies, if a list of names activate them for
             the packages in the list, if True activate 'test' dependencies for all packages.
     """
-    from spack.solver.asp import Solver, SpecBuilder
+    return _concretize_one(spec, tests=tests)
+
+
+def _concretize_one(spec: Union[str, Spec], *, tests: TestsType, solver=None) -> Spec:
+    from spack.solver.asp import Solver
 
     if isinstance(spec, str):
         spec = Spec(spec)
@@ -207,14 +305,25 @@ def concretize_one(spec: Union[str, Spec], tests: TestsType = False) -> Spec:
     if spec.concrete:
         return spec.copy()
 
+    _ensure_named(spec)
+
+    allow_deprecated = spack.config.get("config:deprecated", False)
+    solver = solver or Solver()
+    result = solver.solve([spec], tests=tests, allow_deprecated=allow_deprecated)
+    return _root_of(spec, result)
+
+
+def _ensure_named(spec: Spec) -> None:
     for node in spec.traverse():
         if not node.name:
             raise spack.error.SpecError(
                 f"Spec {node} has no name; cannot concretize an anonymous spec"
             )
 
-    allow_deprecated = spack.config.get("config:deprecated", False)
-    result = Solver().solve([spec], tests=tests, allow_deprecated=allow_deprecated)
+
+def _root_of(spec: Spec, result) -> Spec:
+    """Return the concrete spec for an abstract root, from the result of a solve."""
+    from spack.solver.asp import SpecBuilder
 
     # take the best answer
     opt, i, answer = min(result.answers)
@@ -0,0 +1,306 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Long-lived server that runs Spack commands with modules, configuration, repositories and
+the database already loaded.
+
+The server listens on a Unix socket. A client sends the command line, working directory and
+environment of a command, together with its standard input, output and error file descriptors.
+The server forks a child for each command, which runs ``spack.main.main`` on the descriptors
+of the client, so the output of commands and their exit code are the same as if they ran in
+the client.
+
+The client is in ``spack_installable.main``, so that forwarding a command does not import
+Spack. It is enabled by setting ``SPACK_DAEMON`` to the path of the socket. Commands that
+can't be forwarded run in the client.
+"""
+import array
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import llnl.util.tty as tty
+
+import spack.cmd
+import spack.config
+import spack.main
+import spack.paths
+import spack.repo
+import spack.store
+
+#: Default path of the socket of the daemon
+DEFAULT_SOCKET_PATH = os.path.join(spack.paths.user_cache_path, "daemon.sock")
+
+#: Environment variables that Spack reads when its modules are imported or its configuration
+#: is created. The daemon refuses commands whose values differ from its own.
+STATE_VARIABLES = (
+    "HOME",
+    "USER",
+    "TMPDIR",
+    "SPACK_USER_CONFIG_PATH",
+    "SPACK_SYSTEM_CONFIG_PATH",
+    "SPACK_USER_CACHE_PATH",
+    "SPACK_DISABLE_LOCAL_CONFIG",
+)
+
+#: Number of file descriptors passed by clients: standard input, output and error
+_NUM_FDS = 3
+
+#: Generation of the state of the daemon, see ``Daemon.generation``
+Generation = Tuple[Any, ...]
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def recv_request(conn: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    """Receive a request and the file descriptors sent with it from a client."""
+    fds = array.array("i")
+    header, ancdata, _, _ = conn.recvmsg(4, socket.CMSG_SPACE(_NUM_FDS * fds.itemsize))
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[: len(data) - (len(data) % fds.itemsize)])
+
+    if len(header) != 4:
+        raise ValueError("truncated request")
+    (size,) = struct.unpack("!I", header)
+    payload = b""
+    while len(payload) < size:
+        chunk = conn.recv(size - len(payload))
+        if not chunk:
+            raise ValueError("truncated request")
+        payload += chunk
+    return json.loads(payload.decode("utf-8")), list(fds)
+
+
+def send_reply(conn: socket.socket, **reply) -> None:
+    conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class Daemon:
+    """Serve Spack commands on a Unix socket, with state loaded once for all the commands.
+
+    The configuration, the repositories and the store are created when the daemon starts, and
+    recreated when a configuration file or a repository changes. The database is read again
+    when it is written by another process.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path = socket_path
+        self.environment = {name: os.environ.get(name) for name in STATE_VARIABLES}
+        self.configuration: Optional[spack.config.Configuration] = None
+        self.repo_path: Optional[spack.repo.RepoPath] = None
+        self.store: Optional[spack.store.Store] = None
+        self._generation: Optional[Generation] = None
+        self._children: List[int] = []
+        self._stopped = False
+
+    def load_state(self) -> None:
+        """Create the configuration, repositories and store that commands start from, and load
+        the modules of all the commands."""
+        for name in spack.cmd.all_commands():
+            spack.cmd.get_module(name)
+
+        self.configuration = spack.config.create()
+        for section in spack.config.SECTION_SCHEMAS:
+            self.configuration.get(section)
+        self.repo_path = spack.repo.create(self.configuration)
+        self.store = spack.store.create(self.configuration)
+        with self.store.db.read_transaction():
+            pass
+        self._generation = self.generation()
+
+    def generation(self) -> Generation:
+        """Return a value that changes when the configuration files, the repositories or the
+        database change."""
+        assert self.configuration and self.repo_path and self.store
+        config_files = []
+        for scope in self.configuration.scopes.values():
+            if isinstance(scope, spack.config.DirectoryConfigScope):
+                config_files.append((scope.path, _stat_key(scope.path)))
+                for section in spack.config.SECTION_SCHEMAS:
+                    path = scope.get_section_filename(section)
+                    config_files.append((path, _stat_key(path)))
+            elif isinstance(scope, spack.config.SingleFileScope):
+                config_files.append((scope.path, _stat_key(scope.path)))
+
+        repos = [
+            (repo.root, _stat_key(repo.config_file), _stat_key(repo.packages_path))
+            for repo in self.repo_path.repos
+        ]
+        return tuple(config_files), tuple(repos), self.store.db.generation()
+
+    def refresh(self) -> None:
+        """Recreate the state that changed since the last command."""
+        assert self._generation is not None and self.store is not None, "state is not loaded"
+        generation = self.generation()
+        if generation[:2] != self._generation[:2]:
+            tty.debug("spack daemon: configuration or repositories changed, reloading")
+            self.load_state()
+        elif generation != self._generation:
+            tty.debug("spack daemon: database changed, reading it again")
+            with self.store.db.read_transaction():
+                pass
+            self._generation = self.generation()
+
+    def stop(self) -> None:
+        """Make ``serve`` return, after at most one second."""
+        self._stopped = True
+
+    def serve(self) -> None:
+        """Accept connections until the daemon is interrupted, terminated or stopped."""
+        if not self.configuration:
+            self.load_state()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(64)
+        server.settimeout(1.0)
+
+        def _terminate(signum, frame):
+            raise KeyboardInterrupt()
+
+        # Signal handlers can only be set in the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, _terminate)
+        tty.msg(f"spack daemon listening on {self.socket_path}")
+        try:
+            while not self._stopped:
+                self._reap_children()
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    self._handle(conn, server)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            os.unlink(self.socket_path)
+
+    def _reap_children(self) -> None:
+        for pid in list(self._children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self._children.remove(pid)
+
+    def _peer_is_trusted(self, conn: socket.socket) -> bool:
+        if not hasattr(socket, "SO_PEERCRED"):
+            # The socket is only accessible to the user of the daemon
+            return True
+        credentials = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", credentials)
+        return uid == os.getuid()
+
+    def _handle(self, conn: socket.socket, server: socket.socket) -> None:
+        fds: List[int] = []
+        try:
+            request, fds = recv_request(conn)
+            reason = self._refusal_reason(conn, request, fds)
+            if reason:
+                tty.debug(f"spack daemon: running the command in the client, {reason}")
+                send_reply(conn, fallback=reason)
+                return
+
+            self.refresh()
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                self._run_command(conn, request, fds)
+            self._children.append(pid)
+        except Exception as e:
+            tty.debug(f"spack daemon: invalid request: {e}")
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _refusal_reason(
+        self, conn: socket.socket, request: Dict[str, Any], fds: List[int]
+    ) -> Optional[str]:
+        if not self._peer_is_trusted(conn):
+            return "the client belongs to another user"
+        if len(fds) != _NUM_FDS:
+            return "the client did not send its standard streams"
+        if os.path.realpath(request.get("prefix", "")) != os.path.realpath(spack.paths.prefix):
+            return "the client is another Spack instance"
+        environment = request["env"]
+        changed = [n for n in STATE_VARIABLES if environment.get(n) != self.environment[n]]
+        if changed:
+            return f"{', '.join(changed)} differ from those of the daemon"
+        return None
+
+    def _run_command(self, conn: socket.socket, request: Dict[str, Any], fds: List[int]) -> None:
+        """Run a command in the child forked for it, and exit."""
+        code: Any = 3
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+            sys.stdin = open(0, "r", closefd=False)
+            sys.stdout = open(1, "w", buffering=1 if os.isatty(1) else -1, closefd=False)
+            sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            sys.argv = [spack.paths.spack_script, *request["argv"]]
+
+            assert self.configuration is not None, "state is not loaded"
+            assert self.repo_path is not None and self.store is not None, "state is not loaded"
+            spack.config.CONFIG = self.configuration
+            spack.repo.PATH = self.repo_path
+            spack.repo.REPOS_FINDER.current_repository = self.repo_path
+            spack.store.STORE = self.store
+
+            send_reply(conn, pid=os.getpid())
+            try:
+                code = spack.main.main(request["argv"])
+            except SystemExit as e:
+                code = e.code
+
+            if code is None:
+                code = 0
+            elif not isinstance(code, int):
+                print(code, file=sys.stderr)
+                code = 1
+        except BaseException as e:
+            print(f"==> Error: spack daemon: {e}", file=sys.stderr)
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                send_reply(conn, exit_code=code)
+            finally:
+                os._exit(0)
+
+
+def socket_in_use(socket_path: str) -> bool:
+    """Return whether a daemon accepts connections on a socket"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        return False
+    finally:
+        client.close()
+    return True
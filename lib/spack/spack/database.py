@@ -19,6 +19,8 @@
 """
 import contextlib
 import datetime
+import functools
+import json
 import os
 import pathlib
 import socket
@@ -81,7 +83,7 @@
 #: DB version.  This is stuck in the DB file to track changes in format.
 #: Increment by one when the database format changes.
 #: Versions before 5 were not integers.
-_DB_VERSION = vn.Version("7")
+_DB_VERSION = vn.StandardVersion.from_string("7")
 
 #: For any version combinations here, skip reindex when upgrading.
 #: Reindexing can take considerable time and is not always necessary.
@@ -131,6 +133,12 @@
 # Verifier file to check last modification of the DB
 _INDEX_VERIFIER_FILE = "index_verifier"
 
+# Append-only log of the changes made to the DB since index.json was last written
+_JOURNAL_FILE = "index_journal"
+
+#: Default number of journal entries after which the journal is compacted into index.json
+_DEFAULT_JOURNAL_COMPACT_AFTER = 1000
+
 # Lockfile for the database
 _LOCK_FILE = "lock"
 
@@ -155,6 +163,21 @@ def reader(version: vn.StandardVersion) -> Type["spack.spec.SpecfileReaderBase"]
     return reader_cls[version]
 
 
+def _dependency_hashes(deps) -> List[str]:
+    """Return the DAG hashes in the ``dependencies`` field of a node dict, in any format."""
+    if isinstance(deps, list):
+        return [d["hash"] for d in deps]
+    result = []
+    for elt in deps.values():
+        if isinstance(elt, str):
+            result.append(elt)
+        elif "hash" in elt:
+            result.append(elt["hash"])
+        else:
+            result.append(elt[ht.dag_hash.name])
+    return result
+
+
 def _now() -> float:
     """Returns the time since the epoch"""
     return time.time()
@@ -203,6 +226,8 @@ class InstallRecord:
         explicit (bool or None): whether or not this spec was explicitly
             installed, or pulled-in as a dependency of something else
         installation_time (datetime.datetime or None): time of the installation
+
+    Records read from an index file construct their spec only when it is first accessed.
     """
 
     def __init__(
@@ -217,7 +242,9 @@ def __init__(
         in_buildcache: bool = False,
         origin: Optional[str] = None,
     ) -> None:
-        self.spec = spec
+        self._spec: Optional["spack.spec.Spec"] = spec
+        self._spec_loader: Optional[Callable[[], "spack.spec.Spec"]] = None
+        self._name: Optional[str] = None
         self.path = str(path) if path else None
         self.installed = bool(installed)
         self.ref_count = ref_count
@@ -227,6 +254,25 @@ def __init__(
         self.in_buildcache = in_buildcache
         self.origin = origin
 
+    @property
+    def spec(self) -> "spack.spec.Spec":
+        if self._spec is None:
+            assert self._spec_loader is not None, "install record without a spec"
+            self._spec_loader()
+            self._spec_loader = None
+        assert self._spec is not None, "install record without a spec"
+        return self._spec
+
+    @spec.setter
+    def spec(self, value: "spack.spec.Spec") -> None:
+        self._spec = value
+        self._spec_loader = None
+
+    @property
+    def name(self) -> str:
+        """Name of the spec, available without constructing the spec"""
+        return self._name if self._spec is None else self._spec.name
+
     def install_type_matches(self, installed: InstallRecordStatus) -> bool:
         if self.installed:
             return InstallRecordStatus.INSTALLED in installed
@@ -264,6 +310,164 @@ def from_dict(cls, spec, dictionary):
 
         return InstallRecord(spec, **d)
 
+    @classmethod
+    def from_dict_lazy(cls, name: str, spec_loader: Callable[[], None], dictionary):
+        """Create a record whose spec is constructed on first access, by calling
+        ``spec_loader``. The loader must assign the spec to the record."""
+        record = cls.from_dict(None, dictionary)
+        record._name = name
+        record._spec_loader = spec_loader
+        return record
+
+
+def _version_key(spec: "spack.spec.Spec") -> Any:
+    # Git versions are resolved through the package, so they are not shared across records
+    version = spec.versions.concrete
+    return str(version) if isinstance(version, vn.StandardVersion) else spec.dag_hash()
+
+
+def _compiler_key(spec: "spack.spec.Spec") -> Any:
+    return str(spec.compiler) if spec.compiler else None
+
+
+def _architecture_key(spec: "spack.spec.Spec") -> Any:
+    return str(spec.architecture) if spec.architecture else None
+
+
+class QueryIndex:
+    """Secondary indexes over the specs of the records of a database, to select the records that
+    may match a query before checking them with ``Spec.satisfies``.
+
+    Records are grouped by package name when the database is read. The other indexes are built
+    the first time a query needs them, for the records of one package name at a time, and are
+    discarded when the records change. Records with the same version, compiler, target or
+    variant value are grouped, so that ``satisfies`` is evaluated once per distinct value.
+    """
+
+    def __init__(self, data: Dict[str, InstallRecord], hashes_by_name: Dict[str, List[str]]):
+        self.data = data
+        self.hashes_by_name = hashes_by_name
+        self._groups: Dict[Tuple[str, str], Dict[Any, Tuple["spack.spec.Spec", Set[str]]]] = {}
+        self._dependencies: Dict[str, Dict[str, Set[str]]] = {}
+
+    @staticmethod
+    def from_data(data: Dict[str, InstallRecord]) -> "QueryIndex":
+        hashes_by_name: Dict[str, List[str]] = {}
+        for hash_key, rec in data.items():
+            hashes_by_name.setdefault(rec.name, []).append(hash_key)
+        return QueryIndex(data, hashes_by_name)
+
+    def _select(
+        self,
+        name: str,
+        attribute: str,
+        key_fn: Callable[["spack.spec.Spec"], Any],
+        match_fn: Callable[["spack.spec.Spec"], bool],
+    ) -> Set[str]:
+        """Return the hashes of the records with a given name, whose value of an attribute
+        matches. Records are grouped by key_fn, and match_fn is called on one spec per group."""
+        groups = self._groups.get((name, attribute))
+        if groups is None:
+            groups = {}
+            for hash_key in self.hashes_by_name.get(name, ()):
+                spec = self.data[hash_key].spec
+                key = key_fn(spec)
+                if key in groups:
+                    groups[key][1].add(hash_key)
+                else:
+                    groups[key] = (spec, {hash_key})
+            self._groups[(name, attribute)] = groups
+
+        result: Set[str] = set()
+        for spec, hashes in groups.values():
+            if match_fn(spec):
+                result.update(hashes)
+        return result
+
+    def _select_dependents(self, name: str, dependency: str) -> Set[str]:
+        """Return the hashes of the records with a given name, having a node or a virtual with
+        the name of the dependency anywhere in their DAG."""
+        index = self._dependencies.get(name)
+        if index is None:
+            index = {}
+            for hash_key in self.hashes_by_name.get(name, ()):
+                names = set()
+                for edge in self.data[hash_key].spec.traverse_edges(root=False, cover="edges"):
+                    names.add(edge.spec.name)
+                    names.update(edge.virtuals)
+                for dependency_name in names:
+                    index.setdefault(dependency_name, set()).add(hash_key)
+            self._dependencies[name] = index
+        return index.get(dependency, set())
+
+    def candidates(
+        self, query_spec: "spack.spec.Spec", names: Iterable[str]
+    ) -> Optional[Set[str]]:
+        """Return the hashes of the records with the given names that may satisfy an abstract
+        query spec, whose name is either None or among the names. Return None if the query has
+        no constraint that is indexed."""
+        selectors: List[Callable[[str], Set[str]]] = []
+        if query_spec.versions != vn.any_version:
+            selectors.append(
+                lambda name: self._select(
+                    name,
+                    "version",
+                    _version_key,
+                    lambda s: s.versions.satisfies(query_spec.versions),
+                )
+            )
+        if query_spec.compiler:
+            selectors.append(
+                lambda name: self._select(
+                    name,
+                    "compiler",
+                    _compiler_key,
+                    lambda s: bool(s.compiler) and s.compiler.satisfies(query_spec.compiler),
+                )
+            )
+        if query_spec.architecture:
+            selectors.append(
+                lambda name: self._select(
+                    name,
+                    "architecture",
+                    _architecture_key,
+                    lambda s: bool(s.architecture)
+                    and s.architecture.satisfies(query_spec.architecture),
+                )
+            )
+        non_propagating, _ = query_spec.variants.partition_variants()
+        for variant_name in non_propagating:
+            selectors.append(functools.partial(self._select_variant, query_spec, variant_name))
+        for dependency in query_spec.traverse(root=False):
+            if dependency.name:
+                selectors.append(
+                    functools.partial(self._select_dependents, dependency=dependency.name)
+                )
+
+        if not selectors:
+            return None
+
+        result: Set[str] = set()
+        for name in names:
+            selected = selectors[0](name)
+            for selector in selectors[1:]:
+                if not selected:
+                    break
+                selected = selected & selector(name)
+            result.update(selected)
+        return result
+
+    def _select_variant(self, query_spec: "spack.spec.Spec", variant: str, name: str) -> Set[str]:
+        def key_fn(spec):
+            value = spec.variants.get(variant)
+            return None if value is None else (type(value).__name__, str(value))
+
+        def match_fn(spec):
+            value = spec.variants.get(variant)
+            return value is not None and value.satisfies(query_spec.variants[variant])
+
+        return self._select(name, f"variant:{variant}", key_fn, match_fn)
+
 
 class ForbiddenLockError(SpackError):
     """Raised when an upstream DB attempts to acquire a lock"""
@@ -319,6 +523,36 @@ def lock_configuration(configuration):
     )
 
 
+class JournalConfiguration(NamedTuple):
+    """Data class to configure the journal of Database objects
+
+    Args:
+        enable: whether to record changes in an append-only journal, instead of rewriting
+            the whole index at the end of each write transaction
+        compact_after: number of journal entries after which the journal is compacted
+            into the index
+    """
+
+    enable: bool
+    compact_after: int
+
+
+#: Configure a database to rewrite the whole index on each write transaction
+NO_JOURNAL: JournalConfiguration = JournalConfiguration(
+    enable=False, compact_after=_DEFAULT_JOURNAL_COMPACT_AFTER
+)
+
+
+def journal_configuration(configuration):
+    """Return a JournalConfiguration from a spack.config.Configuration object."""
+    return JournalConfiguration(
+        enable=configuration.get("config:db_journal", False),
+        compact_after=configuration.get(
+            "config:db_journal_compact_after", _DEFAULT_JOURNAL_COMPACT_AFTER
+        ),
+    )
+
+
 def prefix_lock_path(root_dir: Union[str, pathlib.Path]) -> pathlib.Path:
     """Returns the path of the prefix lock file, given the root directory.
 
@@ -574,6 +808,7 @@ def __init__(
         upstream_dbs: Optional[List["Database"]] = None,
         is_upstream: bool = False,
         lock_cfg: LockConfiguration = DEFAULT_LOCK_CFG,
+        journal_cfg: JournalConfiguration = NO_JOURNAL,
         layout: Optional[DirectoryLayout] = None,
     ) -> None:
         """Database for Spack installations.
@@ -594,6 +829,8 @@ def __init__(
             is_upstream: whether this repository is an upstream.
             lock_cfg: configuration for the locks to be used by this repository.
                 Relevant only if the repository is not an upstream.
+            journal_cfg: configuration for the journal of changes to this repository.
+                Journals written by other processes are replayed on read regardless of it.
         """
         self.root = root
         self.database_directory = pathlib.Path(self.root) / _DB_DIRNAME
@@ -603,6 +840,7 @@ def __init__(
         self._index_path = self.database_directory / INDEX_JSON_FILE
         self._verifier_path = self.database_directory / _INDEX_VERIFIER_FILE
         self._lock_path = self.database_directory / _LOCK_FILE
+        self._journal_path = self.database_directory / _JOURNAL_FILE
 
         self.is_upstream = is_upstream
         self.last_seen_verifier = ""
@@ -641,6 +879,25 @@ def __init__(
         self._write_transaction_impl = lk.WriteTransaction
         self._read_transaction_impl = lk.ReadTransaction
 
+        # When journaling, index.json carries a random snapshot id, and the journal starts with
+        # the id of the snapshot it applies to. We track how much of the journal has been
+        # replayed on the data in memory, and which records changed in the current transaction.
+        self.journal_cfg = journal_cfg
+        self._snapshot_id: Optional[str] = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._changed_keys: Dict[str, None] = {}
+        self._snapshot_needed = False
+
+        # Indexes of the records by package name and by attributes of their specs, with the data
+        # they were computed from
+        self._query_index: Optional[QueryIndex] = None
+
+        # Raw records last read from file, and the map from their hashes to the hashes of the
+        # records that depend on them, computed on demand
+        self._lazy_installs: Optional[Tuple[Dict[str, InstallRecord], dict]] = None
+        self._dependents_index: Optional[Dict[str, List[str]]] = None
+
     def _ensure_parent_directories(self):
         """Create the parent directory for the DB, if necessary."""
         if not self.is_upstream:
@@ -654,6 +911,22 @@ def read_transaction(self):
         """Get a read lock context manager for use in a `with` block."""
         return self._read_transaction_impl(self.lock, acquire=self._read)
 
+    def generation(self) -> Tuple[str, ...]:
+        """Return an identifier of the current state of this database and of its upstreams,
+        which changes every time one of them is written. This does no locking."""
+        result = []
+        for db in [self, *self.upstream_dbs]:
+            try:
+                verifier = db._verifier_path.read_text(encoding="utf-8") if _use_uuid else ""
+            except OSError:
+                verifier = ""
+            try:
+                mtime = db._index_path.stat().st_mtime_ns
+            except OSError:
+                mtime = 0
+            result.append(f"{verifier}:{mtime}")
+        return tuple(result)
+
     def _write_to_file(self, stream):
         """Write out the database in JSON format to the stream passed
         as argument.
@@ -682,6 +955,8 @@ def _write_to_file(self, stream):
                 "installs": installs,
             }
         }
+        if self._snapshot_id:
+            database["database"]["snapshot"] = self._snapshot_id
 
         try:
             sjson.dump(database, stream)
@@ -836,53 +1111,200 @@ def invalid_record(hash_key, error):
                 self._index_path,
             )
 
-        # Build up the database in three passes:
-        #
-        #   1. Read in all specs without dependencies.
-        #   2. Hook dependencies up among specs.
-        #   3. Mark all specs concrete.
-        #
-        # The database is built up so that ALL specs in it share nodes
-        # (i.e., its specs are a true Merkle DAG, unlike most specs.)
-
-        # Pass 1: Iterate through database and build specs w/o dependencies
+        # Records are created without specs, which are constructed on first access together with
+        # the specs they depend on. Dependencies are looked up in the same data, so that ALL specs
+        # in the database share nodes (i.e., its specs are a true Merkle DAG, unlike most specs.)
         data: Dict[str, InstallRecord] = {}
         installed_prefixes: Set[str] = set()
+        hashes_by_name: Dict[str, List[str]] = {}
         for hash_key, rec in installs.items():
             try:
-                # This constructs a spec DAG from the list of all installs
-                spec = self._read_spec_from_dict(spec_reader, hash_key, installs)
-
-                # Insert the brand new spec in the database.  Each
-                # spec has its own copies of its dependency specs.
-                # TODO: would a more immmutable spec implementation simplify
-                #       this?
-                data[hash_key] = InstallRecord.from_dict(spec, rec)
+                node_dict = rec["spec"]
+                if "name" in node_dict:
+                    name = node_dict["name"]
+                else:
+                    # old format, the node is keyed by its name
+                    name = next(iter(node_dict))
+                    node_dict = node_dict[name]
+
+                spec_loader = functools.partial(
+                    self._load_spec, spec_reader, hash_key, installs, data
+                )
+                data[hash_key] = InstallRecord.from_dict_lazy(name, spec_loader, rec)
+                hashes_by_name.setdefault(name, []).append(hash_key)
 
-                if not spec.external and "installed" in rec and rec["installed"]:
+                if not node_dict.get("external") and "installed" in rec and rec["installed"]:
                     installed_prefixes.add(rec["path"])
             except Exception as e:
                 raise invalid_record(hash_key, e) from e
 
-        # Pass 2: Assign dependencies once all specs are created.
-        for hash_key in data:
+        self._data = data
+        self._installed_prefixes = installed_prefixes
+        self._query_index = QueryIndex(data, hashes_by_name)
+        self._lazy_installs = (data, installs)
+        self._dependents_index = None
+
+        # Replay the changes journaled on top of this snapshot, if any
+        self._snapshot_id = db.get("snapshot")
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._changed_keys = {}
+        if self._snapshot_id:
+            self._read_journal()
+
+    def _load_spec(
+        self,
+        spec_reader: Type["spack.spec.SpecfileReaderBase"],
+        hash_key: str,
+        installs: dict,
+        data: Dict[str, InstallRecord],
+    ) -> None:
+        """Construct the spec of a record read from file, and connect it to its dependencies.
+
+        Does not do any locking.
+        """
+        record = data[hash_key]
+        try:
+            # The record must hold the spec before dependencies are assigned, since they look
+            # the spec up in the data
+            spec = self._read_spec_from_dict(spec_reader, hash_key, installs)
+            record._spec = spec
+            self._assign_dependencies(spec_reader, hash_key, installs, data)
+        except MissingDependenciesError:
+            record._spec = None
+            raise
+        except Exception as e:
+            record._spec = None
+            raise CorruptDatabaseError(
+                f"Invalid record in Spack database: hash: {hash_key}, cause: "
+                f"{type(e).__name__}: {e}",
+                str(self._index_path),
+            ) from e
+
+        # Dependencies are complete at this point, so hashes can be cached safely
+        spec._mark_root_concrete()
+
+    def load_all_specs(self) -> None:
+        """Construct the specs of all the records in this database and its upstreams.
+
+        Specs read from file are constructed lazily, and only know about the dependents that
+        have been constructed too. This method must be called before relying on the dependents
+        of a spec in the database.
+        """
+        with self.read_transaction():
+            for db in [self, *self.upstream_dbs]:
+                for record in db._data.values():
+                    record.spec
+
+    def _lazy_dependents(self, hash_key: str) -> List[str]:
+        """Return the hashes of the records read from file that depend directly on a hash."""
+        if self._lazy_installs is None or self._lazy_installs[0] is not self._data:
+            return []
+
+        if self._dependents_index is None:
+            index: Dict[str, List[str]] = {}
+            for parent_key, rec in self._lazy_installs[1].items():
+                node_dict = rec["spec"]
+                if "name" not in node_dict:
+                    node_dict = next(iter(node_dict.values()))
+                for dep in _dependency_hashes(node_dict.get("dependencies", [])):
+                    index.setdefault(dep, []).append(parent_key)
+            self._dependents_index = index
+
+        return self._dependents_index.get(hash_key, [])
+
+    def _load_dependents(self, specs: Iterable["spack.spec.Spec"]) -> None:
+        """Construct the specs of all the records, in this database and its upstreams, that
+        depend on the given specs directly or transitively. This ensures that specs returned by
+        queries know about all their dependents."""
+        dbs = [self, *self.upstream_dbs]
+        stack = [s.dag_hash() for s in specs]
+        visited = set(stack)
+        while stack:
+            hash_key = stack.pop()
+            for db in dbs:
+                for parent_key in db._lazy_dependents(hash_key):
+                    if parent_key in visited or parent_key not in db._data:
+                        continue
+                    visited.add(parent_key)
+                    db._data[parent_key].spec
+                    stack.append(parent_key)
+
+    def _get_query_index(self) -> QueryIndex:
+        """Return the indexes of the local records, which are rebuilt when the records change."""
+        if self._query_index is None or self._query_index.data is not self._data:
+            self._query_index = QueryIndex.from_data(self._data)
+        return self._query_index
+
+    def _read_journal(self) -> bool:
+        """Replay the part of the journal that has not been applied to the data in memory yet.
+
+        Returns False if the journal does not apply to the snapshot that was last read, in which
+        case nothing is replayed. Does not do any locking.
+        """
+        try:
+            f = self._journal_path.open("rb")
+        except FileNotFoundError:
+            return False
+
+        with f:
             try:
-                self._assign_dependencies(spec_reader, hash_key, installs, data)
-            except MissingDependenciesError:
-                raise
-            except Exception as e:
-                raise invalid_record(hash_key, e) from e
+                header = json.loads(f.readline())
+            except ValueError:
+                return False
+            if not self._snapshot_id or header.get("snapshot") != self._snapshot_id:
+                return False
+
+            offset = max(self._journal_offset, f.tell())
+            f.seek(offset)
+            spec_reader = reader(_DB_VERSION)
+            for line in f:
+                # A process may have been interrupted while appending the last entry
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                    self._replay_journal_entry(spec_reader, entry["key"], entry["record"])
+                except Exception as e:
+                    raise CorruptDatabaseError(
+                        f"Invalid entry in Spack database journal: {type(e).__name__}: {e}",
+                        str(self._journal_path),
+                    ) from e
+                offset += len(line)
+                self._journal_entries += 1
+
+            self._journal_offset = offset
+        return True
 
-        # Pass 3: Mark all specs concrete.  Specs representing real
-        # installations must be explicitly marked.
-        # We do this *after* all dependencies are connected because if we
-        # do it *while* we're constructing specs,it causes hashes to be
-        # cached prematurely.
-        for hash_key, rec in data.items():
-            rec.spec._mark_root_concrete()
+    def _replay_journal_entry(self, spec_reader, hash_key: str, rec: Optional[dict]) -> None:
+        self._query_index = None
+        old = self._data.get(hash_key)
+        if old is not None and not old.spec.external and old.installed and old.path:
+            self._installed_prefixes.discard(old.path)
 
-        self._data = data
-        self._installed_prefixes = installed_prefixes
+        if rec is None:
+            self._data.pop(hash_key, None)
+            return
+
+        if old is not None:
+            # Specs are immutable, so only the other fields of the record may have changed
+            spec = old.spec
+        else:
+            installs = {hash_key: rec}
+            spec = self._read_spec_from_dict(spec_reader, hash_key, installs)
+            self._data[hash_key] = InstallRecord(spec, path=None, installed=False)
+            self._assign_dependencies(spec_reader, hash_key, installs, self._data)
+            spec._mark_root_concrete()
+
+        record = InstallRecord.from_dict(spec, rec)
+        self._data[hash_key] = record
+        if not spec.external and record.installed and record.path:
+            self._installed_prefixes.add(record.path)
+
+    def _record_changed(self, hash_key: str) -> None:
+        """Mark a record as changed in the current write transaction."""
+        self._changed_keys[hash_key] = None
+        self._query_index = None
 
     def reindex(self):
         """Build database index from scratch based on a directory layout.
@@ -910,6 +1332,8 @@ def _read_suppress_error():
             old_data, self._data = self._data, {}
             try:
                 self._reindex(old_data)
+                self._snapshot_needed = True
+                self._query_index = None
             except BaseException:
                 # If anything explodes, restore old data, skip write.
                 self._data = old_data
@@ -1062,19 +1486,22 @@ def _write(self, type=None, value=None, traceback=None):
             self._state_is_inconsistent = True
             return
 
+        changed_keys, self._changed_keys = self._changed_keys, {}
+        if self._can_append_to_journal():
+            if changed_keys:
+                self._append_to_journal(changed_keys)
+                self._write_verifier()
+            return
+
         temp_file = str(self._index_path) + (".%s.%s.temp" % (_getfqdn(), os.getpid()))
 
         # Write a temporary database file them move it into place
         try:
+            self._snapshot_id = uuid.uuid4().hex if self._journal_enabled() else None
             with open(temp_file, "w", encoding="utf-8") as f:
                 self._write_to_file(f)
             fs.rename(temp_file, str(self._index_path))
-
-            if _use_uuid:
-                with self._verifier_path.open("w", encoding="utf-8") as f:
-                    new_verifier = str(uuid.uuid4())
-                    f.write(new_verifier)
-                    self.last_seen_verifier = new_verifier
+            self._write_verifier()
         except BaseException as e:
             tty.debug(e)
             # Clean up temp file if something goes wrong.
@@ -1082,6 +1509,65 @@ def _write(self, type=None, value=None, traceback=None):
                 os.remove(temp_file)
             raise
 
+        # The snapshot now contains all the changes in the journal
+        self._snapshot_needed = False
+        self._journal_offset = 0
+        self._journal_entries = 0
+        try:
+            self._journal_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _write_verifier(self):
+        if _use_uuid:
+            with self._verifier_path.open("w", encoding="utf-8") as f:
+                new_verifier = str(uuid.uuid4())
+                f.write(new_verifier)
+                self.last_seen_verifier = new_verifier
+
+    def _journal_enabled(self) -> bool:
+        # Without uuids, readers cannot tell when to replay the journal
+        return self.journal_cfg.enable and _use_uuid
+
+    def _can_append_to_journal(self) -> bool:
+        """Whether the changes of the current transaction can be appended to the journal, rather
+        than rewriting the whole index."""
+        return (
+            self._journal_enabled()
+            and not self._snapshot_needed
+            and bool(self._snapshot_id)
+            and self._index_path.is_file()
+            and self._journal_entries < self.journal_cfg.compact_after
+        )
+
+    def _append_to_journal(self, changed_keys: Dict[str, None]) -> None:
+        """Append the current state of the records that changed to the journal. Does no
+        locking."""
+        lines = []
+        if self._journal_offset == 0:
+            # Start a new journal, overwriting any leftover from an older snapshot
+            header = {"snapshot": self._snapshot_id, "version": str(_DB_VERSION)}
+            lines.append(json.dumps(header, separators=(",", ":")))
+        for key in changed_keys:
+            record = self._data.get(key)
+            entry = {
+                "key": key,
+                "record": record.to_dict(include_fields=self.record_fields) if record else None,
+            }
+            lines.append(json.dumps(entry, separators=(",", ":")))
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        mode = "wb" if self._journal_offset == 0 else "r+b"
+        with self._journal_path.open(mode) as f:
+            # Drop any incomplete entry left by an interrupted process
+            f.seek(self._journal_offset)
+            f.truncate()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_offset = f.tell()
+        self._journal_entries += len(changed_keys)
+
     def _read(self):
         """Re-read Database from the data in the set location. This does no locking."""
         if self._index_path.is_file():
@@ -1094,11 +1580,14 @@ def _read(self):
                     pass
             if (current_verifier != self.last_seen_verifier) or (current_verifier == ""):
                 self.last_seen_verifier = current_verifier
-                # Read from file if a database exists
-                self._read_from_file(self._index_path)
+                # If only the journal changed, replaying the new entries is enough. Otherwise
+                # read from file if a database exists.
+                if not (current_verifier and self._snapshot_id and self._read_journal()):
+                    self._read_from_file(self._index_path)
             elif self._state_is_inconsistent:
                 self._read_from_file(self._index_path)
                 self._state_is_inconsistent = False
+            self._changed_keys = {}
             return
         elif self.is_upstream:
             tty.warn(f"upstream not found: {self._index_path}")
@@ -1196,6 +1685,7 @@ def _add(
                 new_spec._add_dependency(record.spec, depflag=dep.depflag, virtuals=dep.virtuals)
                 if not upstream:
                     record.ref_count += 1
+                    self._record_changed(dkey)
 
             # Mark concrete once everything is built, and preserve the original hashes of concrete
             # specs.
@@ -1209,6 +1699,7 @@ def _add(
             self._data[key].installation_time = _now()
 
         self._data[key].explicit = explicit
+        self._record_changed(key)
 
     @_autospec
     def add(self, spec: "spack.spec.Spec", *, explicit: bool = False, allow_missing=False) -> None:
@@ -1249,6 +1740,7 @@ def _decrement_ref_count(self, spec: "spack.spec.Spec") -> None:
 
         rec = self._data[key]
         rec.ref_count -= 1
+        self._record_changed(key)
 
         if rec.ref_count == 0 and not rec.installed:
             del self._data[key]
@@ -1264,11 +1756,13 @@ def _increment_ref_count(self, spec: "spack.spec.Spec") -> None:
 
         rec = self._data[key]
         rec.ref_count += 1
+        self._record_changed(key)
 
     def _remove(self, spec: "spack.spec.Spec") -> "spack.spec.Spec":
         """Non-locking version of remove(); does real work."""
         key = self._get_matching_spec_key(spec)
         rec = self._data[key]
+        self._record_changed(key)
 
         # This install prefix is now free for other specs to use, even if the
         # spec is only marked uninstalled.
@@ -1345,6 +1839,7 @@ def _deprecate(self, spec: "spack.spec.Spec", deprecator: "spack.spec.Spec") ->
         spec_rec.deprecated_for = deprecator_key
         spec_rec.installed = False
         self._data[spec_key] = spec_rec
+        self._record_changed(spec_key)
 
     @_autospec
     def mark(self, spec: "spack.spec.Spec", key: str, value: Any) -> None:
@@ -1353,8 +1848,9 @@ def mark(self, spec: "spack.spec.Spec", key: str, value: Any) -> None:
             return self._mark(spec, key, value)
 
     def _mark(self, spec: "spack.spec.Spec", key, value) -> None:
-        record = self._data[self._get_matching_spec_key(spec)]
-        setattr(record, key, value)
+        spec_key = self._get_matching_spec_key(spec)
+        setattr(self._data[spec_key], key, value)
+        self._record_changed(spec_key)
 
     @_autospec
     def deprecate(self, spec: "spack.spec.Spec", deprecator: "spack.spec.Spec") -> None:
@@ -1453,7 +1949,10 @@ def get_by_hash_local(
         ``query()`` and ``query_one()`` differ in that they only return installed specs by default.
         """
         with self.read_transaction():
-            return self._get_by_hash_local(dag_hash, default=default, installed=installed)
+            specs = self._get_by_hash_local(dag_hash, default=default, installed=installed)
+            if specs:
+                self._load_dependents(specs)
+            return specs
 
     def get_by_hash(
         self,
@@ -1481,6 +1980,8 @@ def get_by_hash(
         for upstream_db in self.upstream_dbs:
             spec = upstream_db._get_by_hash_local(dag_hash, default=default, installed=installed)
             if spec is not None:
+                with self.read_transaction():
+                    self._load_dependents(spec)
                 return spec
 
         return default
@@ -1498,7 +1999,7 @@ def _query(
         in_buildcache: Optional[bool] = None,
         origin: Optional[str] = None,
     ) -> List["spack.spec.Spec"]:
-        installed = normalize_query(installed)
+        install_status = normalize_query(installed)
 
         # Restrict the set of records over which we iterate first
         matching_hashes = self._data
@@ -1515,56 +2016,73 @@ def _query(
             matching_hashes = {hash_key: matching_hashes[hash_key]}
 
         results = []
-        start_date = start_date or datetime.datetime.min
-        end_date = end_date or datetime.datetime.max
+        check_dates = start_date is not None or end_date is not None
+        lower_date = start_date or datetime.datetime.min
+        upper_date = end_date or datetime.datetime.max
 
-        deferred = []
-        for rec in matching_hashes.values():
+        def _record_matches(rec: InstallRecord) -> bool:
             if origin and not (origin == rec.origin):
-                continue
+                return False
 
-            if not rec.install_type_matches(installed):
-                continue
+            if not rec.install_type_matches(install_status):
+                return False
 
             if in_buildcache is not None and rec.in_buildcache != in_buildcache:
-                continue
+                return False
 
             if explicit is not None and rec.explicit != explicit:
-                continue
+                return False
 
             if predicate_fn is not None and not predicate_fn(rec):
-                continue
+                return False
 
-            if start_date or end_date:
+            if check_dates:
                 inst_date = datetime.datetime.fromtimestamp(rec.installation_time)
-                if not (start_date < inst_date < end_date):
-                    continue
+                if not (lower_date < inst_date < upper_date):
+                    return False
 
-            if query_spec is None or query_spec.concrete:
-                results.append(rec.spec)
-                continue
+            return True
 
-            # check anon specs and exact name matches first
-            if not query_spec.name or rec.spec.name == query_spec.name:
+        if query_spec is None or query_spec.concrete:
+            for rec in matching_hashes.values():
+                if _record_matches(rec):
+                    results.append(rec.spec)
+            return results
+
+        # Narrow down the records with the indexes, and check only the remaining candidates
+        query_index = self._get_query_index()
+        if not query_spec.name:
+            candidates = query_index.candidates(query_spec, query_index.hashes_by_name)
+            for hash_key, rec in matching_hashes.items():
+                if candidates is not None and hash_key not in candidates:
+                    continue
+                if not _record_matches(rec):
+                    continue
                 if rec.spec.satisfies(query_spec):
                     results.append(rec.spec)
+            return results
 
-            # save potential virtual matches for later, but not if we already found a match
-            elif not results:
-                deferred.append(rec.spec)
+        # Check exact name matches first. Only specs of records with that name are constructed.
+        candidates = query_index.candidates(query_spec, (query_spec.name,))
+        for hash_key in query_index.hashes_by_name.get(query_spec.name, ()):
+            if candidates is not None and hash_key not in candidates:
+                continue
+            record = matching_hashes.get(hash_key)
+            if record is None or not _record_matches(record):
+                continue
+            if record.spec.satisfies(query_spec):
+                results.append(record.spec)
 
         # Checking for virtuals is expensive, so we save it for last and only if needed.
-        # If we get here, we didn't find anything in the DB that matched by name.
-        # If we did fine something, the query spec can't be virtual b/c we matched an actual
+        # If we found something, the query spec can't be virtual b/c we matched an actual
         # package installation, so skip the virtual check entirely. If we *didn't* find anything,
-        # check all the deferred specs *if* the query is virtual.
-        if (
-            not results
-            and query_spec is not None
-            and deferred
-            and spack.repo.PATH.is_virtual(query_spec.name)
-        ):
-            results = [spec for spec in deferred if spec.satisfies(query_spec)]
+        # check all the other specs *if* the query is virtual.
+        if not results and spack.repo.PATH.is_virtual(query_spec.name):
+            for rec in matching_hashes.values():
+                if rec.name == query_spec.name or not _record_matches(rec):
+                    continue
+                if rec.spec.satisfies(query_spec):
+                    results.append(rec.spec)
 
         return results
 
@@ -1616,7 +2134,7 @@ def query_local(
             origin: origin of the spec
         """
         with self.read_transaction():
-            return self._query(
+            results = self._query(
                 query_spec,
                 predicate_fn=predicate_fn,
                 installed=installed,
@@ -1627,6 +2145,8 @@ def query_local(
                 in_buildcache=in_buildcache,
                 origin=origin,
             )
+            self._load_dependents(results)
+            return results
 
     def query(
         self,
@@ -1721,6 +2241,10 @@ def query(
                 )
             )
 
+        if upstream_results:
+            with self.read_transaction():
+                self._load_dependents(upstream_results)
+
         results = list(local_results) + list(x for x in upstream_results if x not in local_results)
         results.sort()  # type: ignore[call-overload]
         return results
@@ -0,0 +1,179 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Classes and functions to manage a cache of the data declared by package directives.
+
+Reading the versions, variants or dependencies of a package requires importing its
+``package.py`` file, which is slow when done for thousands of packages. The index in this module
+stores that data per repository, so that commands can get it without executing package code.
+"""
+import copy
+from collections.abc import Mapping
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import spack
+import spack.error
+import spack.util.spack_json as sjson
+
+#: Version of the format of the index on disk. Indexes with another version, or written by
+#: another version of Spack, are regenerated.
+INDEX_VERSION = 1
+
+
+class PackageDirectives(NamedTuple):
+    """Data declared by the directives of a package, stored with plain types."""
+
+    #: Name of the package
+    name: str
+    #: Docstring of the package class
+    description: str
+    #: Homepage of the package
+    homepage: Optional[str]
+    #: Maintainers of the package
+    maintainers: List[str]
+    #: Versions of the package, from the highest to the lowest
+    versions: List[str]
+    #: Versions that are deprecated
+    deprecated_versions: List[str]
+    #: Names of the variants of the package
+    variants: List[str]
+    #: Maps the name of a dependency to a list of (when, depflag) tuples
+    dependencies: Dict[str, List[Tuple[str, int]]]
+    #: Names of the virtuals provided by the package
+    provides: List[str]
+    #: List of (when, conflicting spec, message) tuples
+    conflicts: List[Tuple[str, str, Optional[str]]]
+    #: List of (when, list of alternative requirements) tuples
+    requirements: List[Tuple[str, List[str]]]
+    #: Tags of the package
+    tags: List[str]
+
+    @staticmethod
+    def from_package_class(pkg_cls) -> "PackageDirectives":
+        """Extract the directives data from a package class."""
+        versions = sorted(pkg_cls.versions, reverse=True)
+        dependencies: Dict[str, List[Tuple[str, int]]] = {}
+        for name, conditions in pkg_cls.dependencies_by_name(when=True).items():
+            dependencies[name] = [
+                (str(when), dep.depflag) for when, deps in conditions.items() for dep in deps
+            ]
+
+        return PackageDirectives(
+            name=pkg_cls.name,
+            description=pkg_cls.__doc__ or "",
+            homepage=getattr(pkg_cls, "homepage", None),
+            maintainers=list(getattr(pkg_cls, "maintainers", [])),
+            versions=[str(v) for v in versions],
+            deprecated_versions=[
+                str(v) for v in versions if pkg_cls.versions[v].get("deprecated", False)
+            ],
+            variants=sorted(pkg_cls.variant_names()),
+            dependencies=dependencies,
+            provides=pkg_cls.provided_virtual_names(),
+            conflicts=[
+                (str(when), str(spec), msg)
+                for when, conflicts in pkg_cls.conflicts.items()
+                for spec, msg in conflicts
+            ],
+            requirements=[
+                (str(when), [str(x) for x in requirements])
+                for when, conditions in pkg_cls.requirements.items()
+                for requirements, _, _ in conditions
+            ],
+            tags=[tag.lower() for tag in getattr(pkg_cls, "tags", [])],
+        )
+
+    @staticmethod
+    def from_dict(d: dict) -> "PackageDirectives":
+        d = dict(d)
+        d["dependencies"] = {
+            name: [tuple(x) for x in conditions] for name, conditions in d["dependencies"].items()
+        }
+        d["conflicts"] = [tuple(x) for x in d["conflicts"]]
+        d["requirements"] = [tuple(x) for x in d["requirements"]]
+        return PackageDirectives(**d)
+
+
+class DirectivesIndex(Mapping):
+    """Maps package names to the data declared by their directives."""
+
+    def __init__(self, repository):
+        self._packages: Dict[str, PackageDirectives] = {}
+        self.repository = repository
+
+    def to_json(self, stream):
+        sjson.dump(
+            {
+                "version": INDEX_VERSION,
+                "spack": spack.spack_version,
+                "directives": {name: d._asdict() for name, d in self._packages.items()},
+            },
+            stream,
+        )
+
+    @staticmethod
+    def from_json(stream, repository):
+        try:
+            d = sjson.load(stream)
+        except ValueError as e:
+            raise DirectivesIndexError("DirectivesIndex data is not valid JSON", str(e)) from e
+
+        if not isinstance(d, dict):
+            raise DirectivesIndexError("DirectivesIndex data was not a dict.")
+
+        if "directives" not in d:
+            raise DirectivesIndexError("DirectivesIndex data does not start with 'directives'")
+
+        if d.get("version") != INDEX_VERSION or d.get("spack") != spack.spack_version:
+            raise DirectivesIndexError(
+                "DirectivesIndex data was written by another version of Spack"
+            )
+
+        r = DirectivesIndex(repository=repository)
+        try:
+            r._packages = {
+                name: PackageDirectives.from_dict(data) for name, data in d["directives"].items()
+            }
+        except (KeyError, TypeError) as e:
+            raise DirectivesIndexError("DirectivesIndex data is malformed", str(e)) from e
+        return r
+
+    def __getitem__(self, pkg_name: str) -> PackageDirectives:
+        return self._packages[pkg_name]
+
+    def __iter__(self):
+        return iter(self._packages)
+
+    def __len__(self):
+        return len(self._packages)
+
+    def copy(self):
+        """Return a deep copy of this index."""
+        clone = DirectivesIndex(repository=self.repository)
+        clone._packages = copy.deepcopy(self._packages)
+        return clone
+
+    def merge(self, other):
+        """Merge another directives index into this one. Packages in the other index take
+        precedence over packages with the same name in this one.
+
+        Args:
+            other (DirectivesIndex): directives index to be merged
+        """
+        self._packages.update(other._packages)
+
+    def update_package(self, pkg_name: str):
+        """Updates a package in the directives index, or removes it if it doesn't exist anymore.
+
+        Args:
+            pkg_name (str): name of the package to be updated
+        """
+        if not self.repository.exists(pkg_name):
+            self._packages.pop(pkg_name, None)
+            return
+        pkg_cls = self.repository.get_pkg_class(pkg_name)
+        self._packages[pkg_name] = PackageDirectives.from_package_class(pkg_cls)
+
+
+class DirectivesIndexError(spack.error.SpackError):
+    """Raised when there is a problem with a DirectivesIndex."""
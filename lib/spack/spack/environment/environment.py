@@ -5,15 +5,18 @@
 import collections.abc
 import contextlib
 import errno
+import hashlib
+import marshal
 import os
 import pathlib
 import re
 import shutil
 import stat
+import sys
 import urllib.parse
 import urllib.request
 import warnings
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 import llnl.util.filesystem as fs
 import llnl.util.tty as tty
@@ -725,6 +728,7 @@ def _view(self, root: str) -> fsv.SimpleFilesystemView:
             ignore_conflicts=True,
             projections=self.projections,
             link_type=self.link_type,
+            link_jobs=spack.config.get("config:view_link_jobs", 1),
         )
 
     def __contains__(self, spec):
@@ -769,7 +773,8 @@ def regenerate(self, concrete_roots: List[Spec]) -> None:
 
         # To ensure there are no conflicts with packages being installed
         # that cannot be resolved or have repos that have been removed
-        # we always regenerate the view from scratch.
+        # we always regenerate the view in a new directory, possibly reusing
+        # the files of the current view for the specs that did not change.
         # We will do this by hashing the view contents and putting the view
         # in a directory by hash, and then having a symlink to the real
         # view in the root. The real root for a view at /dirname/basename
@@ -813,10 +818,17 @@ def regenerate(self, concrete_roots: List[Spec]) -> None:
                 f"The environment view in {self.root} cannot not be created because {msg}."
             ) from e
 
-        # Create a new view
+        # Create a new view, reusing the files of the old one when possible
         try:
             fs.mkdirp(new_root)
-            view.add_specs(*specs)
+            if (
+                old_root
+                and os.path.isdir(old_root)
+                and spack.config.get("config:incremental_views", True)
+            ):
+                view.add_specs_incrementally(old_root, *specs)
+            else:
+                view.add_specs(*specs)
 
             # create symlink from tmp_symlink_name to new_root
             if os.path.exists(tmp_symlink_name):
@@ -892,6 +904,80 @@ def env_subdir_path(manifest_dir: Union[str, pathlib.Path]) -> str:
     return os.path.join(str(manifest_dir), env_subdir_name)
 
 
+class LockfileSpecs(collections.abc.MutableMapping):
+    """Maps the DAG hashes of the roots of an environment to their concrete specs.
+
+    Specs are read from the nodes of the lockfile only when they are accessed, together with
+    their dependencies. Nodes are shared among the roots that have been read, so the specs are
+    the same as those read eagerly.
+    """
+
+    def __init__(self, reader, nodes_by_hash: Dict[str, Dict[str, Any]], roots: List[str]):
+        self.reader = reader
+        self.nodes_by_hash = nodes_by_hash
+        self._specs_by_hash: Dict[str, Spec] = {}
+        self._roots: Dict[str, Optional[Spec]] = dict.fromkeys(roots)
+
+    def __getitem__(self, dag_hash: str) -> Spec:
+        spec = self._roots[dag_hash]
+        if spec is None:
+            spec = self._roots[dag_hash] = self._read(dag_hash)
+        return spec
+
+    def __setitem__(self, dag_hash: str, spec: Spec) -> None:
+        self._roots[dag_hash] = spec
+
+    def __delitem__(self, dag_hash: str) -> None:
+        del self._roots[dag_hash]
+
+    def __iter__(self):
+        return iter(self._roots)
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    def _read(self, dag_hash: str) -> Spec:
+        """Read a node from the lockfile, together with all the nodes it depends on"""
+        # First pass: create the nodes that have not been read yet, ignoring dependencies
+        new_hashes, stack = [], [dag_hash]
+        while stack:
+            current = stack.pop()
+            if current in self._specs_by_hash:
+                continue
+            node_dict = self.nodes_by_hash[current]
+            spec = self.reader.from_node_dict(node_dict)
+            if not spec._hash:
+                spec._hash = current
+            self._specs_by_hash[current] = spec
+            new_hashes.append(current)
+
+            _, data = self.reader.name_and_data(node_dict)
+            for _, dep_hash, _, _, _ in self.reader.dependencies_from_node_dict(data):
+                stack.append(dep_hash)
+            if "build_spec" in node_dict:
+                _, build_hash, _ = self.reader.extract_build_spec_info_from_node_dict(node_dict)
+                stack.append(build_hash)
+
+        # Second pass: connect the new nodes to their dependencies, and build specs
+        for current in new_hashes:
+            node_dict = self.nodes_by_hash[current]
+            spec = self._specs_by_hash[current]
+            _, data = self.reader.name_and_data(node_dict)
+            for _, dep_hash, deptypes, _, virtuals in self.reader.dependencies_from_node_dict(
+                data
+            ):
+                spec._add_dependency(
+                    self._specs_by_hash[dep_hash],
+                    depflag=dt.canonicalize(deptypes),
+                    virtuals=virtuals,
+                )
+            if "build_spec" in node_dict:
+                _, build_hash, _ = self.reader.extract_build_spec_info_from_node_dict(node_dict)
+                spec._build_spec = self._specs_by_hash[build_hash]
+
+        return self._specs_by_hash[dag_hash]
+
+
 class Environment:
     """A Spack environment, which bundles together configuration and a list of specs."""
 
@@ -970,8 +1056,9 @@ def _read(self):
         self._construct_state_from_manifest()
 
         if os.path.exists(self.lock_path):
-            with open(self.lock_path, encoding="utf-8") as f:
-                read_lock_version = self._read_lockfile(f)["_meta"]["lockfile-version"]
+            data = self._load_lockfile_data()
+            self._read_lockfile_dict(data)
+            read_lock_version = data["_meta"]["lockfile-version"]
 
             if read_lock_version == 1:
                 tty.debug(f"Storing backup of {self.lock_path} at {self._lock_backup_v1_path}")
@@ -1750,7 +1837,7 @@ def _env_modifications_for_view(
         try:
             with spack.store.STORE.db.read_transaction():
                 installed_roots = [s for s in self.concrete_roots() if s.installed]
-            mods = uenv.environment_modifications_for_specs(*installed_roots, view=view)
+            mods = uenv.cached_environment_modifications_for_specs(*installed_roots, view=view)
         except Exception as e:
             # Failing to setup spec-specific changes shouldn't be a hard error.
             tty.warn(
@@ -1909,8 +1996,11 @@ def install_specs(self, specs: Optional[List[Spec]] = None, **install_args):
         PackageInstaller([spec.package for spec in specs], **install_args).install()
 
     def all_specs_generator(self) -> Iterable[Spec]:
-        """Returns a generator for all concrete specs"""
-        return traverse.traverse_nodes(self.concrete_roots(), key=traverse.by_dag_hash)
+        """Returns a generator for all concrete specs. Roots are read from the lockfile only
+        when the traversal reaches them."""
+        visited: Set[str] = set()
+        for _, root in self.concretized_specs():
+            yield from traverse.traverse_nodes([root], key=traverse.by_dag_hash, visited=visited)
 
     def all_specs(self) -> List[Spec]:
         """Returns a list of all concrete specs"""
@@ -2150,6 +2240,44 @@ def _to_lockfile_dict(self):
 
         return data
 
+    @property
+    def _lockfile_cache_path(self) -> str:
+        """Path to a marshalled copy of the lockfile data, which is faster to load than JSON"""
+        return os.path.join(self.env_subdir_path, lockfile_name + ".marshal")
+
+    def _load_lockfile_data(self) -> Dict[str, Any]:
+        """Load the data in the lockfile of this environment.
+
+        The data is cached in marshal format in the environment directory, keyed on the content
+        hash of the lockfile and on the Python version.
+        """
+        with open(self.lock_path, "rb") as f:
+            content = f.read()
+        key = (sys.version_info[:2], hashlib.sha256(content).hexdigest())
+
+        try:
+            with open(self._lockfile_cache_path, "rb") as f:
+                if marshal.load(f) == key:
+                    return marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        data = sjson.load(content.decode("utf-8"))
+        if not os.path.isdir(self.env_subdir_path):
+            return data
+
+        tmp = f"{self._lockfile_cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                marshal.dump(key, f)
+                marshal.dump(data, f)
+            os.replace(tmp, self._lockfile_cache_path)
+        except (OSError, ValueError) as e:
+            tty.debug(f"cannot cache the lockfile of {self.name}: {e}")
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+        return data
+
     def _read_lockfile(self, file_or_json):
         """Read a lockfile from a file or from a raw string."""
         lockfile_dict = sjson.load(file_or_json)
@@ -2227,12 +2355,16 @@ def _read_lockfile_dict(self, d):
                 msg += " You need to use a newer Spack version."
             raise SpackEnvironmentError(msg)
 
-        first_seen, self.concretized_order = self.filter_specs(
-            reader, json_specs_by_hash, self.concretized_order
-        )
+        if current_lockfile_format >= 4:
+            # Lockfile keys are DAG hashes, so specs can be read from the lockfile on demand
+            self.specs_by_hash = LockfileSpecs(reader, json_specs_by_hash, self.concretized_order)
+        else:
+            first_seen, self.concretized_order = self.filter_specs(
+                reader, json_specs_by_hash, self.concretized_order
+            )
 
-        for spec_dag_hash in self.concretized_order:
-            self.specs_by_hash[spec_dag_hash] = first_seen[spec_dag_hash]
+            for spec_dag_hash in self.concretized_order:
+                self.specs_by_hash[spec_dag_hash] = first_seen[spec_dag_hash]
 
         if any(self.included_concretized_order.values()):
             first_seen = {}
@@ -44,15 +44,18 @@
 import spack.config
 import spack.error
 import spack.oci.opener
+import spack.paths
 import spack.util.archive
 import spack.util.crypto as crypto
 import spack.util.git
+import spack.util.hash
+import spack.util.lock
 import spack.util.url as url_util
 import spack.util.web as web_util
 import spack.version
 import spack.version.git_ref_lookup
 from spack.util.compression import decompressor_for
-from spack.util.executable import CommandNotFoundError, Executable, which
+from spack.util.executable import CommandNotFoundError, Executable, ProcessError, which
 
 #: List of all fetch strategies, created by FetchStrategy metaclass.
 all_strategies = []
@@ -502,13 +505,17 @@ def fetch(self):
         if not os.path.isfile(path):
             raise NoCacheError(f"No cache of {path}")
 
-        # remove old symlink if one is there.
+        # remove old link if one is there.
         filename = self.stage.save_filename
         if os.path.lexists(filename):
             os.remove(filename)
 
-        # Symlink to local cached archive.
-        symlink(path, filename)
+        # Hardlink the cached archive, so that the stage does not depend on the cache, or
+        # symlink it when the cache is on another filesystem.
+        try:
+            os.link(path, filename)
+        except OSError:
+            symlink(path, filename)
 
         # Remove link if checksum fails, or subsequent fetchers will assume they don't need to
         # download.
@@ -788,6 +795,55 @@ def _repo_info(self):
 
         return f"{self.url}{args}"
 
+    def _has_commit(self) -> bool:
+        """Whether the repository in the current working directory contains ``self.commit``"""
+        self.git(
+            "cat-file",
+            "-e",
+            f"{self.commit}^{{commit}}",
+            output=os.devnull,
+            error=os.devnull,
+            fail_on_error=False,
+        )
+        return self.git.returncode == 0
+
+    def _cached_repository(self) -> Optional[str]:
+        """Return the bare repository shared by all the fetches of ``self.url``, after making
+        sure it contains ``self.commit``. Only the objects missing from the shared repository are
+        downloaded. Return None if the shared repository cannot be used."""
+        if not self.cachable:
+            return None
+
+        path = git_repository_cache_path(self.url)
+        quiet = [] if spack.config.get("config:debug") else ["--quiet"]
+        lock = spack.util.lock.Lock(f"{path}.lock", desc=f"git repository cache of {self.url}")
+        try:
+            mkdirp(os.path.dirname(path))
+            with spack.util.lock.WriteTransaction(lock, timeout=600):
+                if not os.path.exists(path):
+                    self.bare_clone(path)
+
+                with working_dir(path):
+                    if not self._has_commit():
+                        tty.debug(f"Updating the git repository cache of {self.url}")
+                        self.git(
+                            "fetch",
+                            *quiet,
+                            "origin",
+                            "+refs/heads/*:refs/heads/*",
+                            "+refs/tags/*:refs/tags/*",
+                        )
+                    if not self._has_commit():
+                        # Commits that are not on a branch or tag are kept alive by a ref
+                        self.git(
+                            "fetch", *quiet, "origin", f"{self.commit}:refs/spack/{self.commit}"
+                        )
+        except (ProcessError, OSError, spack.util.lock.LockError) as e:
+            tty.debug(f"Cannot use the git repository cache of {self.url}: {e}")
+            return None
+
+        return path
+
     @_needs_stage
     def fetch(self):
         if self.stage.expanded:
@@ -831,8 +887,10 @@ def _clone_src(self) -> None:
 
         if self.commit:
             # Need to do a regular clone and check out everything if
-            # they asked for a particular commit.
-            clone_args = ["clone", self.url]
+            # they asked for a particular commit. Clone from the shared
+            # repository when possible, which hardlinks its objects.
+            cached_repository = self._cached_repository()
+            clone_args = ["clone", cached_repository or self.url]
             if not debug:
                 clone_args.insert(1, "--quiet")
             with temp_cwd():
@@ -848,6 +906,9 @@ def _clone_src(self) -> None:
                 )
 
             with working_dir(dest):
+                if cached_repository:
+                    # Relative submodule urls are resolved against the actual remote
+                    git("remote", "set-url", "origin", self.url)
                 checkout_args = ["checkout", self.commit]
                 if not debug:
                     checkout_args.insert(1, "--quiet")
@@ -1729,8 +1790,20 @@ def store(self, fetcher, relative_dest):
             return
 
         dst = os.path.join(self.root, relative_dest)
+
+        # Archives are stored by digest, so an existing entry has the same content
+        if isinstance(fetcher, URLFetchStrategy) and os.path.exists(dst):
+            return
+
+        # Archive to a temporary file first, so that concurrent fetches never see partial entries
         mkdirp(os.path.dirname(dst))
-        fetcher.archive(dst)
+        tmp = f"{dst}.tmp-{os.getpid()}"
+        try:
+            fetcher.archive(tmp)
+            os.replace(tmp, dst)
+        finally:
+            if os.path.lexists(tmp):
+                os.remove(tmp)
 
     def fetcher(self, target_path: str, digest: Optional[str], **kwargs) -> CacheURLFetchStrategy:
         path = os.path.join(self.root, target_path)
@@ -1741,6 +1814,12 @@ def destroy(self):
         shutil.rmtree(self.root, ignore_errors=True)
 
 
+def git_repository_cache_path(url: str) -> str:
+    """Return the path of the bare repository caching the git repository at a url. The cache is
+    shared by fetches and by the lookup of git versions."""
+    return os.path.join(spack.paths.user_repos_cache_path, spack.util.hash.b32_hash(url)[-7:])
+
+
 class NoCacheError(spack.error.FetchError):
     """Raised when there is no cached archive for a package."""
 
@@ -2,6 +2,8 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
+import collections
+import concurrent.futures
 import functools as ft
 import itertools
 import os
@@ -10,7 +12,7 @@
 import stat
 import sys
 import tempfile
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from typing_extensions import Literal
 
@@ -50,6 +52,14 @@
 
 _projections_path = ".spack/projections.yaml"
 
+#: Index of the files owned by each spec in a view, relative to the view root
+_view_index_path = os.path.join(".spack", "view-index.json")
+
+_view_index_version = 2
+
+#: Number of directories or files handled by a single task, when linking a view concurrently
+_LINK_CHUNK_SIZE = 256
+
 
 LinkCallbackType = Callable[[str, str, "FilesystemView", Optional[spack.spec.Spec]], None]
 
@@ -680,6 +690,57 @@ class SimpleFilesystemView(FilesystemView):
     """A simple and partial implementation of FilesystemView focused on performance and immutable
     views, where specs cannot be removed after they were added."""
 
+    def __init__(
+        self,
+        root: str,
+        layout: spack.directory_layout.DirectoryLayout,
+        *,
+        link_jobs: int = 1,
+        **kwargs,
+    ):
+        super().__init__(root, layout, **kwargs)
+        #: Number of threads making directories and linking files into the view
+        self.link_jobs = link_jobs
+
+    def _run_tasks(self, tasks: List[Callable[[], None]]) -> None:
+        """Run tasks with up to ``link_jobs`` threads, and re-raise the first error."""
+        if self.link_jobs <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                task()
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.link_jobs, thread_name_prefix="spack-view"
+        ) as executor:
+            futures = [executor.submit(task) for task in tasks]
+            for future in futures:
+                future.result()
+
+    def _make_directories(self, directories: Iterable[str]) -> None:
+        """Make directories relative to the root of the view. Directories at the same depth are
+        made concurrently, and parents are always made before their children."""
+        by_depth: Dict[int, List[str]] = collections.defaultdict(list)
+        for d in directories:
+            by_depth[d.count(os.sep)].append(os.path.join(self._root, d))
+
+        for depth in sorted(by_depth):
+            paths = by_depth[depth]
+            self._run_tasks(
+                [
+                    ft.partial(_make_directories, paths[i : i + _LINK_CHUNK_SIZE])
+                    for i in range(0, len(paths), _LINK_CHUNK_SIZE)
+                ]
+            )
+
+    def _link_files(self, links: List[Tuple[str, str]]) -> None:
+        """Link full source paths to full destination paths, concurrently."""
+        self._run_tasks(
+            [
+                ft.partial(_link_files, self, links[i : i + _LINK_CHUNK_SIZE])
+                for i in range(0, len(links), _LINK_CHUNK_SIZE)
+            ]
+        )
+
     def _sanity_check_view_projection(self, specs):
         """A very common issue is that we end up with two specs of the same package, that project
         to the same prefix. We want to catch that as early as possible and give a sensible error to
@@ -705,6 +766,126 @@ def add_specs(self, *specs: spack.spec.Spec) -> None:
 
         self._sanity_check_view_projection(specs)
 
+        visitor = self._visit_specs(specs)
+
+        # Throw on fatal dir-file conflicts.
+        if visitor.fatal_conflicts:
+            raise MergeConflictSummary(visitor.fatal_conflicts)
+
+        # Inform about file-file conflicts.
+        if visitor.file_conflicts:
+            if self.ignore_conflicts:
+                tty.debug(f"{len(visitor.file_conflicts)} file conflicts")
+            else:
+                raise MergeConflictSummary(visitor.file_conflicts)
+
+        entries = self._link_visited_specs(specs, visitor)
+
+        root_to_hash = {s.package.view_source(): s.dag_hash() for s in specs}
+        shared = {
+            path: sorted(set(root_to_hash[root] for root in roots))
+            for path, roots in visitor.shared_files().items()
+        }
+        self._write_index(entries, shared)
+
+    def add_specs_incrementally(self, previous_root: str, *specs: spack.spec.Spec) -> None:
+        """Link a root-to-leaf topologically ordered list of specs into the view, starting from
+        the files of the view in ``previous_root``, which is left untouched.
+
+        Files of specs that are in both views are hardlinked from the previous root, so that only
+        the files of removed and added specs are processed. When that cannot give the same result
+        as :meth:`add_specs`, for example because the changed specs have conflicting files, the
+        view is linked from scratch."""
+        assert all((s.concrete for s in specs))
+
+        # Drop externals
+        specs = [s for s in specs if not s.external]
+
+        self._sanity_check_view_projection(specs)
+
+        try:
+            self._add_specs_incrementally(previous_root, specs)
+        except IncrementalViewError as e:
+            tty.debug(f"Linking all specs into {self._root}: {e}")
+            shutil.rmtree(self._root)
+            mkdirp(self._root)
+            self.add_specs(*specs)
+
+    def _add_specs_incrementally(self, previous_root: str, specs):
+        previous = _read_view_index(previous_root)
+        if previous is None:
+            raise IncrementalViewError(f"there is no ownership index in {previous_root}")
+
+        if previous["link_type"] != self.link_type or previous["projections"] != [
+            list(item) for item in self.projections.items()
+        ]:
+            raise IncrementalViewError("the link type or the projections changed")
+
+        # Copied files are relocated to the root of the view, so they can't be reused in another
+        if canonicalize_link_type(self.link_type) == "copy":
+            raise IncrementalViewError("files of copy views are relocated to their root")
+
+        # Specs are matched on their hash and on the prefix their files are linked from. A
+        # prefix that was installed again, e.g. with --overwrite, has other files and inodes.
+        new_specs = {s.dag_hash(): s for s in specs}
+        kept, removed = {}, {}
+        for dag_hash, entry in previous["specs"].items():
+            spec = new_specs.get(dag_hash)
+            if (
+                spec is not None
+                and spec.package.view_source() == entry["prefix"]
+                and _prefix_stamp(entry["prefix"]) == entry["stamp"]
+            ):
+                kept[dag_hash] = entry
+            else:
+                removed[dag_hash] = entry
+        added = [s for s in specs if s.dag_hash() not in kept]
+
+        tty.debug(f"Removing {len(removed)} and adding {len(added)} specs in {self._root}")
+
+        # The index tracks the files of a spec only if they come from its merge map. Kept specs
+        # must not have custom files either, since those may refer to the root of the old view.
+        if not all(entry["merge_map_only"] for entry in removed.values()) or not all(
+            _adds_only_merge_map(s) for s in specs
+        ):
+            raise IncrementalViewError("a spec adds files outside of its merge map")
+
+        # Which of the specs claiming the same file wins depends on all the specs in the view.
+        shared_hashes = {h for hashes in previous["shared"].values() for h in hashes}
+        if shared_hashes.intersection(removed) or any(
+            s.dag_hash() in shared_hashes for s in added
+        ):
+            raise IncrementalViewError("a changed spec shares files with other specs")
+
+        # Overlay the previous view, without the files of removed specs
+        removed_files = {f for entry in removed.values() for f in entry["files"]}
+        removed_files.add(_view_index_path)
+        try:
+            _hardlink_tree(previous_root, self._root, removed_files)
+        except (OSError, NotImplementedError) as e:
+            raise IncrementalViewError(f"cannot hardlink files from {previous_root}: {e}") from e
+
+        # Remove the directories that only removed specs contributed to, from the deepest
+        kept_dirs = {d for entry in kept.values() for d in entry["dirs"]}
+        removed_dirs = {d for entry in removed.values() for d in entry["dirs"]} - kept_dirs
+        for d in sorted(removed_dirs, key=lambda d: d.count(os.sep), reverse=True):
+            try:
+                os.rmdir(os.path.join(self._root, d))
+            except OSError:
+                pass
+
+        visitor = self._visit_specs(added)
+        if visitor.fatal_conflicts or visitor.file_conflicts or visitor.shared_files():
+            raise IncrementalViewError("the added specs conflict with files in the view")
+
+        entries = dict(kept)
+        entries.update(self._link_visited_specs(added, visitor))
+        self._write_index(entries, previous["shared"])
+
+    def _visit_specs(self, specs) -> "_OwnershipVisitor":
+        """Gather the directories to be made and the files to be linked for the specs, and check
+        for conflicts with the files already in the view."""
+
         # Ignore spack meta data folder.
         def skip_list(file):
             return os.path.basename(file) == spack.store.STORE.layout.metadata_dir
@@ -712,45 +893,94 @@ def skip_list(file):
         # Determine if the root is on a case-insensitive filesystem
         normalize_paths = is_folder_on_case_insensitive_filesystem(self._root)
 
-        visitor = SourceMergeVisitor(ignore=skip_list, normalize_paths=normalize_paths)
+        visitor = _OwnershipVisitor(ignore=skip_list, normalize_paths=normalize_paths)
 
         # Gather all the directories to be made and files to be linked
         for spec in specs:
             src_prefix = spec.package.view_source()
-            visitor.set_projection(self.get_relative_projection_for_spec(spec))
+            projection = self.get_relative_projection_for_spec(spec)
+            visitor.set_projection(projection)
+            visitor.claim_projection(src_prefix, projection)
             visit_directory_tree(src_prefix, visitor)
 
         # Check for conflicts in destination dir.
         visit_directory_tree(self._root, DestinationMergeVisitor(visitor))
 
-        # Throw on fatal dir-file conflicts.
-        if visitor.fatal_conflicts:
-            raise MergeConflictSummary(visitor.fatal_conflicts)
-
-        # Inform about file-file conflicts.
-        if visitor.file_conflicts:
-            if self.ignore_conflicts:
-                tty.debug(f"{len(visitor.file_conflicts)} file conflicts")
-            else:
-                raise MergeConflictSummary(visitor.file_conflicts)
+        return visitor
 
+    def _link_visited_specs(self, specs, visitor: "_OwnershipVisitor") -> Dict[str, dict]:
+        """Link the specs visited by the visitor into the view, and return the entries of the
+        ownership index for them."""
         tty.debug(f"Creating {len(visitor.directories)} dirs and {len(visitor.files)} links")
 
         # Make the directory structure
-        for dst in visitor.directories:
-            os.mkdir(os.path.join(self._root, dst))
+        self._make_directories(visitor.directories)
 
-        # Link the files using a "merge map": full src => full dst
+        # Link the files using a "merge map": full src => full dst. The merge map of packages
+        # using the default add_files_to_view is split in chunks linked concurrently, while
+        # packages with a custom implementation get their whole merge map in a single task.
         merge_map_per_prefix = self._source_merge_visitor_to_merge_map(visitor)
+        tasks: List[Callable[[], None]] = []
         for spec in specs:
-            merge_map = merge_map_per_prefix.get(spec.package.view_source(), None)
+            pkg = spec.package
+            merge_map = merge_map_per_prefix.get(pkg.view_source(), None)
             if not merge_map:
                 # Not every spec may have files to contribute.
                 continue
-            spec.package.add_files_to_view(self, merge_map, skip_if_exists=False)
+            if _add_files_to_view_module(spec) == "spack.package_base":
+                items = list(merge_map.items())
+                chunks = [
+                    dict(items[i : i + _LINK_CHUNK_SIZE])
+                    for i in range(0, len(items), _LINK_CHUNK_SIZE)
+                ]
+            else:
+                chunks = [merge_map]
+            tasks.extend(
+                ft.partial(pkg.add_files_to_view, self, chunk, skip_if_exists=False)
+                for chunk in chunks
+            )
+        self._run_tasks(tasks)
 
         # Finally create the metadata dirs.
-        self.link_metadata(specs)
+        metadata_visitor = self.link_metadata(specs)
+
+        files_per_root: Dict[str, List[str]] = collections.defaultdict(list)
+        for v in (visitor, metadata_visitor):
+            for dst_rel, (src_root, _) in v.files.items():
+                files_per_root[src_root].append(dst_rel)
+
+        entries = {}
+        metadata_dir = spack.store.STORE.layout.metadata_dir
+        for spec in specs:
+            src_prefix = spec.package.view_source()
+            metadata_prefix = os.path.join(src_prefix, metadata_dir)
+            entries[spec.dag_hash()] = {
+                "prefix": src_prefix,
+                "stamp": _prefix_stamp(src_prefix),
+                "files": files_per_root[src_prefix] + files_per_root[metadata_prefix],
+                "dirs": sorted(
+                    visitor.directories_by_root[src_prefix]
+                    | metadata_visitor.directories_by_root[metadata_prefix]
+                ),
+                "merge_map_only": _adds_only_merge_map(spec),
+            }
+        return entries
+
+    def _write_index(self, entries: Dict[str, dict], shared: Dict[str, List[str]]) -> None:
+        """Write the index of the files owned by each spec in the view."""
+        if not entries:
+            return
+        index = {
+            "version": _view_index_version,
+            "link_type": self.link_type,
+            "projections": [list(item) for item in self.projections.items()],
+            "specs": entries,
+            "shared": shared,
+        }
+        path = os.path.join(self._root, _view_index_path)
+        mkdirp(os.path.dirname(path))
+        with open(path, "w", encoding="utf-8") as f:
+            s_json.dump(index, f)
 
     def _source_merge_visitor_to_merge_map(self, visitor: SourceMergeVisitor):
         # For compatibility with add_files_to_view, we have to create a
@@ -775,8 +1005,8 @@ def relative_metadata_dir_for_spec(self, spec):
             spec.name,
         )
 
-    def link_metadata(self, specs):
-        metadata_visitor = SourceMergeVisitor()
+    def link_metadata(self, specs) -> "_OwnershipVisitor":
+        metadata_visitor = _OwnershipVisitor()
 
         for spec in specs:
             src_prefix = os.path.join(
@@ -784,6 +1014,7 @@ def link_metadata(self, specs):
             )
             proj = self.relative_metadata_dir_for_spec(spec)
             metadata_visitor.set_projection(proj)
+            metadata_visitor.claim_projection(src_prefix, proj)
             visit_directory_tree(src_prefix, metadata_visitor)
 
         # Check for conflicts in destination dir.
@@ -797,11 +1028,15 @@ def link_metadata(self, specs):
         if metadata_visitor.file_conflicts:
             raise MergeConflictSummary(metadata_visitor.file_conflicts)
 
-        for dst in metadata_visitor.directories:
-            os.mkdir(os.path.join(self._root, dst))
+        self._make_directories(metadata_visitor.directories)
+        self._link_files(
+            [
+                (os.path.join(src_root, src_relpath), os.path.join(self._root, dst_relpath))
+                for dst_relpath, (src_root, src_relpath) in metadata_visitor.files.items()
+            ]
+        )
 
-        for dst_relpath, (src_root, src_relpath) in metadata_visitor.files.items():
-            self.link(os.path.join(src_root, src_relpath), os.path.join(self._root, dst_relpath))
+        return metadata_visitor
 
     def get_relative_projection_for_spec(self, spec):
         # Extensions are placed by their extendee, not by their own spec
@@ -828,6 +1063,117 @@ def get_projection_for_spec(self, spec):
         return self._root
 
 
+class _OwnershipVisitor(SourceMergeVisitor):
+    """A SourceMergeVisitor that also records the directories each source prefix contributes
+    to, and the files in the destination that are claimed by more than one source prefix."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        #: Maps source prefixes to the destination directories they contribute to
+        self.directories_by_root: Dict[str, Set[str]] = collections.defaultdict(set)
+        #: Maps destination files to the source prefixes claiming them
+        self._claims: Dict[str, List[str]] = {}
+
+    def _claim(self, proj_rel_path: str, root: str) -> None:
+        key = proj_rel_path.lower() if self.normalize_paths else proj_rel_path
+        self._claims.setdefault(key, []).append(root)
+
+    def claim_projection(self, root: str, projection: str) -> None:
+        """Record the directories made for the projection of a source prefix."""
+        path = ""
+        for part in os.path.normpath(projection).split(os.sep):
+            if part in ("", "."):
+                continue
+            path = os.path.join(path, part)
+            self.directories_by_root[root].add(path)
+
+    def before_visit_dir(self, root: str, rel_path: str, depth: int) -> bool:
+        proj_rel_path = os.path.join(self.projection, rel_path)
+        if not self.ignore(rel_path) and self._in_files(proj_rel_path):
+            # A directory replacing a file claimed by another prefix
+            self._claim(proj_rel_path, self._file(proj_rel_path)[1])
+            self._claim(proj_rel_path, root)
+        result = super().before_visit_dir(root, rel_path, depth)
+        if result:
+            self.directories_by_root[root].add(proj_rel_path)
+        return result
+
+    def visit_file(self, root: str, rel_path: str, depth: int, *, symlink: bool = False) -> None:
+        proj_rel_path = os.path.join(self.projection, rel_path)
+        if not self.ignore(rel_path):
+            if self._in_directories(proj_rel_path):
+                # A file dropped in favor of a directory of another prefix
+                self._claim(proj_rel_path, self._directory(proj_rel_path)[1])
+            self._claim(proj_rel_path, root)
+        super().visit_file(root, rel_path, depth, symlink=symlink)
+
+    def shared_files(self) -> Dict[str, List[str]]:
+        """Return the destination files claimed by more than one source prefix, mapped to the
+        prefixes claiming them."""
+        return {path: roots for path, roots in self._claims.items() if len(set(roots)) > 1}
+
+
+def _add_files_to_view_module(spec: spack.spec.Spec) -> str:
+    """Return the module of the class implementing ``add_files_to_view`` for the package of a
+    spec."""
+    owner = next(c for c in type(spec.package).__mro__ if "add_files_to_view" in vars(c))
+    return owner.__module__
+
+
+def _adds_only_merge_map(spec: spack.spec.Spec) -> bool:
+    """Whether the package of a spec adds to a view just the files in its merge map. Packages
+    overriding ``add_files_to_view`` may create other files, which are not tracked in the
+    ownership index of the view, or rewrite files to refer to the root of the view, like the
+    shebangs of python extensions."""
+    return _add_files_to_view_module(spec) == "spack.package_base"
+
+
+def _make_directories(paths: List[str]) -> None:
+    for path in paths:
+        os.mkdir(path)
+
+
+def _link_files(view: FilesystemView, links: List[Tuple[str, str]]) -> None:
+    for src, dst in links:
+        view.link(src, dst)
+
+
+def _prefix_stamp(prefix: str) -> Optional[List[int]]:
+    """Return a value that changes when a prefix is installed again"""
+    try:
+        st = os.stat(prefix)
+    except OSError:
+        return None
+    return [st.st_dev, st.st_ino, st.st_mtime_ns]
+
+
+def _read_view_index(root: str) -> Optional[dict]:
+    """Read the ownership index of the view in a root directory, or return None if there is no
+    usable index."""
+    try:
+        with open(os.path.join(root, _view_index_path), encoding="utf-8") as f:
+            index = s_json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != _view_index_version:
+        return None
+    return index
+
+
+def _hardlink_tree(src_root: str, dst_root: str, skip: Set[str], rel_dir: str = "") -> None:
+    """Recreate the directories of src_root in dst_root, and hardlink all files except the ones
+    in skip, which are relative to src_root. Symlinks are hardlinked, not followed."""
+    with os.scandir(os.path.join(src_root, rel_dir)) as it:
+        for entry in it:
+            rel_path = os.path.join(rel_dir, entry.name)
+            dst = os.path.join(dst_root, rel_path)
+            if entry.is_dir(follow_symlinks=False):
+                os.mkdir(dst)
+                _hardlink_tree(src_root, dst_root, skip, rel_path)
+            elif rel_path not in skip:
+                os.link(entry.path, dst, follow_symlinks=False)
+
+
 #####################
 # utility functions #
 #####################
@@ -890,6 +1236,10 @@ class ConflictingProjectionsError(SpackError):
     """Raised when a view has a projections file and is given one manually."""
 
 
+class IncrementalViewError(SpackError):
+    """Raised when a view cannot be updated incrementally from a previous view."""
+
+
 def is_folder_on_case_insensitive_filesystem(path: str) -> bool:
     with tempfile.NamedTemporaryFile(dir=path, prefix=".sentinel") as sentinel:
         return os.path.exists(os.path.join(path, os.path.basename(sentinel.name).upper()))
@@ -25,12 +25,14 @@
 
 """
 
+import concurrent.futures
 import copy
 import enum
 import glob
 import heapq
 import io
 import itertools
+import multiprocessing.connection
 import os
 import shutil
 import sys
@@ -354,7 +356,10 @@ def _print_timer(pre: str, pkg_id: str, timer: timer.BaseTimer) -> None:
 
 
 def _install_from_cache(
-    pkg: "spack.package_base.PackageBase", explicit: bool, unsigned: Optional[bool] = False
+    pkg: "spack.package_base.PackageBase",
+    explicit: bool,
+    unsigned: Optional[bool] = False,
+    download: Optional[concurrent.futures.Future] = None,
 ) -> bool:
     """
     Install the package from binary cache
@@ -364,12 +369,13 @@ def _install_from_cache(
         explicit: ``True`` if installing the package was explicitly
             requested by the user, otherwise, ``False``
         unsigned: if ``True`` or ``False`` override the mirror signature verification defaults
+        download: download of the binary package started ahead of time, if any
 
     Return: ``True`` if the package was extract from binary cache, ``False`` otherwise
     """
     t = timer.Timer()
     installed_from_cache = _try_install_from_binary_cache(
-        pkg, explicit, unsigned=unsigned, timer=t
+        pkg, explicit, unsigned=unsigned, timer=t, download=download
     )
     if not installed_from_cache:
         return False
@@ -432,6 +438,7 @@ def _process_binary_cache_tarball(
     unsigned: Optional[bool],
     mirrors_for_spec: Optional[list] = None,
     timer: timer.BaseTimer = timer.NULL_TIMER,
+    download: Optional[concurrent.futures.Future] = None,
 ) -> bool:
     """
     Process the binary cache tarball.
@@ -443,15 +450,20 @@ def _process_binary_cache_tarball(
         mirrors_for_spec: Optional list of concrete specs and mirrors
         obtained by calling binary_distribution.get_mirrors_for_spec().
         timer: timer to keep track of binary install phases.
+        download: download of the binary package started ahead of time, if any
 
     Return:
         bool: ``True`` if the package was extracted from binary cache,
             else ``False``
     """
     with timer.measure("fetch"):
-        download_result = binary_distribution.download_tarball(
-            pkg.spec.build_spec, unsigned, mirrors_for_spec
-        )
+        if download is not None:
+            # Wait for the download started by the prefetcher
+            download_result = download.result()
+        else:
+            download_result = binary_distribution.download_tarball(
+                pkg.spec.build_spec, unsigned, mirrors_for_spec
+            )
 
         if download_result is None:
             return False
@@ -479,6 +491,7 @@ def _try_install_from_binary_cache(
     explicit: bool,
     unsigned: Optional[bool] = None,
     timer: timer.BaseTimer = timer.NULL_TIMER,
+    download: Optional[concurrent.futures.Future] = None,
 ) -> bool:
     """
     Try to extract the package from binary cache.
@@ -488,7 +501,13 @@ def _try_install_from_binary_cache(
         explicit: the package was explicitly requested by the user
         unsigned: if ``True`` or ``False`` override the mirror signature verification defaults
         timer: timer to keep track of binary install phases.
+        download: download of the binary package started ahead of time, if any
     """
+    if download is not None:
+        return _process_binary_cache_tarball(
+            pkg, explicit, unsigned, timer=timer, download=download
+        )
+
     # Early exit if no binary mirrors are configured.
     if not spack.mirrors.mirror.MirrorCollection(binary=True):
         return False
@@ -1136,11 +1155,68 @@ def priority(self):
 class BuildTask(Task):
     """Class for representing a build task for a package."""
 
+    #: Child process building the package from sources, if it has been launched
+    process: Optional["spack.build_environment.BuildProcess"] = None
+
+    #: Result of the task, if it completed while being launched
+    _result: Optional[ExecuteResult] = None
+
+    #: Error raised while launching the task, to be re-raised on completion
+    _error: Optional[BaseException] = None
+
+    #: Download of the binary package started by the prefetcher, if any
+    binary_download: Optional[concurrent.futures.Future] = None
+
+    def launch(self, install_status: InstallStatus, *, build_jobs: Optional[int] = None) -> None:
+        """
+        Launch the installation of the requested spec and/or dependency represented by the
+        build task.
+
+        Builds from sources run in a child process, which is not waited for: use ``poll()`` to
+        check whether it is done, and ``execute()`` to complete the task. Any other kind of
+        install (e.g. from a binary cache) completes before this method returns. Errors are
+        deferred to ``execute()``, so that they are handled like those of a blocking install.
+
+        Args:
+            install_status: used to format progress reporting for this task
+            build_jobs: maximum number of jobs the build process is allowed to use
+        """
+        try:
+            self._result = self._launch(install_status, build_jobs=build_jobs, wait=False)
+        except KeyboardInterrupt:
+            raise
+        except BaseException as e:
+            self._error = e
+
+    def poll(self) -> bool:
+        """Return True if the task can be completed without blocking."""
+        return self.process is None or self.process.poll()
+
+    def terminate(self) -> None:
+        """Terminate the build process of this task, if any is running."""
+        if self.process is not None:
+            self.process.terminate()
+            self.process = None
+
     def execute(self, install_status):
         """
         Perform the installation of the requested spec and/or dependency
-        represented by the build task.
+        represented by the build task, or complete it if it was launched already.
         """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+        if self._result is None and self.process is None:
+            return self._launch(install_status, wait=True)
+
+        if self.process is None:
+            return self._result
+        return self._complete()
+
+    def _launch(
+        self, install_status: InstallStatus, *, build_jobs: Optional[int] = None, wait: bool
+    ) -> Optional[ExecuteResult]:
         install_args = self.request.install_args
         tests = install_args.get("tests")
         unsigned = install_args.get("unsigned")
@@ -1153,7 +1229,8 @@ def execute(self, install_status):
 
         # Use the binary cache if requested
         if self.use_cache:
-            if _install_from_cache(pkg, self.explicit, unsigned):
+            download, self.binary_download = self.binary_download, None
+            if _install_from_cache(pkg, self.explicit, unsigned, download=download):
                 return ExecuteResult.SUCCESS
             elif self.cache_only:
                 raise spack.error.InstallError(
@@ -1162,35 +1239,50 @@ def execute(self, install_status):
             else:
                 tty.msg(f"No binary for {pkg_id} found: installing from source")
 
-        pkg.run_tests = tests is True or tests and pkg.name in tests
+        pkg.run_tests = tests is True or bool(tests and pkg.name in tests)
 
         # hook that allows tests to inspect the Package before installation
         # see unit_test_check() docs.
         if not pkg.unit_test_check():
             return ExecuteResult.FAILED
 
-        try:
-            # Create stage object now and let it be serialized for the child process. That
-            # way monkeypatch in tests works correctly.
-            pkg.stage
+        # Create stage object now and let it be serialized for the child process. That
+        # way monkeypatch in tests works correctly.
+        pkg.stage
 
-            self._setup_install_dir(pkg)
+        self._setup_install_dir(pkg)
 
-            # Create a child process to do the actual installation.
-            # Preserve verbosity settings across installs.
-            spack.package_base.PackageBase._verbose = spack.build_environment.start_build_process(
+        if wait:
+            # Create a child process to do the actual installation, and wait for it
+            self.process = spack.build_environment.spawn_build_process(
                 pkg, build_process, install_args
             )
+            return self._complete()
+
+        # Create a child process to do the actual installation, without waiting for it
+        if build_jobs is not None:
+            install_args = dict(install_args, build_jobs=build_jobs)
+        self.process = spack.build_environment.spawn_build_process(
+            pkg, build_process, install_args, forward_stdin=False
+        )
+        return None
+
+    def _complete(self) -> ExecuteResult:
+        assert self.process is not None, "the build process has not been started"
+        process, self.process = self.process, None
+        try:
+            # Preserve verbosity settings across installs.
+            spack.package_base.PackageBase._verbose = process.complete()
 
             # Note: PARENT of the build process adds the new package to
             # the database, so that we don't need to re-read from file.
-            spack.store.STORE.db.add(pkg.spec, explicit=self.explicit)
+            spack.store.STORE.db.add(self.pkg.spec, explicit=self.explicit)
         except spack.error.StopPhase as e:
             # A StopPhase exception means that do_install was asked to
             # stop early from clients, and is not an error at this point
             pid = f"{self.pid}: " if tty.show_pid() else ""
             tty.debug(f"{pid}{str(e)}")
-            tty.debug(f"Package stage directory: {pkg.stage.source_path}")
+            tty.debug(f"Package stage directory: {self.pkg.stage.source_path}")
         return ExecuteResult.SUCCESS
 
 
@@ -1227,6 +1319,56 @@ def execute(self, install_status):
         return ExecuteResult.SUCCESS
 
 
+class BinaryPrefetcher:
+    """Downloads binary packages in background threads, ahead of their installation.
+
+    Only downloads, together with the verification of signatures and checksums, are done
+    concurrently. Extraction and relocation are still done by the installer, one package at a
+    time, in dependency order.
+    """
+
+    def __init__(self, jobs: int) -> None:
+        #: Maximum number of concurrent downloads
+        self.jobs = jobs
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._downloads: Dict[str, concurrent.futures.Future] = {}
+
+    def prefetch(
+        self, spec: "spack.spec.Spec", unsigned: Optional[bool], mirrors_for_spec=None
+    ) -> concurrent.futures.Future:
+        """Start downloading the binary package of a concrete spec, and return the future result
+        of :func:`spack.binary_distribution.prefetch_tarball`."""
+        key = spec.dag_hash()
+        if key not in self._downloads:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.jobs, thread_name_prefix="spack-prefetch"
+                )
+            self._downloads[key] = self._executor.submit(
+                binary_distribution.prefetch_tarball, spec, unsigned, mirrors_for_spec
+            )
+        return self._downloads[key]
+
+    def shutdown(self) -> None:
+        """Cancel the pending downloads, and remove the staged files of the downloads that were
+        not consumed."""
+        for future in self._downloads.values():
+            future.cancel()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        for future in self._downloads.values():
+            if future.cancelled() or future.exception() is not None:
+                continue
+            download_result = future.result()
+            if download_result is not None:
+                # Destroying stages is idempotent, so it's fine for consumed downloads
+                binary_distribution._delete_staged_downloads(download_result)
+        self._downloads.clear()
+
+
 class PackageInstaller:
     """
     Class for managing the install process for a Spack instance based on a bottom-up DAG approach.
@@ -1235,11 +1377,15 @@ class PackageInstaller:
     shared file system) builds for the same Spack instance.
     """
 
+    #: Error message used when terminating the installation after the first failure
+    fail_fast_err = "Terminating after first install failure"
+
     def __init__(
         self,
         packages: List["spack.package_base.PackageBase"],
         *,
         cache_only: bool = False,
+        concurrent_packages: Optional[int] = None,
         dependencies_cache_only: bool = False,
         dependencies_use_cache: bool = True,
         dirty: bool = False,
@@ -1266,6 +1412,9 @@ def __init__(
     ) -> None:
         """
         Arguments:
+            concurrent_packages: Maximum number of packages built from sources at the same time
+                by this process. The build jobs are shared among them. If None, the value is taken
+                from the ``config:concurrent_packages`` configuration.
             explicit: Set of package hashes to be marked as installed explicitly in the db. If
                 True, the specs from ``packages`` are marked explicit, while their dependencies are
                 not.
@@ -1348,6 +1497,21 @@ def __init__(
         # Initializing all_dependencies to empty. This will be set later in _init_queue.
         self.all_dependencies: Dict[str, Set[str]] = {}
 
+        # Maximum number of build processes running at the same time
+        if concurrent_packages is None:
+            concurrent_packages = spack.config.get("config:concurrent_packages", 1)
+        self.concurrent_packages: int = max(1, concurrent_packages)
+
+        # Tasks whose build process is running, in the order they were launched
+        self.active_tasks: List[BuildTask] = []
+
+        # Downloads of binary packages ahead of their installation
+        self.prefetcher = BinaryPrefetcher(spack.config.get("config:binary_prefetch_jobs", 4))
+
+        # Failures of explicitly requested packages, reported at the end of the install
+        self._failed_build_requests: List[Tuple["spack.package_base.PackageBase", str, str]] = []
+        self._single_requested_spec = len(self.build_requests) == 1
+
     def __repr__(self) -> str:
         """Returns a formal representation of the package installer."""
         rep = f"{self.__class__.__name__}("
@@ -1976,6 +2140,34 @@ def _init_queue(self) -> None:
                     task.add_dependent(dependent_id)
         self.all_dependencies = all_dependencies
 
+    def _prefetch_binaries(self) -> None:
+        """Start downloading the binary packages of all the queued build tasks that can be
+        installed from a binary cache, in the order they are expected to be installed."""
+        if self.prefetcher.jobs < 1 or not spack.mirrors.mirror.MirrorCollection(binary=True):
+            return
+
+        tasks = [
+            task
+            for _, task in sorted(self.build_pq)
+            if isinstance(task, BuildTask)
+            and task.use_cache
+            and task.pkg_id not in self.installed
+            and not task.pkg.spec.external
+            and not task.pkg.spec.installed
+        ]
+
+        # Nothing to overlap with a single download
+        if len(tasks) < 2:
+            return
+
+        tty.debug(f"Prefetching binary packages for {len(tasks)} specs")
+        for task in tasks:
+            spec = task.pkg.spec.build_spec
+            matches = binary_distribution.get_mirrors_for_spec(spec, index_only=True)
+            task.binary_download = self.prefetcher.prefetch(
+                spec, task.request.install_args.get("unsigned"), matches
+            )
+
     def _install_action(self, task: Task) -> InstallAction:
         """
         Determine whether the installation should be overwritten (if it already
@@ -2016,9 +2208,7 @@ def install(self) -> None:
         """Install the requested package(s) and or associated dependencies."""
 
         self._init_queue()
-        fail_fast_err = "Terminating after first install failure"
-        single_requested_spec = len(self.build_requests) == 1
-        failed_build_requests = []
+        self._failed_build_requests = []
 
         install_status = InstallStatus(len(self.build_pq))
 
@@ -2028,14 +2218,82 @@ def install(self) -> None:
             enabled=sys.stdout.isatty() and tty.msg_enabled() and not tty.is_debug()
         )
 
-        while self.build_pq:
+        # Share the build jobs among the packages that are built concurrently
+        build_jobs = None
+        if self.concurrent_packages > 1:
+            total_jobs = spack.config.determine_number_of_jobs(parallel=True)
+            build_jobs = max(1, total_jobs // self.concurrent_packages)
+
+        try:
+            self._prefetch_binaries()
+            self._install_loop(install_status, term_status, build_jobs)
+        finally:
+            # Don't leave orphaned builds behind, e.g. on failures with --fail-fast
+            self._terminate_active_tasks()
+            self.prefetcher.shutdown()
+
+        # Cleanup, which includes releasing all of the read locks
+        self._cleanup_all_tasks()
+
+        # Ensure we properly report if one or more explicit specs failed
+        # or were not installed when should have been.
+        missing = [
+            (request.pkg, request.pkg_id)
+            for request in self.build_requests
+            if request.install_args.get("install_package") and request.pkg_id not in self.installed
+        ]
+
+        if self._failed_build_requests or missing:
+            for _, pkg_id, err in self._failed_build_requests:
+                tty.error(f"{pkg_id}: {err}")
+
+            for _, pkg_id in missing:
+                tty.error(f"{pkg_id}: Package was not installed")
+
+            if len(self._failed_build_requests) > 0:
+                pkg = self._failed_build_requests[0][0]
+                ids = [pkg_id for _, pkg_id, _ in self._failed_build_requests]
+                tty.debug(
+                    "Associating installation failure with first failed "
+                    f"explicit package ({ids[0]}) from {', '.join(ids)}"
+                )
+
+            elif len(missing) > 0:
+                pkg = missing[0][0]
+                ids = [pkg_id for _, pkg_id in missing]
+                tty.debug(
+                    "Associating installation failure with first "
+                    f"missing package ({ids[0]}) from {', '.join(ids)}"
+                )
+
+            raise spack.error.InstallError(
+                "Installation request failed.  Refer to reported errors for failing package(s).",
+                pkg=pkg,
+            )
+
+    def _install_loop(
+        self, install_status: InstallStatus, term_status: TermStatusLine, build_jobs: Optional[int]
+    ) -> None:
+        """Process the build queue until it is empty, and all the active builds are done.
+
+        Args:
+            install_status: the installation status, for progress reporting
+            term_status: status line reporting on packages being installed by other processes
+            build_jobs: maximum number of jobs for each build, when building concurrently
+        """
+        while self.build_pq or self.active_tasks:
+            # Complete the builds that are done, without blocking
+            self._complete_active_tasks(install_status, block=False)
+
+            if not self._can_start_next_task():
+                # Wait for at least one of the active builds to be done
+                self._complete_active_tasks(install_status, block=True)
+                continue
+
             task = self._pop_task()
             if task is None:
                 continue
 
-            install_args = task.request.install_args
-            keep_prefix = install_args.get("keep_prefix")
-
             pkg, pkg_id, spec = task.pkg, task.pkg_id, task.pkg.spec
             install_status.next_pkg(pkg)
             install_status.set_term_title(f"Processing {pkg.name}")
@@ -2080,7 +2338,7 @@ def install(self) -> None:
                 self._update_failed(task)
 
                 if self.fail_fast:
-                    raise spack.error.InstallError(fail_fast_err, pkg=pkg)
+                    raise spack.error.InstallError(self.fail_fast_err, pkg=pkg)
 
                 continue
 
@@ -2153,119 +2411,153 @@ def install(self) -> None:
             # Proceed with the installation since we have an exclusive write
             # lock on the package.
             install_status.set_term_title(f"Installing {pkg.name}")
-            try:
+            if self.concurrent_packages > 1 and isinstance(task, BuildTask):
                 action = self._install_action(task)
-
                 if action == InstallAction.INSTALL:
-                    self._install_task(task, install_status)
-                elif action == InstallAction.OVERWRITE:
-                    # spack.store.STORE.db is not really a Database object, but a small
-                    # wrapper -- silence mypy
-                    OverwriteInstall(self, spack.store.STORE.db, task, install_status).install()  # type: ignore[arg-type] # noqa: E501
-
-                # If we installed then we should keep the prefix
-                stop_before_phase = getattr(pkg, "stop_before_phase", None)
-                last_phase = getattr(pkg, "last_phase", None)
-                keep_prefix = keep_prefix or (stop_before_phase is None and last_phase is None)
-
-            except KeyboardInterrupt as exc:
-                # The build has been terminated with a Ctrl-C so terminate
-                # regardless of the number of remaining specs.
-                tty.error(
-                    f"Failed to install {pkg.name} due to " f"{exc.__class__.__name__}: {str(exc)}"
-                )
+                    task.launch(install_status, build_jobs=build_jobs)
+                    if task.process is not None:
+                        tty.debug(f"Building {pkg_id} in process {task.process.pid}")
+                        self.active_tasks.append(task)
+                        continue
+                self._complete_task(task, install_status, action)
+            else:
+                self._complete_task(task, install_status)
+
+    def _complete_task(
+        self, task: Task, install_status: InstallStatus, action: Optional[InstallAction] = None
+    ) -> None:
+        """
+        Install the package of a task we hold a write lock for (or wait for its build, if it
+        was launched already) and handle the outcome of the installation.
+
+        Args:
+            task: the installation task for a package
+            install_status: the installation status for the package
+            action: how to install the package, or None to determine it here
+        """
+        pkg, pkg_id = task.pkg, task.pkg_id
+        keep_prefix = task.request.install_args.get("keep_prefix")
+        try:
+            if action is None:
+                action = self._install_action(task)
+
+            if action == InstallAction.INSTALL:
+                self._install_task(task, install_status)
+            elif action == InstallAction.OVERWRITE:
+                # spack.store.STORE.db is not really a Database object, but a small
+                # wrapper -- silence mypy
+                OverwriteInstall(self, spack.store.STORE.db, task, install_status).install()  # type: ignore[arg-type] # noqa: E501
+
+            # If we installed then we should keep the prefix
+            stop_before_phase = getattr(pkg, "stop_before_phase", None)
+            last_phase = getattr(pkg, "last_phase", None)
+            keep_prefix = keep_prefix or (stop_before_phase is None and last_phase is None)
+
+        except KeyboardInterrupt as exc:
+            # The build has been terminated with a Ctrl-C so terminate
+            # regardless of the number of remaining specs.
+            tty.error(
+                f"Failed to install {pkg.name} due to " f"{exc.__class__.__name__}: {str(exc)}"
+            )
+            raise
+
+        except binary_distribution.NoChecksumException as exc:
+            if task.cache_only:
                 raise
 
-            except binary_distribution.NoChecksumException as exc:
-                if task.cache_only:
-                    raise
+            # Checking hash on downloaded binary failed.
+            tty.error(
+                f"Failed to install {pkg.name} from binary cache due "
+                f"to {str(exc)}: Requeueing to install from source."
+            )
+            # this overrides a full method, which is ugly.
+            task.use_cache = False  # type: ignore[misc]
+            self._requeue_task(task, install_status)
+            return
 
-                # Checking hash on downloaded binary failed.
+        except (Exception, SystemExit) as exc:
+            self._update_failed(task, True, exc)
+
+            # Best effort installs suppress the exception and mark the
+            # package as a failure.
+            if not isinstance(exc, spack.error.SpackError) or not exc.printed:  # type: ignore[union-attr] # noqa: E501
+                exc.printed = True  # type: ignore[union-attr]
+                # SpackErrors can be printed by the build process or at
+                # lower levels -- skip printing if already printed.
+                # TODO: sort out this and SpackError.print_context()
                 tty.error(
-                    f"Failed to install {pkg.name} from binary cache due "
-                    f"to {str(exc)}: Requeueing to install from source."
+                    f"Failed to install {pkg.name} due to " f"{exc.__class__.__name__}: {str(exc)}"
                 )
-                # this overrides a full method, which is ugly.
-                task.use_cache = False  # type: ignore[misc]
-                self._requeue_task(task, install_status)
-                continue
+            # Terminate if requested to do so on the first failure.
+            if self.fail_fast:
+                raise spack.error.InstallError(
+                    f"{self.fail_fast_err}: {str(exc)}", pkg=pkg
+                ) from exc
 
-            except (Exception, SystemExit) as exc:
-                self._update_failed(task, True, exc)
-
-                # Best effort installs suppress the exception and mark the
-                # package as a failure.
-                if not isinstance(exc, spack.error.SpackError) or not exc.printed:  # type: ignore[union-attr] # noqa: E501
-                    exc.printed = True  # type: ignore[union-attr]
-                    # SpackErrors can be printed by the build process or at
-                    # lower levels -- skip printing if already printed.
-                    # TODO: sort out this and SpackError.print_context()
-                    tty.error(
-                        f"Failed to install {pkg.name} due to "
-                        f"{exc.__class__.__name__}: {str(exc)}"
-                    )
-                # Terminate if requested to do so on the first failure.
-                if self.fail_fast:
-                    raise spack.error.InstallError(
-                        f"{fail_fast_err}: {str(exc)}", pkg=pkg
-                    ) from exc
-
-                # Terminate when a single build request has failed, or summarize errors later.
-                if task.is_build_request:
-                    if single_requested_spec:
-                        raise
-                    failed_build_requests.append((pkg, pkg_id, str(exc)))
-
-            finally:
-                # Remove the install prefix if anything went wrong during
-                # install.
-                if not keep_prefix and not action == InstallAction.OVERWRITE:
-                    pkg.remove_prefix()
-
-            # Perform basic task cleanup for the installed spec to
-            # include downgrading the write to a read lock
-            if pkg.spec.installed:
-                self._cleanup_task(pkg)
+            # Terminate when a single build request has failed, or summarize errors later.
+            if task.is_build_request:
+                if self._single_requested_spec:
+                    raise
+                self._failed_build_requests.append((pkg, pkg_id, str(exc)))
+
+        finally:
+            # Remove the install prefix if anything went wrong during
+            # install.
+            if not keep_prefix and not action == InstallAction.OVERWRITE:
+                pkg.remove_prefix()
+
+        # Perform basic task cleanup for the installed spec to
+        # include downgrading the write to a read lock
+        if pkg.spec.installed:
+            self._cleanup_task(pkg)
+
+    def _can_start_next_task(self) -> bool:
+        """Return True if the next task in the queue can be processed, False if we need
+        to wait for an active build to be done first.
+        """
+        if not self.active_tasks:
+            return True
 
-        # Cleanup, which includes releasing all of the read locks
-        self._cleanup_all_tasks()
+        if len(self.active_tasks) >= self.concurrent_packages:
+            return False
 
-        # Ensure we properly report if one or more explicit specs failed
-        # or were not installed when should have been.
-        missing = [
-            (request.pkg, request.pkg_id)
-            for request in self.build_requests
-            if request.install_args.get("install_package") and request.pkg_id not in self.installed
-        ]
+        # Drop removed tasks from the head of the queue, so that it reflects the actual
+        # priority of the next task
+        while self.build_pq and self.build_pq[0][1].status == BuildStatus.REMOVED:
+            heapq.heappop(self.build_pq)
 
-        if failed_build_requests or missing:
-            for _, pkg_id, err in failed_build_requests:
-                tty.error(f"{pkg_id}: {err}")
+        # Tasks with uninstalled dependencies need to wait for the active builds
+        return bool(self.build_pq) and self._next_is_pri0()
 
-            for _, pkg_id in missing:
-                tty.error(f"{pkg_id}: Package was not installed")
-
-            if len(failed_build_requests) > 0:
-                pkg = failed_build_requests[0][0]
-                ids = [pkg_id for _, pkg_id, _ in failed_build_requests]
-                tty.debug(
-                    "Associating installation failure with first failed "
-                    f"explicit package ({ids[0]}) from {', '.join(ids)}"
-                )
+    def _complete_active_tasks(self, install_status: InstallStatus, block: bool) -> None:
+        """Complete the active builds that are done.
 
-            elif len(missing) > 0:
-                pkg = missing[0][0]
-                ids = [pkg_id for _, pkg_id in missing]
-                tty.debug(
-                    "Associating installation failure with first "
-                    f"missing package ({ids[0]}) from {', '.join(ids)}"
-                )
+        Args:
+            install_status: the installation status, for progress reporting
+            block: if True, wait until at least one active build is done
+        """
+        if not self.active_tasks:
+            return
 
-            raise spack.error.InstallError(
-                "Installation request failed.  Refer to reported errors for failing package(s).",
-                pkg=pkg,
+        if block:
+            multiprocessing.connection.wait(
+                [task.process.sentinel for task in self.active_tasks if task.process]
             )
 
+        for task in [task for task in self.active_tasks if task.poll()]:
+            self.active_tasks.remove(task)
+            install_status.set_term_title(f"Completing {task.pkg.name}")
+            self._complete_task(task, install_status, InstallAction.INSTALL)
+
+    def _terminate_active_tasks(self) -> None:
+        """Terminate all the active builds, and remove their install prefixes."""
+        while self.active_tasks:
+            task = self.active_tasks.pop()
+            tty.debug(f"Terminating the build of {task.pkg_id}")
+            task.terminate()
+            if not task.request.install_args.get("keep_prefix"):
+                task.pkg.remove_prefix()
+
 
 class BuildProcessInstaller:
     """This class implements the part installation that happens in the child process."""
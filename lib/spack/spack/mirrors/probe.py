@@ -0,0 +1,126 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Concurrent probing of source mirrors, and statistics about their latency and failures.
+
+When ``config:race_mirrors`` is set, the stage asks every mirror whether it has an archive at the
+same time, and tries mirrors in the order they answer. The outcome of each probe is persisted in
+the misc cache, so that mirrors that were slow or failing are tried last.
+"""
+import concurrent.futures
+import time
+from typing import Dict, Generator, List, Optional, Tuple
+
+import llnl.util.tty as tty
+
+import spack.caches
+import spack.fetch_strategy
+import spack.util.spack_json as sjson
+import spack.util.web as web_util
+
+#: Key of the statistics in the misc cache
+STATS_KEY = "mirrors/probe-stats.json"
+
+#: Weight of the latest probe in the moving average of the latency
+_SMOOTHING = 0.3
+
+#: Statistics of a mirror, with keys "probes", "failures", "latency" and "last_probe"
+MirrorProbeStats = Dict[str, float]
+
+
+def read_stats() -> Dict[str, MirrorProbeStats]:
+    """Return the probe statistics of all the mirrors, keyed by their fetch url."""
+    with spack.caches.MISC_CACHE.read_transaction(STATS_KEY) as f:
+        if f is None:
+            return {}
+        try:
+            return sjson.load(f)["mirrors"]
+        except (ValueError, KeyError, TypeError) as e:
+            tty.debug(f"Ignoring malformed mirror statistics: {e}")
+            return {}
+
+
+def record_stats(results: Dict[str, Tuple[bool, float]]) -> None:
+    """Add the outcome of probes to the persisted statistics.
+
+    Args:
+        results: maps the fetch url of mirrors to whether their probe succeeded, and how long
+            it took in seconds
+    """
+    if not results:
+        return
+
+    with spack.caches.MISC_CACHE.write_transaction(STATS_KEY) as (old, new):
+        stats: Dict[str, MirrorProbeStats] = {}
+        if old is not None:
+            try:
+                stats = sjson.load(old)["mirrors"]
+            except (ValueError, KeyError, TypeError):
+                pass
+
+        now = time.time()
+        for url, (found, elapsed) in results.items():
+            entry = stats.setdefault(url, {"probes": 0, "failures": 0, "latency": elapsed})
+            entry["probes"] += 1
+            entry["last_probe"] = now
+            if found:
+                entry["latency"] = (1 - _SMOOTHING) * entry["latency"] + _SMOOTHING * elapsed
+            else:
+                entry["failures"] += 1
+
+        sjson.dump({"mirrors": stats}, new)
+
+
+def sort_key(entry: Optional[MirrorProbeStats]) -> Tuple[float, float]:
+    """Sort key of a mirror: mirrors that fail the least come first, then the fastest ones.
+    Mirrors that were never probed come first, so that they get statistics."""
+    if not entry or not entry["probes"]:
+        return 0.0, 0.0
+    return entry["failures"] / entry["probes"], entry["latency"]
+
+
+def probe(url: str) -> Tuple[bool, float]:
+    """Check whether a file exists at a url, with a HEAD or ranged GET request depending on the
+    fetch method. Return whether it exists, and how long the check took in seconds."""
+    start = time.perf_counter()
+    try:
+        found = web_util.url_exists(url)
+    except Exception as e:
+        tty.debug(f"Failed to probe {url}: {e}")
+        found = False
+    return found, time.perf_counter() - start
+
+
+def race(
+    candidates: List[Tuple[str, "spack.fetch_strategy.URLFetchStrategy"]],
+) -> Generator["spack.fetch_strategy.URLFetchStrategy", None, None]:
+    """Probe the urls of fetchers concurrently, and yield the fetchers in the order their probes
+    succeed. The fetchers whose probe failed are yielded last, ordered by their past statistics,
+    since some servers do not answer probes correctly.
+
+    Args:
+        candidates: list of (mirror fetch url, fetcher of the archive on that mirror) pairs
+    """
+    stats = read_stats()
+    candidates = sorted(candidates, key=lambda c: sort_key(stats.get(c[0])))
+    results: Dict[str, Tuple[bool, float]] = {}
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(candidates), thread_name_prefix="spack-mirror-probe"
+    )
+    try:
+        futures = {
+            executor.submit(probe, fetcher.url): (mirror_url, fetcher)
+            for mirror_url, fetcher in candidates
+        }
+        for future in concurrent.futures.as_completed(futures):
+            mirror_url, fetcher = futures[future]
+            results[mirror_url] = future.result()
+            if results[mirror_url][0]:
+                yield fetcher
+
+        yield from (fetcher for mirror_url, fetcher in candidates if not results[mirror_url][0])
+    finally:
+        # Don't wait for slow mirrors once a fetcher succeeded
+        executor.shutdown(wait=False)
+        record_stats(results)
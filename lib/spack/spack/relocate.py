@@ -17,11 +17,17 @@
 from llnl.util.lang import memoized
 from llnl.util.symlink import readlink, symlink
 
+import spack.config
 import spack.store
 import spack.util.elf as elf
 import spack.util.executable as executable
+import spack.util.parallel
 
-from .relocate_text import BinaryFilePrefixReplacer, PrefixToPrefix, TextFilePrefixReplacer
+from .relocate_text import (
+    PrefixToPrefix,
+    StreamingBinaryFilePrefixReplacer,
+    StreamingTextFilePrefixReplacer,
+)
 
 
 @memoized
@@ -228,7 +234,7 @@ def relocate_elf_binaries(binaries: Iterable[str], prefix_to_prefix: Dict[str, s
 
     for path in binaries:
         try:
-            elf.substitute_rpath_and_pt_interp_in_place_or_raise(path, prefix_to_prefix_bin)
+            elf.substitute_rpath_and_pt_interp_or_raise(path, prefix_to_prefix_bin)
         except elf.ElfCStringUpdatesFailed as e:
             # Fall back to `patchelf --set-rpath ... --set-interpreter ...`
             rpaths = e.rpath.new_value.decode("utf-8").split(":") if e.rpath else []
@@ -262,7 +268,7 @@ def relocate_text(files: Iterable[str], prefix_to_prefix: PrefixToPrefix) -> Non
         files: Text files to be relocated
         prefix_to_prefix: ordered prefix to prefix mapping
     """
-    TextFilePrefixReplacer.from_strings_or_bytes(prefix_to_prefix).apply(files)
+    StreamingTextFilePrefixReplacer.from_strings_or_bytes(prefix_to_prefix).apply(files)
 
 
 def relocate_text_bin(binaries: Iterable[str], prefix_to_prefix: PrefixToPrefix) -> List[str]:
@@ -277,7 +283,78 @@ def relocate_text_bin(binaries: Iterable[str], prefix_to_prefix: PrefixToPrefix)
     Raises:
       spack.relocate_text.BinaryTextReplaceError: when the new path is longer than the old path
     """
-    return BinaryFilePrefixReplacer.from_strings_or_bytes(prefix_to_prefix).apply(binaries)
+    return StreamingBinaryFilePrefixReplacer.from_strings_or_bytes(prefix_to_prefix).apply(
+        binaries
+    )
+
+
+#: Minimum number of files for relocation to be done by worker processes
+MIN_FILES_FOR_PARALLEL_RELOCATION = 64
+
+
+class _FileRelocator:
+    """Relocates a batch of text files and binaries. This is a class rather than a closure so
+    that it can be sent to worker processes."""
+
+    def __init__(self, prefix_to_prefix: Dict[str, str], elf: bool) -> None:
+        self.prefix_to_prefix = prefix_to_prefix
+        self.elf = elf
+
+    def __call__(self, textfiles: List[str], binaries: List[str]) -> List[str]:
+        # Rpaths and interpreter are updated first, since the fallback to patchelf may rewrite
+        # the whole binary
+        if self.elf:
+            relocate_elf_binaries(binaries, self.prefix_to_prefix)
+        relocate_text(textfiles, self.prefix_to_prefix)
+        return relocate_text_bin(binaries, self.prefix_to_prefix)
+
+
+def relocate_text_and_binaries(
+    textfiles: List[str],
+    binaries: List[str],
+    prefix_to_prefix: Dict[str, str],
+    *,
+    elf: bool = False,
+    jobs: Optional[int] = None,
+) -> List[str]:
+    """Relocate text files and binaries, spreading the files over worker processes.
+
+    Every file is relocated by a single worker, so files must not be hardlinks to each other.
+
+    Args:
+        textfiles: text files to be relocated
+        binaries: binaries to be relocated
+        prefix_to_prefix: ordered prefix to prefix mapping
+        elf: whether to update the rpaths and interpreter of ELF binaries, too
+        jobs: maximum number of worker processes, by default the number of build jobs
+
+    Returns:
+        The binaries that were modified by string replacement
+
+    Raises:
+        spack.relocate_text.BinaryTextReplaceError: when a prefix in a binary cannot be replaced
+    """
+    relocator = _FileRelocator(prefix_to_prefix, elf)
+    jobs = jobs or spack.config.determine_number_of_jobs(parallel=True)
+    if jobs == 1 or len(textfiles) + len(binaries) < MIN_FILES_FOR_PARALLEL_RELOCATION:
+        return relocator(textfiles, binaries)
+
+    # A few batches per worker, so that workers stay busy when files have very different sizes
+    num_batches = 4 * jobs
+    batches = [(textfiles[i::num_batches], binaries[i::num_batches]) for i in range(num_batches)]
+
+    changed_files: List[str] = []
+    with spack.util.parallel.make_concurrent_executor(jobs) as executor:
+        futures = [executor.submit(relocator, *batch) for batch in batches if any(batch)]
+        try:
+            for future in futures:
+                changed_files.extend(future.result())
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return changed_files
 
 
 def is_macho_magic(magic: bytes) -> bool:
@@ -5,8 +5,12 @@
 """This module contains pure-Python classes and functions for replacing
 paths inside text files and binaries."""
 
+import heapq
+import os
 import re
-from typing import IO, Dict, Iterable, List, Union
+import shutil
+import tempfile
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from llnl.util.lang import PatternBytes
 
@@ -210,48 +214,331 @@ def _apply_to_file(self, f: IO[bytes]) -> bool:
             # The matching prefix (old) and its replacement (new)
             old = match.group(1)
             new = self.prefix_to_prefix[old]
+            f.seek(match.start())
+            f.write(_c_string_replacement(old, new, match.group(2), self.suffix_safety_size))
+            modified = True
+
+        return modified
 
-            # Did we find a trailing null within a N + 1 bytes window after the prefix?
-            null_terminated = match.end(0) > match.end(1)
-
-            # Suffix string length, excluding the null byte. Only makes sense if null_terminated
-            suffix_strlen = match.end(0) - match.end(1) - 1
-
-            # How many bytes are we shrinking our string?
-            bytes_shorter = len(old) - len(new)
-
-            # We can't make strings larger.
-            if bytes_shorter < 0:
-                raise CannotGrowString(old, new)
-
-            # If we don't know whether this is a null terminated C-string (we're looking only N + 1
-            # bytes ahead), or if it is and we have a common suffix, we can simply pad with leading
-            # dir separators.
-            elif (
-                not null_terminated
-                or suffix_strlen >= self.suffix_safety_size  # == is enough, but let's be defensive
-                or old[-self.suffix_safety_size + suffix_strlen :]
-                == new[-self.suffix_safety_size + suffix_strlen :]
-            ):
-                replacement = b"/" * bytes_shorter + new
-
-            # If it *was* null terminated, all that matters is that we can leave N bytes of old
-            # suffix in place. Note that > is required since we also insert an additional null
-            # terminator.
-            elif bytes_shorter > self.suffix_safety_size:
-                replacement = new + match.group(2)  # includes the trailing null
-
-            # Otherwise... we can't :(
+
+def _c_string_replacement(
+    old: bytes, new: bytes, suffix: Optional[bytes], suffix_safety_size: int
+) -> bytes:
+    """Return the bytes that replace the prefix ``old`` in a binary, when it has to be relocated
+    to ``new``. The replacement has the same length as ``old``, and may extend over ``suffix``.
+
+    Arguments:
+        old: the prefix found in the binary
+        new: the prefix it should be replaced with
+        suffix: if a null byte was found within ``suffix_safety_size + 1`` bytes after the prefix,
+            the bytes following the prefix up to and including the null byte, else ``None``
+        suffix_safety_size: number of bytes of the original C-string that must be preserved
+    """
+    # Suffix string length, excluding the null byte. Only makes sense if we found a trailing
+    # null within a N + 1 bytes window after the prefix
+    suffix_strlen = len(suffix) - 1 if suffix is not None else -1
+
+    # How many bytes are we shrinking our string?
+    bytes_shorter = len(old) - len(new)
+
+    # We can't make strings larger.
+    if bytes_shorter < 0:
+        raise CannotGrowString(old, new)
+
+    # If we don't know whether this is a null terminated C-string (we're looking only N + 1
+    # bytes ahead), or if it is and we have a common suffix, we can simply pad with leading
+    # dir separators.
+    elif (
+        suffix is None
+        or suffix_strlen >= suffix_safety_size  # == is enough, but let's be defensive
+        or old[-suffix_safety_size + suffix_strlen :] == new[-suffix_safety_size + suffix_strlen :]
+    ):
+        return b"/" * bytes_shorter + new
+
+    # If it *was* null terminated, all that matters is that we can leave N bytes of old
+    # suffix in place. Note that > is required since we also insert an additional null
+    # terminator.
+    elif bytes_shorter > suffix_safety_size:
+        return new + suffix  # includes the trailing null
+
+    # Otherwise... we can't :(
+    else:
+        raise CannotShrinkCString(old, new, old + suffix[:-1])
+
+
+#: Bytes that can precede a prefix in a text file, and still be part of the same word
+_WORD_BYTES = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
+
+#: Bytes that can follow a prefix in a text file, as part of the same path
+_PATH_BYTES = _WORD_BYTES | {ord("/")}
+
+#: Default number of bytes read at once by the streaming replacers
+DEFAULT_WINDOW_SIZE = 1024 * 1024
+
+
+class MultiPrefixMatcher:
+    """Finds all the occurrences of an ordered list of byte strings in some data, in a single
+    pass. When multiple strings occur at the same position, the first one in the list wins, like
+    in a regex alternation.
+
+    Strings are grouped by their leading bytes, and each group is searched for by the longest
+    prefix its strings have in common (its "anchor") with ``bytes.find``, which runs at C speed
+    and skips over data that cannot match. Each occurrence of an anchor is then confirmed with one
+    dictionary lookup per distinct string length in the group. Prefixes to be relocated usually
+    share the store root, so there are few groups, and the cost of a pass does not grow with the
+    number of prefixes.
+    """
+
+    #: Maximum number of leading bytes used to group strings
+    MAX_GROUP_KEY_LENGTH = 16
+
+    def __init__(self, patterns: List[bytes]) -> None:
+        assert patterns and all(patterns), "patterns must be non-empty byte strings"
+        self.patterns = patterns
+        self.max_length = max(len(p) for p in patterns)
+        key_length = min(min(len(p) for p in patterns), self.MAX_GROUP_KEY_LENGTH)
+
+        groups: Dict[bytes, List[int]] = {}
+        for index, pattern in enumerate(patterns):
+            groups.setdefault(pattern[:key_length], []).append(index)
+
+        #: Anchor of each group, and the (length, {pattern: index}) tuples of its strings
+        self._groups: List[Tuple[bytes, List[Tuple[int, Dict[bytes, int]]]]] = []
+        for indices in groups.values():
+            anchor = os.path.commonprefix([patterns[i] for i in indices]) or b""
+            by_length: Dict[int, Dict[bytes, int]] = {}
+            for i in indices:
+                by_length.setdefault(len(patterns[i]), {}).setdefault(patterns[i], i)
+            self._groups.append((anchor, sorted(by_length.items())))
+
+    def finditer(self, data: bytes, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Yield ``(position, index)`` for every occurrence, possibly overlapping, of a pattern
+        that starts in ``data[start:end]``, in increasing order of position. Matches must fit in
+        ``data``, but may extend past ``end``."""
+        if len(self._groups) == 1:
+            anchor, candidates = self._groups[0]
+            pos = data.find(anchor, start, end + len(anchor) - 1)
+            while pos >= 0:
+                index = self._match_at(data, pos, candidates)
+                if index >= 0:
+                    yield pos, index
+                pos = data.find(anchor, pos + 1, end + len(anchor) - 1)
+            return
+
+        heap = []
+        for group, (anchor, _) in enumerate(self._groups):
+            pos = data.find(anchor, start, end + len(anchor) - 1)
+            if pos >= 0:
+                heap.append((pos, group))
+        heapq.heapify(heap)
+
+        while heap:
+            pos, group = heap[0]
+            anchor, candidates = self._groups[group]
+            index = self._match_at(data, pos, candidates)
+            if index >= 0:
+                yield pos, index
+
+            pos = data.find(anchor, pos + 1, end + len(anchor) - 1)
+            if pos >= 0:
+                heapq.heapreplace(heap, (pos, group))
             else:
-                raise CannotShrinkCString(old, new, match.group()[:-1])
+                heapq.heappop(heap)
+
+    @staticmethod
+    def _match_at(data: bytes, pos: int, candidates: List[Tuple[int, Dict[bytes, int]]]) -> int:
+        best = -1
+        for length, patterns in candidates:
+            index = patterns.get(data[pos : pos + length], -1)
+            if index >= 0 and (best < 0 or index < best):
+                best = index
+        return best
+
+
+class _WindowedReplacer(PrefixReplacer):
+    """Base class for replacers that read files in bounded windows, and find prefixes with a
+    :class:`MultiPrefixMatcher` instead of a regex."""
+
+    def __init__(
+        self, prefix_to_prefix: Dict[bytes, bytes], window_size: int = DEFAULT_WINDOW_SIZE
+    ) -> None:
+        super().__init__(prefix_to_prefix)
+        assert window_size > 0
+        self.window_size = window_size
+        self.prefixes = list(self.prefix_to_prefix)
+        self.matcher = MultiPrefixMatcher(self.prefixes) if self.prefixes else None
+
+    @classmethod
+    def from_strings_or_bytes(cls, prefix_to_prefix: PrefixToPrefix, **kwargs):
+        """Create a replacer from an ordered prefix to prefix map."""
+        return cls(_prefix_to_prefix_as_bytes(prefix_to_prefix), **kwargs)
 
-            f.seek(match.start())
-            f.write(replacement)
-            modified = True
+
+class StreamingTextFilePrefixReplacer(_WindowedReplacer):
+    """Applies prefix to prefix mappings to text files, with the same semantics as
+    :class:`TextFilePrefixReplacer`, but without reading whole files in memory.
+
+    Files are scanned in windows of ``window_size`` bytes. Nothing is written unless a prefix is
+    found, in which case the relocated content is spooled to a temporary file, and copied back
+    at the end, preserving the inode."""
+
+    def _can_start(self, buf: bytes, pos: int, can_start_at_0: bool) -> bool:
+        """Whether a prefix at ``buf[pos]`` is preceded by a word that does not continue a path,
+        i.e. whether the lookbehind of the text relocation regex is satisfied."""
+        i = pos - 1
+        while i >= 0 and buf[i] in _WORD_BYTES:
+            i -= 1
+        return can_start_at_0 if i < 0 else buf[i] != ord("/")
+
+    def _apply_to_file(self, f: IO) -> bool:
+        assert self.matcher is not None
+        overlap = self.matcher.max_length - 1
+        buf = b""
+        offset = 0  # position of buf[0] in the file
+        read_pos = f.tell()
+        resume = 0  # position in the file where the next match may start
+        in_tail = False  # whether resume is within the path following a replaced prefix
+        can_start_at_0 = True  # whether the lookbehind is satisfied at buf[0]
+        out: Optional[IO[bytes]] = None
+        copied = 0  # position in the file up to which data was written to out
+        eof = False
+
+        try:
+            while not eof:
+                f.seek(read_pos)
+                chunk = f.read(self.window_size)
+                read_pos += len(chunk)
+                eof = not chunk
+                buf += chunk
+                safe_end = len(buf) if eof else len(buf) - overlap
+                if safe_end <= 0:
+                    continue
+
+                # Skip the rest of a path that continues from the previous window
+                if in_tail:
+                    i = resume - offset
+                    while i < len(buf) and buf[i] in _PATH_BYTES:
+                        i += 1
+                    resume = offset + i
+                    in_tail = i == len(buf) and not eof
+
+                for pos, index in self.matcher.finditer(buf, max(resume - offset, 0), safe_end):
+                    if in_tail or pos < resume - offset:
+                        continue
+                    if not self._can_start(buf, pos, can_start_at_0):
+                        continue
+                    old = self.prefixes[index]
+                    if out is None:
+                        out = tempfile.TemporaryFile()
+                        f.seek(0)
+                        _copy_range(f, out, offset)
+                        copied = offset
+                    out.write(buf[copied - offset : pos])
+                    out.write(self.prefix_to_prefix[old])
+                    copied = offset + pos + len(old)
+
+                    # The path following the prefix is not searched for other prefixes
+                    i = pos + len(old)
+                    while i < len(buf) and buf[i] in _PATH_BYTES:
+                        i += 1
+                    resume = offset + i
+                    in_tail = i == len(buf) and not eof
+
+                if eof:
+                    break
+
+                # Slide the window, keeping enough data for prefixes across windows
+                can_start_at_0 = self._can_start(buf, safe_end, can_start_at_0)
+                if out is not None and copied < offset + safe_end:
+                    out.write(buf[copied - offset : safe_end])
+                    copied = offset + safe_end
+                buf = buf[safe_end:]
+                offset += safe_end
+
+            if out is None:
+                return False
+
+            out.write(buf[copied - offset :])
+            out.seek(0)
+            f.seek(0)
+            shutil.copyfileobj(out, f)
+            f.truncate()
+            return True
+        finally:
+            if out is not None:
+                out.close()
+
+
+class StreamingBinaryFilePrefixReplacer(_WindowedReplacer):
+    """Applies prefix to prefix mappings to binaries, with the same semantics as
+    :class:`BinaryFilePrefixReplacer`, but without reading whole files in memory.
+
+    Files are scanned in windows of ``window_size`` bytes, and only the bytes of the prefixes
+    that are found are written."""
+
+    def __init__(
+        self,
+        prefix_to_prefix: Dict[bytes, bytes],
+        suffix_safety_size: int = 7,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+    ) -> None:
+        assert suffix_safety_size >= 0
+        super().__init__(prefix_to_prefix, window_size)
+        self.suffix_safety_size = suffix_safety_size
+
+    def _apply_to_file(self, f: IO[bytes]) -> bool:
+        assert self.matcher is not None
+        # Keep enough data across windows for the prefix, and the lookahead for a null byte
+        overlap = self.matcher.max_length + self.suffix_safety_size
+        buf = b""
+        offset = 0  # position of buf[0] in the file
+        read_pos = f.tell()
+        resume = 0  # position in the file where the next match may start
+        modified = False
+        eof = False
+
+        while not eof:
+            f.seek(read_pos)
+            chunk = f.read(self.window_size)
+            read_pos += len(chunk)
+            eof = not chunk
+            buf += chunk
+            safe_end = len(buf) if eof else len(buf) - overlap
+            if safe_end <= 0:
+                continue
+
+            for pos, index in self.matcher.finditer(buf, max(resume - offset, 0), safe_end):
+                if pos < resume - offset:
+                    continue
+                old = self.prefixes[index]
+                end = pos + len(old)
+                null = buf.find(b"\0", end, end + self.suffix_safety_size + 1)
+                suffix = buf[end : null + 1] if null >= 0 else None
+                f.seek(offset + pos)
+                f.write(
+                    _c_string_replacement(
+                        old, self.prefix_to_prefix[old], suffix, self.suffix_safety_size
+                    )
+                )
+                modified = True
+                resume = offset + (null + 1 if null >= 0 else end)
+
+            buf = buf[safe_end:]
+            offset += safe_end
 
         return modified
 
 
+def _copy_range(src: IO[bytes], dst: IO[bytes], length: int) -> None:
+    """Copy ``length`` bytes from the current position of ``src`` to ``dst``."""
+    while length > 0:
+        data = src.read(min(length, DEFAULT_WINDOW_SIZE))
+        if not data:
+            break
+        dst.write(data)
+        length -= len(data)
+
+
 class BinaryTextReplaceError(spack.error.SpackError):
     def __init__(self, msg):
         msg += (
@@ -263,16 +550,25 @@ def __init__(self, msg):
 
 class CannotGrowString(BinaryTextReplaceError):
     def __init__(self, old, new):
+        self.old, self.new = old, new
         return super().__init__(
             f"Cannot replace {old!r} with {new!r} because the new prefix is longer."
         )
 
+    def __reduce__(self):
+        # Needed to re-raise the error from worker processes
+        return CannotGrowString, (self.old, self.new)
+
 
 class CannotShrinkCString(BinaryTextReplaceError):
     def __init__(self, old, new, full_old_string):
+        self.old, self.new, self.full_old_string = old, new, full_old_string
         # Just interpolate binary string to not risk issues with invalid unicode, which would be
         # really bad user experience: error in error. We have no clue if we actually deal with a
         # real C-string nor what encoding it has.
         super().__init__(
             f"Cannot replace {old!r} with {new!r} in the C-string {full_old_string!r}."
         )
+
+    def __reduce__(self):
+        return CannotShrinkCString, (self.old, self.new, self.full_old_string)
@@ -8,6 +8,7 @@
 import difflib
 import errno
 import functools
+import hashlib
 import importlib
 import importlib.machinery
 import importlib.util
@@ -34,6 +35,7 @@
 
 import spack.caches
 import spack.config
+import spack.directives_index
 import spack.error
 import spack.patch
 import spack.provider_index
@@ -44,6 +46,7 @@
 import spack.util.git
 import spack.util.naming as nm
 import spack.util.path
+import spack.util.spack_json as sjson
 import spack.util.spack_yaml as syaml
 
 #: Package modules are imported as spack.pkg.<repo-namespace>.<pkg-name>
@@ -337,6 +340,34 @@ def __getattr__(self, name):
         return getattr(self, name)
 
 
+def _git_index_path(path: str) -> Optional[str]:
+    """Return the path of the index of the git worktree containing ``path``, if any."""
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        try:
+            sinfo = os.stat(dot_git)
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+            continue
+
+        if stat.S_ISDIR(sinfo.st_mode):
+            return os.path.join(dot_git, "index")
+
+        # Linked worktrees and submodules have a .git file pointing to the git directory
+        try:
+            with open(dot_git, encoding="utf-8") as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if not content.startswith("gitdir:"):
+            return None
+        return os.path.join(path, content[len("gitdir:") :].strip(), "index")
+
+
 class FastPackageChecker(collections.abc.Mapping):
     """Cache that maps package names to the stats obtained on the
     'package.py' files associated with them.
@@ -344,22 +375,88 @@ class FastPackageChecker(collections.abc.Mapping):
     For each repository a cache is maintained at class level, and shared among
     all instances referring to it. Update of the global cache is done lazily
     during instance initialization.
+
+    If a file cache is given, a snapshot of the stats is persisted there too, and reused by
+    later processes without touching the package files, as long as neither the packages
+    directory nor the git index of the repository, if any, have been modified since. This
+    means that packages added, removed, or updated through git are detected, while edits
+    made in place to a ``package.py`` file are not.
     """
 
     #: Global cache, reused by every instance
     _paths_cache: Dict[str, Dict[str, os.stat_result]] = {}
 
-    def __init__(self, packages_path):
+    def __init__(
+        self, packages_path, cache: Optional[spack.util.file_cache.FileCache] = None
+    ) -> None:
         # The path of the repository managed by this instance
         self.packages_path = packages_path
 
+        #: File cache where the snapshot of the stats is persisted, if any
+        self.cache = cache
+
         # If the cache we need is not there yet, then build it appropriately
         if packages_path not in self._paths_cache:
-            self._paths_cache[packages_path] = self._create_new_cache()
+            snapshot = self._read_snapshot()
+            if snapshot is None:
+                snapshot = self._create_new_cache()
+            self._paths_cache[packages_path] = snapshot
 
         #: Reference to the appropriate entry in the global cache
         self._packages_to_stats = self._paths_cache[packages_path]
 
+    @property
+    def _snapshot_key(self) -> str:
+        digest = hashlib.sha256(self.packages_path.encode("utf-8")).hexdigest()[:32]
+        return f"package-stats/{digest}.json"
+
+    def _validation_token(self) -> List[int]:
+        """Data that changes whenever packages are added or removed, or the git checkout
+        containing them is updated."""
+        sinfo = os.stat(self.packages_path)
+        token = [sinfo.st_ino, sinfo.st_mtime_ns]
+        git_index = _git_index_path(self.packages_path)
+        if git_index is not None:
+            try:
+                sinfo = os.stat(git_index)
+                token.extend([sinfo.st_mtime_ns, sinfo.st_size])
+            except OSError:
+                pass
+        return token
+
+    def _read_snapshot(self) -> Optional[Dict[str, os.stat_result]]:
+        """Return the persisted stats, or None if they are missing or outdated."""
+        if self.cache is None:
+            return None
+
+        try:
+            if not self.cache.init_entry(self._snapshot_key):
+                return None
+            with self.cache.read_transaction(self._snapshot_key) as f:
+                data = sjson.load(f)
+            if data["token"] != self._validation_token():
+                return None
+            return {name: os.stat_result(values) for name, values in data["stats"].items()}
+        except (OSError, ValueError, KeyError, TypeError, spack.error.SpackError) as e:
+            tty.debug(f"Cannot read the package stats of {self.packages_path}: {e}")
+            return None
+
+    def _write_snapshot(self, token: List[int], stats: Dict[str, os.stat_result]) -> None:
+        assert self.cache is not None
+        data = {
+            "token": token,
+            "stats": {
+                name: [*tuple(sinfo)[:7], sinfo.st_atime, sinfo.st_mtime, sinfo.st_ctime]
+                for name, sinfo in stats.items()
+            },
+        }
+        try:
+            self.cache.init_entry(self._snapshot_key)
+            with self.cache.write_transaction(self._snapshot_key) as (_, new):
+                sjson.dump(data, new)
+        except (OSError, spack.error.SpackError) as e:
+            tty.debug(f"Cannot write the package stats of {self.packages_path}: {e}")
+
     def invalidate(self):
         """Regenerate cache for this checker."""
         self._paths_cache[self.packages_path] = self._create_new_cache()
@@ -373,6 +470,10 @@ def _create_new_cache(self) -> Dict[str, os.stat_result]:
         about one stat call per package.  This is reasonably fast, and
         avoids actually importing packages in Spack, which is slow.
         """
+        # Compute the validation token first, so that changes made while the stats are
+        # collected invalidate the snapshot
+        token = self._validation_token() if self.cache is not None else None
+
         # Create a dictionary that will store the mapping between a
         # package name and its stat info
         cache: Dict[str, os.stat_result] = {}
@@ -412,6 +513,9 @@ def _create_new_cache(self) -> Dict[str, os.stat_result]:
             # appropriate key
             cache[pkg_name] = sinfo
 
+        if token is not None:
+            self._write_snapshot(token, cache)
+
         return cache
 
     def last_mtime(self):
@@ -512,6 +616,25 @@ def write(self, stream):
         self.index.to_json(stream)
 
 
+class DirectivesIndexer(Indexer):
+    """Lifecycle methods for the cache of package directives."""
+
+    def _create(self):
+        return spack.directives_index.DirectivesIndex(self.repository)
+
+    def read(self, stream):
+        try:
+            self.index = spack.directives_index.DirectivesIndex.from_json(stream, self.repository)
+        except spack.directives_index.DirectivesIndexError as e:
+            raise StaleIndexError(str(e)) from e
+
+    def update(self, pkg_fullname):
+        self.index.update_package(pkg_fullname.split(".")[-1])
+
+    def write(self, stream):
+        self.index.to_json(stream)
+
+
 class PatchIndexer(Indexer):
     """Lifecycle methods for patch cache."""
 
@@ -563,15 +686,20 @@ def __init__(
 
         self.indexers: Dict[str, Indexer] = {}
         self.indexes: Dict[str, Any] = {}
+        self.lazy_indexers: Set[str] = set()
         self.cache = cache
 
-    def add_indexer(self, name: str, indexer: Indexer):
+    def add_indexer(self, name: str, indexer: Indexer, *, lazy: bool = False):
         """Add an indexer to the repo index.
 
         Arguments:
             name: name of this indexer
-            indexer: object implementing the ``Indexer`` interface"""
+            indexer: object implementing the ``Indexer`` interface
+            lazy: if True, the index is built only when it is requested, instead of together
+                with the other indexes"""
         self.indexers[name] = indexer
+        if lazy:
+            self.lazy_indexers.add(name)
 
     def __getitem__(self, name):
         """Get the index with the specified name, reindexing if needed."""
@@ -579,7 +707,9 @@ def __getitem__(self, name):
         if not indexer:
             raise KeyError("no such index: %s" % name)
 
-        if name not in self.indexes:
+        if name in self.lazy_indexers and name not in self.indexes:
+            self.indexes[name] = self._build_index(name, indexer)
+        elif name not in self.indexes:
             self._build_all_indexes()
 
         return self.indexes[name]
@@ -593,7 +723,8 @@ def _build_all_indexes(self):
         rather only pay that cost once rather than on several
         invocations."""
         for name, indexer in self.indexers.items():
-            self.indexes[name] = self._build_index(name, indexer)
+            if name not in self.lazy_indexers:
+                self.indexes[name] = self._build_index(name, indexer)
 
     def _build_index(self, name: str, indexer: Indexer):
         """Determine which packages need an update, and update indexes."""
@@ -608,24 +739,31 @@ def _build_index(self, name: str, indexer: Indexer):
         index_existed = self.cache.init_entry(cache_filename)
         if index_existed and not needs_update:
             # If the index exists and doesn't need an update, read it
-            with self.cache.read_transaction(cache_filename) as f:
-                indexer.read(f)
-
-        else:
-            # Otherwise update it and rewrite the cache file
-            with self.cache.write_transaction(cache_filename) as (old, new):
+            try:
+                with self.cache.read_transaction(cache_filename) as f:
+                    indexer.read(f)
+                return indexer.index
+            except StaleIndexError as e:
+                tty.debug(f"Regenerating the {name} index of the {self.namespace} repo: {e}")
+
+        # Otherwise update it and rewrite the cache file
+        with self.cache.write_transaction(cache_filename) as (old, new):
+            try:
                 indexer.read(old) if old else indexer.create()
-
-                # Compute which packages needs to be updated **again** in case someone updated them
-                # while we waited for the lock
+            except StaleIndexError:
+                indexer.create()
+                needs_update = list(self.checker)
+            else:
+                # Compute which packages needs to be updated **again** in case someone updated
+                # them while we waited for the lock
                 new_index_mtime = self.cache.mtime(cache_filename)
                 if new_index_mtime != index_mtime:
                     needs_update = self.checker.modified_since(new_index_mtime)
 
-                for pkg_name in needs_update:
-                    indexer.update(f"{self.namespace}.{pkg_name}")
+            for pkg_name in needs_update:
+                indexer.update(f"{self.namespace}.{pkg_name}")
 
-                indexer.write(new)
+            indexer.write(new)
 
         return indexer.index
 
@@ -641,6 +779,8 @@ class RepoPath:
         repos: list Repo objects or paths to put in this RepoPath
         cache: file cache associated with this repository
         overrides: dict mapping package name to class attribute overrides for that package
+        stat_snapshot: whether repos constructed from paths persist the stats of their package
+            files in the cache (see ``FastPackageChecker``)
     """
 
     def __init__(
@@ -648,19 +788,23 @@ def __init__(
         *repos: Union[str, "Repo"],
         cache: Optional[spack.util.file_cache.FileCache],
         overrides: Optional[Dict[str, Any]] = None,
+        stat_snapshot: bool = False,
     ) -> None:
         self.repos: List[Repo] = []
         self.by_namespace = nm.NamespaceTrie()
         self._provider_index: Optional[spack.provider_index.ProviderIndex] = None
         self._patch_index: Optional[spack.patch.PatchCache] = None
         self._tag_index: Optional[spack.tag.TagIndex] = None
+        self._directives_index: Optional[spack.directives_index.DirectivesIndex] = None
 
         # Add each repo to this path.
         for repo in repos:
             try:
                 if isinstance(repo, str):
                     assert cache is not None, "cache must hold a value, when repo is a string"
-                    repo = Repo(repo, cache=cache, overrides=overrides)
+                    repo = Repo(
+                        repo, cache=cache, overrides=overrides, stat_snapshot=stat_snapshot
+                    )
                 repo.finder(self)
                 self.put_last(repo)
             except RepoError as e:
@@ -777,6 +921,19 @@ def patch_index(self) -> spack.patch.PatchCache:
                 self._patch_index.update(repo.patch_index)
         return self._patch_index
 
+    @property
+    def directives_index(self) -> spack.directives_index.DirectivesIndex:
+        """Merged DirectivesIndex from all Repos in the RepoPath."""
+        if self._directives_index is None:
+            self._directives_index = spack.directives_index.DirectivesIndex(repository=self)
+            for repo in reversed(self.repos):
+                self._directives_index.merge(repo.directives_index)
+        return self._directives_index
+
+    def package_directives(self, pkg_name: str) -> spack.directives_index.PackageDirectives:
+        """Return the data declared by the directives of a package, without importing it."""
+        return self.repo_for_pkg(pkg_name).package_directives(pkg_name)
+
     @autospec
     def providers_for(self, virtual_spec: "spack.spec.Spec") -> List["spack.spec.Spec"]:
         providers = [
@@ -930,6 +1087,7 @@ def __init__(
         *,
         cache: spack.util.file_cache.FileCache,
         overrides: Optional[Dict[str, Any]] = None,
+        stat_snapshot: bool = False,
     ) -> None:
         """Instantiate a package repository from a filesystem path.
 
@@ -937,6 +1095,8 @@ def __init__(
             root: the root directory of the repository
             cache: file cache associated with this repository
             overrides: dict mapping package name to class attribute overrides for that package
+            stat_snapshot: whether to persist the stats of the package files in the cache, to
+                skip collecting them in later processes (see ``FastPackageChecker``)
         """
         # Root directory, containing _repo.yaml and package dirs
         # Allow roots to by spack-relative by starting with '$spack'
@@ -985,6 +1145,7 @@ def check(condition, msg):
 
         # Maps that goes from package name to corresponding file stat
         self._fast_package_checker: Optional[FastPackageChecker] = None
+        self.stat_snapshot = stat_snapshot
 
         # Indexes for this repository, computed lazily
         self._repo_index: Optional[RepoIndex] = None
@@ -1109,6 +1270,7 @@ def index(self) -> RepoIndex:
             self._repo_index.add_indexer("providers", ProviderIndexer(self))
             self._repo_index.add_indexer("tags", TagIndexer(self))
             self._repo_index.add_indexer("patches", PatchIndexer(self))
+            self._repo_index.add_indexer("directives", DirectivesIndexer(self), lazy=True)
         return self._repo_index
 
     @property
@@ -1126,6 +1288,19 @@ def patch_index(self) -> spack.patch.PatchCache:
         """Index of patches and packages they're defined on."""
         return self.index["patches"]
 
+    @property
+    def directives_index(self) -> spack.directives_index.DirectivesIndex:
+        """Index of the data declared by package directives."""
+        return self.index["directives"]
+
+    def package_directives(self, pkg_name: str) -> spack.directives_index.PackageDirectives:
+        """Return the data declared by the directives of a package, without importing it."""
+        _, pkg_name = self.partition_package_name(pkg_name)
+        try:
+            return self.directives_index[pkg_name]
+        except KeyError:
+            raise UnknownPackageError(pkg_name, self)
+
     @autospec
     def providers_for(self, vpkg_spec: "spack.spec.Spec") -> List["spack.spec.Spec"]:
         providers = self.provider_index.providers_for(vpkg_spec)
@@ -1160,7 +1335,9 @@ def filename_for_package_name(self, pkg_name: str) -> str:
     @property
     def _pkg_checker(self) -> FastPackageChecker:
         if self._fast_package_checker is None:
-            self._fast_package_checker = FastPackageChecker(self.packages_path)
+            self._fast_package_checker = FastPackageChecker(
+                self.packages_path, cache=self._cache if self.stat_snapshot else None
+            )
         return self._fast_package_checker
 
     def all_package_names(self, include_virtuals: bool = False) -> List[str]:
@@ -1299,15 +1476,15 @@ def __contains__(self, pkg_name: str) -> bool:
         return self.exists(pkg_name)
 
     @staticmethod
-    def unmarshal(root, cache, overrides):
+    def unmarshal(root, cache, overrides, stat_snapshot=False):
         """Helper method to unmarshal keyword arguments"""
-        return Repo(root, cache=cache, overrides=overrides)
+        return Repo(root, cache=cache, overrides=overrides, stat_snapshot=stat_snapshot)
 
     def marshal(self):
         cache = self._cache
         if isinstance(cache, llnl.util.lang.Singleton):
             cache = cache.instance
-        return self.root, cache, self.overrides
+        return self.root, cache, self.overrides, self.stat_snapshot
 
     def __reduce__(self):
         return Repo.unmarshal, self.marshal()
@@ -1423,7 +1600,12 @@ def create(configuration: spack.config.Configuration) -> RepoPath:
             continue
         overrides[pkg_name] = value
 
-    return RepoPath(*repo_dirs, cache=spack.caches.MISC_CACHE, overrides=overrides)
+    return RepoPath(
+        *repo_dirs,
+        cache=spack.caches.MISC_CACHE,
+        overrides=overrides,
+        stat_snapshot=configuration.get("config:package_stat_snapshot", False),
+    )
 
 
 #: Singleton repo path instance
@@ -1569,6 +1751,10 @@ def __init__(self, namespace, name=None):
         super().__init__(msg, long_msg)
 
 
+class StaleIndexError(RepoError):
+    """Raised when an index on disk can't be read, and has to be regenerated."""
+
+
 class FailedConstructorError(RepoError):
     """Raised when a package's class constructor fails."""
 
@@ -92,6 +92,17 @@
                 },
             },
             "static_analysis": {"type": "boolean"},
+            "setup_jobs": {"type": "integer", "minimum": 1},
+            "multi_shot": {"type": "boolean"},
+            "concretization_cache": {
+                "type": "object",
+                "additionalProperties": False,
+                "properties": {
+                    "enable": {"type": "boolean"},
+                    "entry_limit": {"type": "integer", "minimum": 0},
+                    "size_limit": {"type": "integer", "minimum": 0},
+                },
+            },
             "timeout": {"type": "integer", "minimum": 0},
             "error_on_timeout": {"type": "boolean"},
             "os_compatible": {"type": "object", "additionalProperties": {"type": "array"}},
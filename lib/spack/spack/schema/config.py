@@ -83,8 +83,17 @@
             "dirty": {"type": "boolean"},
             "build_language": {"type": "string"},
             "build_jobs": {"type": "integer", "minimum": 1},
+            "concurrent_packages": {"type": "integer", "minimum": 1},
+            "binary_prefetch_jobs": {"type": "integer", "minimum": 0},
+            "package_stat_snapshot": {"type": "boolean"},
+            "incremental_views": {"type": "boolean"},
+            "view_link_jobs": {"type": "integer", "minimum": 1},
+            "race_mirrors": {"type": "boolean"},
+            "environment_modifications_cache": {"type": "boolean"},
             "ccache": {"type": "boolean"},
             "db_lock_timeout": {"type": "integer", "minimum": 1},
+            "db_journal": {"type": "boolean"},
+            "db_journal_compact_after": {"type": "integer", "minimum": 1},
             "package_lock_timeout": {
                 "anyOf": [{"type": "integer", "minimum": 1}, {"type": "null"}]
             },
@@ -34,15 +34,18 @@
 import spack.deptypes as dt
 import spack.environment as ev
 import spack.error
+import spack.hash_types
 import spack.package_base
 import spack.package_prefs
 import spack.platforms
 import spack.repo
+import spack.solver.concretization_cache
 import spack.solver.splicing
 import spack.spec
 import spack.store
 import spack.util.crypto
 import spack.util.libc
+import spack.util.parallel
 import spack.util.path
 import spack.util.timer
 import spack.variant as vt
@@ -149,8 +152,8 @@ def named_spec(
 class DeclaredVersion(NamedTuple):
     """Data class to contain information on declared versions used in the solve"""
 
-    #: String representation of the version
-    version: str
+    #: The version
+    version: GitOrStandardVersion
     #: Unique index assigned to this version
     idx: int
     #: Provenance of the version
@@ -358,6 +361,9 @@ def __init__(self, specs, asp=None):
         # names of optimization criteria
         self.criteria = []
 
+        # names of the packages that could be in the solution
+        self.possible_dependencies: Set[str] = set()
+
         # Abstract user requests
         self.abstract_specs = specs
 
@@ -521,6 +527,75 @@ def _compute_specs_from_answer_set(self):
             else:
                 self._unsolved_specs.append((input_spec, candidate))
 
+    def to_dict(self) -> dict:
+        """Serialize the answers of a satisfiable result to a dictionary.
+
+        Concrete nodes are stored once, keyed by their process hash, so that specs shared among
+        answers are shared again when the result is read back with ``from_dict``.
+        """
+        assert self.satisfiable, "only satisfiable results can be serialized"
+        nodes: Dict[str, dict] = {}
+
+        def _add_nodes(roots):
+            for s in traverse.traverse_nodes(roots, deptype=dt.ALL, key=traverse.by_dag_hash):
+                key = s.process_hash()
+                if key in nodes:
+                    continue
+                nodes[key] = s.node_dict_with_hashes(spack.hash_types.process_hash)
+                if s.build_spec is not s:
+                    _add_nodes([s.build_spec])
+
+        answers = []
+        for cost, idx, answer in self.answers:
+            _add_nodes(answer.values())
+            answers.append(
+                {
+                    "cost": list(cost),
+                    "index": idx,
+                    "nodes": [
+                        [node.id, node.pkg, spec.process_hash()] for node, spec in answer.items()
+                    ],
+                }
+            )
+
+        return {
+            "answers": answers,
+            "criteria": [list(c) for c in self.criteria],
+            "nmodels": self.nmodels,
+            "possible_dependencies": sorted(self.possible_dependencies),
+            "specs": nodes,
+        }
+
+    @staticmethod
+    def from_dict(data: dict, specs: List[spack.spec.Spec]) -> "Result":
+        """Reconstruct a satisfiable result, serialized with ``to_dict``, for the abstract specs
+        passed as input.
+        """
+        reader = spack.spec.SpecfileV4
+        hash_type = spack.hash_types.process_hash.name
+        concrete = {key: reader.from_node_dict(node) for key, node in data["specs"].items()}
+        for key, node in data["specs"].items():
+            for _, dep_hash, deptypes, _, virtuals in reader.dependencies_from_node_dict(node):
+                concrete[key]._add_dependency(
+                    concrete[dep_hash], depflag=dt.canonicalize(deptypes), virtuals=virtuals
+                )
+            if "build_spec" in node:
+                _, bhash, _ = reader.extract_build_spec_info_from_node_dict(node, hash_type)
+                concrete[key]._build_spec = concrete[bhash]
+
+        result = Result(specs)
+        result.satisfiable = True
+        for answer in data["answers"]:
+            nodes = {
+                NodeArgument(id=node_id, pkg=pkg): concrete[key]
+                for node_id, pkg, key in answer["nodes"]
+            }
+            result.answers.append((answer["cost"], answer["index"], nodes))
+        result.criteria = [tuple(c) for c in data["criteria"]]
+        result.nmodels = data["nmodels"]
+        result.possible_dependencies = set(data["possible_dependencies"])
+        return result
+
     @staticmethod
     def format_unsolved(unsolved_specs):
         """Create a message providing info on unsolved user specs and for
@@ -806,32 +881,98 @@ def solve(self, setup, specs, reuse=None, output=None, control=None, allow_depre
             spack.bootstrap.core.ensure_winsdk_external_or_raise()
 
         timer.start("setup")
-        asp_problem = setup.setup(specs, reuse=reuse, allow_deprecated=allow_deprecated)
+        asp_problem = setup.setup(
+            specs, reuse=reuse, allow_deprecated=allow_deprecated, timer=timer
+        )
         if output.out is not None:
             output.out.write(asp_problem)
         if output.setup_only:
             return Result(specs), None, None
         timer.stop("setup")
 
+        lp_files = self._logic_programs(setup)
+        cache = spack.solver.concretization_cache.concretization_cache()
+        if cache is not None:
+            timer.start("cache")
+            cache_key = spack.solver.concretization_cache.compute_key(asp_problem, lp_files)
+            cached = cache.fetch(cache_key)
+            timer.stop("cache")
+            if cached is not None:
+                tty.debug(f"[CONCRETIZATION CACHE] hit for {cache_key}")
+                result = Result.from_dict(cached, specs)
+                timer.stop()
+                if output.timers:
+                    timer.write_tty()
+                    print()
+                return result, timer, None
+
+        self._load_and_ground(asp_problem, lp_files, timer)
+        result, finished = self._solve_grounded(setup, specs, timer)
+
+        if result.satisfiable:
+            # store the result, unless the solve was interrupted before reaching an optimum
+            if cache is not None and finished:
+                timer.start("cache")
+                cache.store(cache_key, result.to_dict())
+                timer.stop("cache")
+            timer.stop()
+
+        self._report_and_check(setup, result, timer, output)
+        return result, timer, self.control.statistics
+
+    def solve_separately(
+        self, setup, specs, reuse=None, output=None, allow_deprecated=False
+    ) -> Iterator[Tuple["Result", spack.util.timer.Timer]]:
+        """Set up and ground a single problem for many specs, then solve for each spec on its own.
+
+        The literal of each input spec is activated by an external atom, so the facts of the
+        possible packages and the logic programs are grounded only once. Each solve then assigns
+        the external atoms, and reuses the grounded program.
+
+        Arguments:
+            setup (SpackSolverSetup): An object to set up the ASP problem.
+            specs (list): List of ``Spec`` objects to solve for, one at a time.
+            reuse (None or list): list of concrete specs that can be reused
+            output (None or OutputConfiguration): configuration object to set
+                the output of the solves.
+            allow_deprecated: if True, allow deprecated versions in the solve
+
+        Yields:
+            A tuple of the result and of the timer of each solve, in the same order as the specs.
+            The timer of the first solve includes setup and grounding.
+        """
+        output = output or DEFAULT_OUTPUT_CONFIGURATION
+        timer = spack.util.timer.Timer()
+        self.control = default_clingo_control()
+
+        timer.start("setup")
+        setup.multi_shot = True
+        asp_problem = setup.setup(
+            specs, reuse=reuse, allow_deprecated=allow_deprecated, timer=timer
+        )
+        if output.out is not None:
+            output.out.write(asp_problem)
+        timer.stop("setup")
+        self._load_and_ground(asp_problem, self._logic_programs(setup), timer)
+
+        for spec, trigger_id in zip(specs, setup.literal_trigger_ids):
+            for other_id in setup.literal_trigger_ids:
+                self.control.assign_external(
+                    fn.solve_literal(other_id).symbol(), other_id == trigger_id
+                )
+            result, _ = self._solve_grounded(setup, [spec], timer)
+            timer.stop()
+            self._report_and_check(setup, result, timer, output)
+            yield result, timer
+            timer = spack.util.timer.Timer()
+
+    def _load_and_ground(self, asp_problem: str, lp_files: List[str], timer) -> None:
         timer.start("load")
         # Add the problem instance
         self.control.add("base", [], asp_problem)
-        # Load the file itself
-        parent_dir = os.path.dirname(__file__)
-        self.control.load(os.path.join(parent_dir, "concretize.lp"))
-        self.control.load(os.path.join(parent_dir, "heuristic.lp"))
-        self.control.load(os.path.join(parent_dir, "display.lp"))
-        if not setup.concretize_everything:
-            self.control.load(os.path.join(parent_dir, "when_possible.lp"))
-
-        # Binary compatibility is based on libc on Linux, and on the os tag elsewhere
-        if using_libc_compatibility():
-            self.control.load(os.path.join(parent_dir, "libc_compatibility.lp"))
-        else:
-            self.control.load(os.path.join(parent_dir, "os_compatibility.lp"))
-        if setup.enable_splicing:
-            self.control.load(os.path.join(parent_dir, "splices.lp"))
-
+        # Load the logic programs
+        for lp_file in lp_files:
+            self.control.load(lp_file)
         timer.stop("load")
 
         # Grounding is the first step in the solve -- it turns our facts
@@ -840,9 +981,13 @@ def solve(self, setup, specs, reuse=None, output=None, control=None, allow_depre
         self.control.ground([("base", [])])
         timer.stop("ground")
 
+    def _solve_grounded(self, setup, specs, timer) -> Tuple["Result", bool]:
+        """Solve the grounded program, and return the result together with a flag that is
+        False if the solve was interrupted by a timeout.
+        """
         # With a grounded program, we can run the solve.
         models = []  # stable models if things go well
-        cores = []  # unsatisfiable cores if they do not
+        cores: List[List[int]] = []  # unsatisfiable cores if they do not
 
         def on_model(model):
             models.append((model.cost, model.symbols(shown=True, terms=True)))
@@ -906,11 +1051,13 @@ def on_model(model):
             # record the possible dependencies in the solve
             result.possible_dependencies = setup.pkgs
             timer.stop("construct_specs")
-            timer.stop()
         elif cores:
             result.control = self.control
             result.cores.extend(cores)
 
+        return result, finished
+
+    def _report_and_check(self, setup, result, timer, output) -> None:
         if output.timers:
             timer.write_tty()
             print()
@@ -929,7 +1076,25 @@ def on_model(model):
                 f"https://github.com/spack/spack/issues\n\t{unsolved_str}"
             )
 
-        return result, timer, self.control.statistics
+    @staticmethod
+    def _logic_programs(setup) -> List[str]:
+        """Return the paths of the logic programs to be loaded, along with the facts produced
+        by ``setup``, to solve the problem.
+        """
+        parent_dir = os.path.dirname(__file__)
+        lp_files = ["concretize.lp", "heuristic.lp", "display.lp"]
+        if not setup.concretize_everything:
+            lp_files.append("when_possible.lp")
+
+        # Binary compatibility is based on libc on Linux, and on the os tag elsewhere
+        if using_libc_compatibility():
+            lp_files.append("libc_compatibility.lp")
+        else:
+            lp_files.append("os_compatibility.lp")
+        if setup.enable_splicing:
+            lp_files.append("splices.lp")
+
+        return [os.path.join(parent_dir, x) for x in lp_files]
 
 
 class ConcreteSpecsByHash(collections.abc.Mapping):
@@ -1154,6 +1319,14 @@ def __init__(self, tests: bool = False):
         # If False allows for input specs that are not solved
         self.concretize_everything = True
 
+        # If True, input specs are solved only when their external "solve_literal" atom is true
+        self.multi_shot = False
+        self.literal_trigger_ids: List[int] = []
+        # Concrete versions mentioned by each root of a multi-shot solve, and the variant values
+        # mentioned only by the literal with a given trigger id
+        self.root_versions: List[Dict[str, List[DeclaredVersion]]] = []
+        self.literal_variant_values: Dict[int, Set] = {}
+
         # Set during the call to setup
         self.pkgs: Set[str] = set()
         self.explicitly_required_namespaces: Dict[str, str] = {}
@@ -1164,21 +1337,17 @@ def __init__(self, tests: bool = False):
         # If true, we have to load the code for synthesizing splices
         self.enable_splicing: bool = spack.config.CONFIG.get("concretizer:splice:automatic")
 
-    def pkg_version_rules(self, pkg):
-        """Output declared versions of a package.
-
-        This uses self.declared_versions so that we include any versions
-        that arise from a spec.
-        """
+    @staticmethod
+    def version_declared_facts(
+        pkg_name: str, declared_versions: List[DeclaredVersion]
+    ) -> List[AspFunction]:
+        """Return the facts declaring the versions of a package, from the most to the least
+        preferred."""
 
         def key_fn(version):
             # Origins are sorted by "provenance" first, see the Provenance enumeration above
             return version.origin, version.idx
 
-        if isinstance(pkg, str):
-            pkg = self.pkg_class(pkg)
-
-        declared_versions = self.declared_versions[pkg.name]
         partially_sorted_versions = sorted(set(declared_versions), key=key_fn)
 
         most_to_least_preferred = []
@@ -1187,15 +1356,30 @@ def key_fn(version):
                 list(sorted(group, reverse=True, key=lambda x: vn.ver(x.version)))
             )
 
-        for weight, declared_version in enumerate(most_to_least_preferred):
-            self.gen.fact(
-                fn.pkg_fact(
-                    pkg.name,
-                    fn.version_declared(
-                        declared_version.version, weight, str(declared_version.origin)
-                    ),
-                )
+        return [
+            fn.pkg_fact(
+                pkg_name,
+                fn.version_declared(
+                    declared_version.version, weight, str(declared_version.origin)
+                ),
             )
+            for weight, declared_version in enumerate(most_to_least_preferred)
+        ]
+
+    def pkg_version_rules(self, pkg):
+        """Output declared versions of a package.
+
+        This uses self.declared_versions so that we include any versions
+        that arise from a spec.
+        """
+        if isinstance(pkg, str):
+            pkg = self.pkg_class(pkg)
+
+        # Packages with versions from the roots of a multi-shot solve are declared later, once
+        # per root, see define_root_versions()
+        if not any(pkg.name in versions for versions in self.root_versions):
+            for fact in self.version_declared_facts(pkg.name, self.declared_versions[pkg.name]):
+                self.gen.fact(fact)
 
         # Declare deprecated versions for this package, if any
         deprecated = self.deprecated_versions[pkg.name]
@@ -2316,6 +2500,68 @@ def define_ad_hoc_versions_from_specs(
         self, specs, origin, *, allow_deprecated: bool, require_checksum: bool
     ):
         """Add concrete versions to possible versions from lists of CLI/dev specs."""
+        for name, version in self._ad_hoc_versions(
+            specs, allow_deprecated=allow_deprecated, require_checksum=require_checksum
+        ):
+            declared = DeclaredVersion(version=version, idx=0, origin=origin)
+            self.declared_versions[name].append(declared)
+            self.possible_versions[name].add(version)
+
+    def define_ad_hoc_versions_of_roots(
+        self, specs, *, allow_deprecated: bool, require_checksum: bool
+    ) -> None:
+        """Collect the concrete versions of each root for a multi-shot solve.
+
+        The versions are possible, but they are declared only for the root that mentions them,
+        see ``define_root_versions``.
+        """
+        self.root_versions = []
+        added = []
+        for spec in specs:
+            versions: Dict[str, List[DeclaredVersion]] = collections.defaultdict(list)
+            for name, version in self._ad_hoc_versions(
+                [spec], allow_deprecated=allow_deprecated, require_checksum=require_checksum
+            ):
+                declared = DeclaredVersion(version=version, idx=0, origin=Provenance.SPEC)
+                versions[name].append(declared)
+                added.append((name, version))
+            self.root_versions.append(versions)
+
+        for name, version in added:
+            self.possible_versions[name].add(version)
+
+    def define_root_versions(self) -> None:
+        """Declare the concrete versions of each root of a multi-shot solve, conditional on
+        solving that root.
+
+        For each package, the declared versions and their weights are the same as in a solve
+        for the current root alone.
+        """
+        roots_by_package: Dict[str, List[int]] = collections.defaultdict(list)
+        for i, versions in enumerate(self.root_versions):
+            for name in versions:
+                if name in self.pkgs:
+                    roots_by_package[name].append(i)
+
+        for name, roots in sorted(roots_by_package.items()):
+            self.gen.h2(f"Versions of {name} defined in specs")
+            trigger_ids = [self.literal_trigger_ids[i] for i in roots]
+            others = ", ".join(f"not {fn.solve_literal(x).symbol()}" for x in trigger_ids)
+            for fact in self.version_declared_facts(name, self.declared_versions[name]):
+                self.gen.append(f"{fact.symbol()} :- {others}.\n")
+
+            for i, trigger_id in zip(roots, trigger_ids):
+                declared = self.declared_versions[name] + self.root_versions[i][name]
+                for fact in self.version_declared_facts(name, declared):
+                    self.gen.append(
+                        f"{fact.symbol()} :- {fn.solve_literal(trigger_id).symbol()}.\n"
+                    )
+
+    def _ad_hoc_versions(
+        self, specs, *, allow_deprecated: bool, require_checksum: bool
+    ) -> Iterator[Tuple[str, GitOrStandardVersion]]:
+        """Yield the concrete versions in specs that are not possible versions yet."""
+        seen: Set[Tuple[str, GitOrStandardVersion]] = set()
         for s in traverse.traverse_nodes(specs):
             # If there is a concrete version on the CLI *that we know nothing
             # about*, add it to the known versions. Use idx=0, which is the
@@ -2325,6 +2571,9 @@ def define_ad_hoc_versions_from_specs(
             if version is None or (any((v == version) for v in self.possible_versions[s.name])):
                 continue
 
+            if (s.name, version) in seen:
+                continue
+
             if require_checksum and not _is_checksummed_git_version(version):
                 raise UnsatisfiableSpecError(
                     s.format("No matching version for constraint {name}{@versions}")
@@ -2333,9 +2582,8 @@ def define_ad_hoc_versions_from_specs(
             if not allow_deprecated and version in self.deprecated_versions[s.name]:
                 continue
 
-            declared = DeclaredVersion(version=version, idx=0, origin=origin)
-            self.declared_versions[s.name].append(declared)
-            self.possible_versions[s.name].add(version)
+            seen.add((s.name, version))
+            yield s.name, version
 
     def _supported_targets(self, compiler_name, compiler_version, targets):
         """Get a list of which targets are supported by the compiler.
@@ -2586,8 +2834,19 @@ def define_variant_values(self):
 
         """
         # Tell the concretizer about possible values from specs seen in spec_clauses().
-        # We might want to order these facts by pkg and name if we are debugging.
-        for pkg_name, variant_def_id, value in self.variant_values_from_specs:
+        for fact in self.variant_possible_value_facts(self.variant_values_from_specs):
+            self.gen.fact(fact)
+
+        # In multi-shot solves, values mentioned only by a root are possible only for that root
+        for trigger_id, values in self.literal_variant_values.items():
+            condition = fn.solve_literal(trigger_id).symbol()
+            for fact in self.variant_possible_value_facts(values - self.variant_values_from_specs):
+                self.gen.append(f"{fact.symbol()} :- {condition}.\n")
+
+    def variant_possible_value_facts(self, values: Set) -> List[AspFunction]:
+        # Facts are sorted, so that the problem instance does not depend on the set order.
+        possible_values = []
+        for pkg_name, variant_def_id, value in values:
             try:
                 vid = self.variant_ids_by_def_id[variant_def_id]
             except KeyError:
@@ -2595,8 +2854,12 @@ def define_variant_values(self):
                     f"[{__name__}] cannot retrieve id of the {value} variant from {pkg_name}"
                 )
                 continue
+            possible_values.append((pkg_name, vid, str(value), value))
 
-            self.gen.fact(fn.pkg_fact(pkg_name, fn.variant_possible_value(vid, value)))
+        return [
+            fn.pkg_fact(pkg_name, fn.variant_possible_value(vid, value))
+            for pkg_name, vid, _, value in sorted(possible_values, key=lambda x: x[:3])
+        ]
 
     def register_concrete_spec(self, spec, possible):
         # tell the solver about any installed packages that could
@@ -2652,6 +2915,7 @@ def setup(
         *,
         reuse: Optional[List[spack.spec.Spec]] = None,
         allow_deprecated: bool = False,
+        timer: spack.util.timer.BaseTimer = spack.util.timer.NULL_TIMER,
     ) -> str:
         """Generate an ASP program with relevant constraints for specs.
 
@@ -2663,9 +2927,11 @@ def setup(
             specs: list of Specs to solve
             reuse: list of concrete specs that can be reused
             allow_deprecated: if True adds deprecated versions into the solve
+            timer: timer to record the duration of the different parts of the setup
         """
         check_packages_exist(specs)
 
+        timer.start("possible")
         node_counter = create_counter(specs, tests=self.tests, possible_graph=self.possible_graph)
         self.possible_virtuals = node_counter.possible_virtuals()
         self.pkgs = node_counter.possible_dependencies()
@@ -2685,6 +2951,9 @@ def setup(
             if node.namespace is not None:
                 self.explicitly_required_namespaces[node.name] = node.namespace
 
+        timer.stop("possible")
+
+        timer.start("general")
         self.gen = ProblemInstanceBuilder()
         compiler_parser = CompilerParser(configuration=spack.config.CONFIG).with_input_specs(specs)
 
@@ -2743,15 +3012,25 @@ def setup(
         self.provider_defaults()
         self.provider_requirements()
         self.external_packages()
+        timer.stop("general")
 
+        timer.start("versions")
         # TODO: make a config option for this undocumented feature
         checksummed = "SPACK_CONCRETIZER_REQUIRE_CHECKSUM" in os.environ
         self.define_package_versions_and_validate_preferences(
             self.pkgs, allow_deprecated=allow_deprecated, require_checksum=checksummed
         )
-        self.define_ad_hoc_versions_from_specs(
-            specs, Provenance.SPEC, allow_deprecated=allow_deprecated, require_checksum=checksummed
-        )
+        if self.multi_shot:
+            self.define_ad_hoc_versions_of_roots(
+                specs, allow_deprecated=allow_deprecated, require_checksum=checksummed
+            )
+        else:
+            self.define_ad_hoc_versions_from_specs(
+                specs,
+                Provenance.SPEC,
+                allow_deprecated=allow_deprecated,
+                require_checksum=checksummed,
+            )
         self.define_ad_hoc_versions_from_specs(
             dev_specs,
             Provenance.DEV_SPEC,
@@ -2762,13 +3041,22 @@ def setup(
             allow_deprecated=allow_deprecated, require_checksum=checksummed
         )
 
+        timer.stop("versions")
+
+        timer.start("pkg_rules")
+        # Package rules start with empty trigger and effect caches, and flush them at the end
+        self.trigger_rules()
+        self.effect_rules()
         self.gen.h1("Package Constraints")
-        for pkg in sorted(self.pkgs):
-            self.gen.h2("Package rules: %s" % pkg)
-            self.pkg_rules(pkg, tests=self.tests)
-            self.gen.h2("Package preferences: %s" % pkg)
-            self.preferred_variants(pkg)
+        jobs = spack.config.CONFIG.get("concretizer:setup_jobs", 1)
+        if jobs > 1 and len(self.pkgs) > 1:
+            self.package_facts_in_parallel(sorted(self.pkgs), jobs=jobs)
+        else:
+            for pkg in sorted(self.pkgs):
+                self.package_facts(pkg)
+        timer.stop("pkg_rules")
 
+        timer.start("spec_rules")
         self.gen.h1("Special variants")
         self.define_auto_variant("dev_path", multi=False)
         self.define_auto_variant("patches", multi=True)
@@ -2783,6 +3071,10 @@ def setup(
         self.gen.h1("Spec Constraints")
         self.literal_specs(specs)
 
+        if self.multi_shot:
+            self.gen.h1("Versions defined in specs")
+            self.define_root_versions()
+
         self.gen.h1("Variant Values defined in specs")
         self.define_variant_values()
 
@@ -2802,9 +3094,74 @@ def setup(
 
         self.gen.h1("Internal errors")
         self.internal_errors()
+        timer.stop("spec_rules")
 
         return self.gen.value()
 
+    def package_facts(self, pkg: str) -> None:
+        """Generate the rules and the preferences of a single package."""
+        self.gen.h2("Package rules: %s" % pkg)
+        self.pkg_rules(pkg, tests=self.tests)
+        self.gen.h2("Package preferences: %s" % pkg)
+        self.preferred_variants(pkg)
+
+    def package_facts_in_parallel(self, pkgs: List[str], *, jobs: int) -> None:
+        """Generate the facts of many packages in worker processes.
+
+        Workers allocate ids relative to the first id of each package. The results are merged
+        in the order of the input list, shifting ids by the number of ids used by the packages
+        before, so the problem instance is the same as when calling ``package_facts`` serially.
+        """
+        global _SETUP_FOR_WORKERS
+        _SETUP_FOR_WORKERS = self
+        try:
+            with spack.util.parallel.make_concurrent_executor(jobs, require_fork=True) as executor:
+                chunksize = max(1, len(pkgs) // (4 * jobs))
+                results = list(executor.map(_package_facts_worker, pkgs, chunksize=chunksize))
+        finally:
+            _SETUP_FOR_WORKERS = None
+
+        first_id = next(self._id_counter)
+        for facts in results:
+            self.gen.relocate(facts.chunks, first_id)
+            for def_id, vid in facts.variant_ids_by_def_id.items():
+                self.variant_ids_by_def_id[def_id] = first_id + vid
+            self.variant_values_from_specs.update(facts.variant_values_from_specs)
+            self.version_constraints.update(facts.version_constraints)
+            self.target_constraints.update(facts.target_constraints)
+            self.compiler_version_constraints.update(facts.compiler_version_constraints)
+            first_id += facts.num_ids
+        self._id_counter = itertools.count(first_id)
+
+    def isolated_package_facts(self, pkg: str) -> "PackageFacts":
+        """Generate the facts of a single package, without modifying this object.
+
+        Ids in the result are relative to the first id allocated for the package.
+        """
+        setup = copy.copy(self)
+        setup.gen = RelocatableProblemBuilder()
+        counter = itertools.count()
+        setup._id_counter = map(LocalId, counter)
+        setup._trigger_cache = collections.defaultdict(dict)
+        setup._effect_cache = collections.defaultdict(dict)
+        setup.variant_ids_by_def_id = {}
+        setup.variant_values_from_specs = set()
+        setup.version_constraints = set()
+        setup.target_constraints = set()
+        setup.compiler_version_constraints = set()
+
+        setup.package_facts(pkg)
+
+        return PackageFacts(
+            chunks=setup.gen.asp_problem,
+            num_ids=next(counter),
+            variant_ids_by_def_id={k: int(v) for k, v in setup.variant_ids_by_def_id.items()},
+            variant_values_from_specs=setup.variant_values_from_specs,
+            version_constraints=setup.version_constraints,
+            target_constraints=setup.target_constraints,
+            compiler_version_constraints=setup.compiler_version_constraints,
+        )
+
     def internal_errors(self):
         parent_dir = os.path.dirname(__file__)
 
@@ -2862,10 +3219,14 @@ def define_runtime_constraints(self):
         recorder.consume_facts()
 
     def literal_specs(self, specs):
+        self.literal_trigger_ids = []
+        self.literal_variant_values = {}
+        values_by_key: Dict[Tuple[str, None], Set] = {}
         for spec in specs:
             self.gen.h2("Spec: %s" % str(spec))
             condition_id = next(self._id_counter)
             trigger_id = next(self._id_counter)
+            self.literal_trigger_ids.append(trigger_id)
 
             # Special condition triggered by "literal_solved"
             self.gen.fact(fn.literal(trigger_id))
@@ -2880,7 +3241,22 @@ def literal_specs(self, specs):
                 effect_id = next(self._id_counter)
                 context = SourceContext()
                 context.source = "literal"
-                requirements = self.spec_clauses(spec, context=context)
+                if self.multi_shot:
+                    # Collect the variant values of each literal apart from the others, so that
+                    # they are possible only when solving for that literal
+                    shared_values = self.variant_values_from_specs
+                    self.variant_values_from_specs = set()
+                    try:
+                        requirements = self.spec_clauses(spec, context=context)
+                    finally:
+                        values_by_key[imposed_spec_key] = self.variant_values_from_specs
+                        self.variant_values_from_specs = shared_values
+                else:
+                    requirements = self.spec_clauses(spec, context=context)
+            if self.multi_shot:
+                self.literal_variant_values[trigger_id] = values_by_key.get(
+                    imposed_spec_key, set()
+                )
             root_name = spec.name
             for clause in requirements:
                 clause_name = clause.args[0]
@@ -2901,7 +3277,9 @@ def literal_specs(self, specs):
             cache[imposed_spec_key] = (effect_id, requirements)
             self.gen.fact(fn.pkg_fact(spec.name, fn.condition_effect(condition_id, effect_id)))
 
-            if self.concretize_everything:
+            if self.multi_shot:
+                self.gen.append(f"#external {fn.solve_literal(trigger_id).symbol()}.\n")
+            elif self.concretize_everything:
                 self.gen.fact(fn.solve_literal(trigger_id))
 
         self.effect_rules()
@@ -3059,6 +3437,87 @@ def newline(self):
     def value(self) -> str:
         return "".join(self.asp_problem)
 
+    def relocate(self, chunks: List[Union[str, List[Union[str, int]]]], offset: int) -> None:
+        """Append the output of a ``RelocatableProblemBuilder``, shifting its ids by offset."""
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                self.asp_problem.append(chunk)
+            else:
+                self.asp_problem.append(
+                    "".join(x if isinstance(x, str) else str(x + offset) for x in chunk)
+                )
+
+
+class LocalId(int):
+    """An id relative to the first id allocated for a package, used when the facts of
+    packages are generated in worker processes."""
+
+
+def _has_local_ids(arg: AspFunction) -> bool:
+    return any(
+        isinstance(x, LocalId) or (isinstance(x, AspFunction) and _has_local_ids(x))
+        for x in arg.args
+    )
+
+
+def _relocatable_pieces(function: AspFunction, pieces: List[Union[str, int]]) -> None:
+    """Format a function like clingo does, keeping local ids as integers in the output."""
+    if not _has_local_ids(function):
+        pieces.append(str(function.symbol()))
+        return
+
+    pieces.append(f"{function.name}(")
+    for i, arg in enumerate(function.args):
+        if i:
+            pieces.append(",")
+        if isinstance(arg, LocalId):
+            pieces.append(int(arg))
+        elif isinstance(arg, AspFunction):
+            _relocatable_pieces(arg, pieces)
+        else:
+            pieces.append(str(function._argify(arg)))
+    pieces.append(")")
+
+
+class RelocatableProblemBuilder(ProblemInstanceBuilder):
+    """Problem instance builder whose facts can contain local ids.
+
+    Facts with local ids are stored as lists of strings and integers, so that they can be
+    merged into another problem instance with ``ProblemInstanceBuilder.relocate``.
+    """
+
+    def fact(self, atom: AspFunction) -> None:
+        if not isinstance(atom, AspFunction) or not _has_local_ids(atom):
+            return super().fact(atom)
+        pieces: List[Union[str, int]] = []
+        _relocatable_pieces(atom, pieces)
+        pieces.append(".\n")
+        self.asp_problem.append(pieces)
+
+
+class PackageFacts(NamedTuple):
+    """Facts of a single package, and the state of the setup they depend on"""
+
+    #: output of a RelocatableProblemBuilder
+    chunks: List[Union[str, List[Union[str, int]]]]
+    #: number of ids allocated for the package
+    num_ids: int
+    #: maps the id() of variant definitions to their local id
+    variant_ids_by_def_id: Dict[int, int]
+    variant_values_from_specs: Set
+    version_constraints: Set
+    target_constraints: Set
+    compiler_version_constraints: Set
+
+
+#: Setup object used by worker processes, which inherit it when forked
+_SETUP_FOR_WORKERS: Optional[SpackSolverSetup] = None
+
+
+def _package_facts_worker(pkg: str) -> PackageFacts:
+    assert _SETUP_FOR_WORKERS is not None
+    return _SETUP_FOR_WORKERS.isolated_package_facts(pkg)
+
 
 class CompilerParser:
     """Parses configuration files, and builds a list of possible compilers for the solve."""
@@ -3900,7 +4359,9 @@ def from_store(configuration, *, include, exclude) -> "SpecFilter":
         """Constructs a filter that takes the specs from the current store."""
         packages = _external_config_with_implicit_externals(configuration)
         is_reusable = functools.partial(_is_reusable, packages=packages, local=True)
-        factory = functools.partial(_specs_from_store, configuration=configuration)
+        factory = functools.partial(
+            _specs_from_store, configuration=configuration, include=include
+        )
         return SpecFilter(factory=factory, is_usable=is_reusable, include=include, exclude=exclude)
 
     @staticmethod
@@ -3936,10 +4397,18 @@ def from_environment_included_concrete(
         return SpecFilter(factory=factory, is_usable=is_reusable, include=include, exclude=exclude)
 
 
-def _specs_from_store(configuration):
+def _specs_from_store(configuration, include: Optional[List[str]] = None):
     store = spack.store.create(configuration)
     with store.db.read_transaction():
-        return store.db.query(installed=True)
+        if not include:
+            return store.db.query(installed=True)
+
+        # Let the database narrow down the specs matching the constraints with its indexes
+        specs: Dict[str, spack.spec.Spec] = {}
+        for constraint in include:
+            for s in store.db.query(constraint, installed=True):
+                specs.setdefault(s.dag_hash(), s)
+        return list(specs.values())
 
 
 def _specs_from_mirror():
@@ -3982,6 +4451,7 @@ def __init__(self, configuration: spack.config.Configuration) -> None:
         self.configuration = configuration
         self.store = spack.store.create(configuration)
         self.reuse_strategy = ReuseStrategy.ROOTS
+        self._preloaded: Optional[List[spack.spec.Spec]] = None
 
         reuse_yaml = self.configuration.get("concretizer:reuse", False)
         self.reuse_sources = []
@@ -4068,13 +4538,27 @@ def __init__(self, configuration: spack.config.Configuration) -> None:
                         )
                     )
 
+    def preload(self) -> None:
+        """Read the specs from all the reuse sources, and use them in all the subsequent calls
+        to ``reusable_specs``, instead of reading the sources each time.
+        """
+        self._preloaded = []
+        if self.reuse_strategy == ReuseStrategy.NONE:
+            return
+
+        for reuse_source in self.reuse_sources:
+            self._preloaded.extend(reuse_source.selected_specs())
+
     def reusable_specs(self, specs: List[spack.spec.Spec]) -> List[spack.spec.Spec]:
         if self.reuse_strategy == ReuseStrategy.NONE:
             return []
 
-        result = []
-        for reuse_source in self.reuse_sources:
-            result.extend(reuse_source.selected_specs())
+        if self._preloaded is not None:
+            result = list(self._preloaded)
+        else:
+            result = []
+            for reuse_source in self.reuse_sources:
+                result.extend(reuse_source.selected_specs())
         # If we only want to reuse dependencies, remove the root specs
         if self.reuse_strategy == ReuseStrategy.DEPENDENCIES:
             result = [spec for spec in result if not any(root in spec for root in specs)]
@@ -4147,6 +4631,67 @@ def solve(self, specs, **kwargs):
         result, _, _ = self.solve_with_stats(specs, **kwargs)
         return result
 
+    def solve_separately(
+        self, specs, out=None, timers=False, stats=False, tests=False, allow_deprecated=False
+    ):
+        """Solve for each spec on its own, grounding the problem only once.
+
+        The specs share a single problem instance, with the possible packages of all of them, so
+        this is faster than separate calls to ``solve`` when the specs have many possible
+        dependencies in common. Versions and variant values that are mentioned in a spec are
+        possible only when solving for that spec. Specs that change the problem in other ways,
+        for instance with an architecture, a compiler or a concrete dependency, are solved on
+        their own. The function is a generator that yields the result for each spec, in the
+        order of the input.
+
+        Arguments:
+            specs (list): list of Specs to solve.
+            out: Optionally write the generate ASP program to a file-like object.
+            timers (bool): print timing if set to True
+            stats (bool): print internal statistics if set to True
+            tests (bool): add test dependencies to the solve
+            allow_deprecated (bool): allow deprecated version in the solve
+        """
+        specs = [s.lookup_hash() for s in specs]
+        shared = [self._can_share_problem(s) for s in specs]
+        shared_specs = [s for s, is_shared in zip(specs, shared) if is_shared]
+
+        reusable_specs = self._check_input_and_extract_concrete_specs(shared_specs)
+        reusable_specs.extend(self.selector.reusable_specs(shared_specs))
+        setup = SpackSolverSetup(tests=tests)
+        output = OutputConfiguration(timers=timers, stats=stats, out=out, setup_only=False)
+        # Use another driver, so that the grounded problem is kept across the other solves
+        results = PyclingoDriver().solve_separately(
+            setup,
+            shared_specs,
+            reuse=reusable_specs,
+            output=output,
+            allow_deprecated=allow_deprecated,
+        )
+        for spec, is_shared in zip(specs, shared):
+            if is_shared:
+                result, _ = next(results)
+            else:
+                result = self.solve(
+                    [spec],
+                    out=out,
+                    timers=timers,
+                    stats=stats,
+                    tests=tests,
+                    allow_deprecated=allow_deprecated,
+                )
+            yield result
+
+    def _can_share_problem(self, spec: spack.spec.Spec) -> bool:
+        """Return whether a spec can be solved on a problem instance shared with other specs"""
+        if self.selector.reuse_strategy == ReuseStrategy.DEPENDENCIES:
+            # Installed specs matching a root are not reusable, so they would differ across roots
+            return False
+        return not any(
+            node.concrete or node.architecture or node.compiler or node.namespace
+            for node in spec.traverse()
+        )
+
     def solve_in_rounds(
         self, specs, out=None, timers=False, stats=False, tests=False, allow_deprecated=False
     ):
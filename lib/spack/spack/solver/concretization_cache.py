@@ -0,0 +1,215 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""On-disk cache for the results of a solve.
+
+Entries are keyed on a hash of the generated ASP program, together with the logic programs
+that are loaded alongside it. Since the ASP program encodes every input of the solve (abstract
+specs, configuration, package directives, reusable specs), two solves with the same key are
+guaranteed to produce equivalent results.
+"""
+import errno
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import llnl.util.tty as tty
+from llnl.util.filesystem import mkdirp, rename
+
+import spack
+import spack.caches
+import spack.config
+import spack.util.file_cache
+import spack.util.spack_json as sjson
+
+#: Key in the misc cache under which concretization results are stored
+CACHE_KEY = "concretization"
+
+#: Name of the file, within the cache directory, where statistics are stored
+STATS_FILE = "stats.json"
+
+#: Version of the format used for cache entries. Bump this if the layout of entries changes.
+FORMAT_VERSION = 1
+
+
+def compute_key(asp_problem: str, lp_files: Iterable[str]) -> str:
+    """Return the key of a cache entry, given the generated ASP program and the logic programs
+    loaded to solve it.
+
+    The lines of the generated program are sorted before hashing, since the order in which facts
+    are emitted does not change the semantics of the program.
+    """
+    h = hashlib.sha256()
+    h.update(f"spack-{spack.spack_version}-v{FORMAT_VERSION}\n".encode("utf-8"))
+    for line in sorted(asp_problem.splitlines()):
+        h.update(line.encode("utf-8"))
+        h.update(b"\n")
+    for path in lp_files:
+        h.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+class ConcretizationCache:
+    """Stores serialized solver results in a directory of the misc cache.
+
+    Each entry is a JSON file named after its key. Entries are evicted in least-recently-used
+    order, using the modification time of the file, when the number of entries or their total size
+    exceeds the configured limits. Hits and misses are counted and persisted next to the entries.
+    """
+
+    def __init__(
+        self,
+        cache: spack.util.file_cache.FileCache,
+        *,
+        entry_limit: int = 1000,
+        size_limit: int = 300 * 1024 * 1024,
+    ) -> None:
+        self.cache = cache
+        self.entry_limit = entry_limit
+        self.size_limit = size_limit
+        self.root = cache.cache_path(CACHE_KEY)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def fetch(self, key: str) -> Optional[Dict]:
+        """Return the data stored for a key, or None if there is no valid entry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = sjson.load(f)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, OSError) or e.errno != errno.ENOENT:
+                tty.debug(f"[CONCRETIZATION CACHE] Ignoring unreadable entry {path}: {e}")
+            self._record("misses")
+            return None
+
+        if data.get("version") != FORMAT_VERSION:
+            self._record("misses")
+            return None
+
+        # Bump the modification time, since it is used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._record("hits")
+        return data["result"]
+
+    def store(self, key: str, result: Dict) -> None:
+        """Store the data for a key, then evict old entries if the cache exceeds its limits."""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            mkdirp(os.path.dirname(path))
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                sjson.dump({"version": FORMAT_VERSION, "result": result}, f)
+            # Entries are immutable, so concurrent writers can safely race on the rename
+            rename(tmp_path, path)
+        except OSError as e:
+            tty.debug(f"[CONCRETIZATION CACHE] Cannot write entry {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self.cleanup()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """Return a list of (access time, size, path) tuples, one for each entry."""
+        result: List[Tuple[float, int, str]] = []
+        if not os.path.isdir(self.root):
+            return result
+
+        for bucket in os.scandir(self.root):
+            if not bucket.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(bucket.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                result.append((st.st_mtime, st.st_size, entry.path))
+        return result
+
+    def cleanup(self) -> None:
+        """Evict the least recently used entries until the cache fits within its limits."""
+        entries = sorted(self.entries())
+        total_size = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.entry_limit or total_size > self.size_limit):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            self._record("evictions")
+
+    def stats(self) -> Dict[str, int]:
+        """Return the persisted hit, miss and eviction counters, plus the current number and
+        total size of the entries.
+        """
+        with self.cache.read_transaction(self._stats_key) as f:
+            data = _read_stats(f)
+        entries = self.entries()
+        data["entries"] = len(entries)
+        data["size"] = sum(size for _, size, _ in entries)
+        return data
+
+    def destroy(self) -> None:
+        """Remove all the entries in the cache, and reset the statistics."""
+        if not os.path.isdir(self.root):
+            return
+        for item in os.listdir(self.root):
+            path = os.path.join(self.root, item)
+            if os.path.isdir(path):
+                for entry in os.listdir(path):
+                    os.remove(os.path.join(path, entry))
+                os.rmdir(path)
+        self.cache.remove(self._stats_key)
+
+    @property
+    def _stats_key(self) -> str:
+        return f"{CACHE_KEY}/{STATS_FILE}"
+
+    def _record(self, counter: str) -> None:
+        try:
+            self.cache.init_entry(self._stats_key)
+            with self.cache.write_transaction(self._stats_key) as (old, new):
+                data = _read_stats(old)
+                data[counter] += 1
+                new.write(json.dumps(data, separators=(",", ":")))
+        except (OSError, spack.util.file_cache.CacheError) as e:
+            tty.debug(f"[CONCRETIZATION CACHE] Cannot update statistics: {e}")
+
+
+def _read_stats(stream) -> Dict[str, int]:
+    data = {"hits": 0, "misses": 0, "evictions": 0}
+    if stream is None:
+        return data
+    try:
+        stored = json.loads(stream.read())
+    except json.JSONDecodeError:
+        return data
+    if isinstance(stored, dict):
+        data.update((k, v) for k, v in stored.items() if k in data and isinstance(v, int))
+    return data
+
+
+def concretization_cache() -> Optional[ConcretizationCache]:
+    """Return the concretization cache, or None if it is disabled in configuration."""
+    cache_config = spack.config.get("concretizer:concretization_cache", {})
+    if not cache_config.get("enable", False):
+        return None
+    return ConcretizationCache(
+        spack.caches.MISC_CACHE,
+        entry_limit=cache_config.get("entry_limit", 1000),
+        size_limit=cache_config.get("size_limit", 300 * 1024 * 1024),
+    )
@@ -30,7 +30,7 @@ class PossibleGraph(NamedTuple):
 class PossibleDependencyGraph:
     """Returns information needed to set up an ASP problem"""
 
-    def unreachable(self, *, pkg_name: str, when_spec: spack.spec.Spec) -> bool:
+    def unreachable(self, *, pkg_name: str, when_spec: Union[str, spack.spec.Spec]) -> bool:
         """Returns true if the context can determine that the condition cannot ever
         be met on pkg_name.
         """
@@ -76,8 +76,7 @@ def __init__(self, *, configuration: spack.config.Configuration, repo: spack.rep
             f"platform={spack.platforms.host()} target={archspec.cpu.host().family}:"
         )
         for x in self.runtime_pkgs:
-            pkg_class = self.repo.get_pkg_class(x)
-            self.runtime_virtuals.update(pkg_class.provided_virtual_names())
+            self.runtime_virtuals.update(self.repo.package_directives(x).provides)
 
         try:
             self.libc_pkgs = [x.name for x in self.providers_for("libc")]
@@ -90,14 +89,15 @@ def is_virtual(self, name: str) -> bool:
     @lang.memoized
     def is_allowed_on_this_platform(self, *, pkg_name: str) -> bool:
         """Returns true if a package is allowed on the current host"""
-        pkg_cls = self.repo.get_pkg_class(pkg_name)
-        for when_spec, conditions in pkg_cls.requirements.items():
-            if not when_spec.intersects(self._platform_condition):
+        directives = self.repo.package_directives(pkg_name)
+        for when_str, requirements in directives.requirements:
+            if not spack.spec.Spec(when_str).intersects(self._platform_condition):
                 continue
-            for requirements, _, _ in conditions:
-                if not any(x.intersects(self._platform_condition) for x in requirements):
-                    tty.debug(f"[{__name__}] {pkg_name} is not for this platform")
-                    return False
+            if not any(
+                spack.spec.Spec(x).intersects(self._platform_condition) for x in requirements
+            ):
+                tty.debug(f"[{__name__}] {pkg_name} is not for this platform")
+                return False
         return True
 
     def providers_for(self, virtual_str: str) -> List[spack.spec.Spec]:
@@ -108,7 +108,7 @@ def can_be_installed(self, *, pkg_name) -> bool:
         """Returns True if a package can be installed, False otherwise."""
         return True
 
-    def unreachable(self, *, pkg_name: str, when_spec: spack.spec.Spec) -> bool:
+    def unreachable(self, *, pkg_name: str, when_spec: Union[str, spack.spec.Spec]) -> bool:
         """Returns true if the context can determine that the condition cannot ever
         be met on pkg_name.
         """
@@ -168,9 +168,12 @@ def possible_dependencies(
             if pkg_name in self.libc_pkgs:
                 continue
 
-            pkg_cls = self.repo.get_pkg_class(pkg_name=pkg_name)
-            for name, conditions in pkg_cls.dependencies_by_name(when=True).items():
-                if all(self.unreachable(pkg_name=pkg_name, when_spec=x) for x in conditions):
+            # Dependencies are read from the directives index, to avoid importing packages
+            directives = self.repo.package_directives(pkg_name)
+            for name, conditions in directives.dependencies.items():
+                if all(
+                    self.unreachable(pkg_name=pkg_name, when_spec=when) for when, _ in conditions
+                ):
                     tty.debug(
                         f"[{__name__}] Not adding {name} as a dep of {pkg_name}, because "
                         f"conditions cannot be met"
@@ -231,14 +234,12 @@ def _package_list(self, specs: Tuple[Union[spack.spec.Spec, str], ...]) -> List[
             stack.append(current_spec.name)
         return sorted(set(stack))
 
-    def _has_deptypes(self, dependencies, *, allowed_deps: dt.DepFlag, strict: bool) -> bool:
+    def _has_deptypes(
+        self, conditions: List[Tuple[str, dt.DepFlag]], *, allowed_deps: dt.DepFlag, strict: bool
+    ) -> bool:
         if strict is True:
-            return any(
-                dep.depflag == allowed_deps for deplist in dependencies.values() for dep in deplist
-            )
-        return any(
-            dep.depflag & allowed_deps for deplist in dependencies.values() for dep in deplist
-        )
+            return any(depflag == allowed_deps for _, depflag in conditions)
+        return any(depflag & allowed_deps for _, depflag in conditions)
 
     def _is_possible(self, *, pkg_name):
         try:
@@ -318,7 +319,7 @@ def _is_provider_candidate(self, *, pkg_name: str, virtual: str) -> bool:
         return True
 
     @lang.memoized
-    def unreachable(self, *, pkg_name: str, when_spec: spack.spec.Spec) -> bool:
+    def unreachable(self, *, pkg_name: str, when_spec: Union[str, spack.spec.Spec]) -> bool:
         """Returns true if the context can determine that the condition cannot ever
         be met on pkg_name.
         """
@@ -58,6 +58,7 @@
 import platform
 import re
 import socket
+import sys
 import warnings
 from typing import (
     Any,
@@ -200,6 +201,20 @@
 #: specfile format version. Must increase monotonically
 SPECFILE_FORMAT_VERSION = 4
 
+#: Encoder of the JSON text of nodes that is hashed. Hashes depend on its exact output.
+_HASH_JSON_ENCODER = json.JSONEncoder(
+    ensure_ascii=True, indent=None, separators=(",", ":"), sort_keys=False
+)
+
+#: Encodes a string like _HASH_JSON_ENCODER, without its overhead
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+
+@lang.memoized
+def _encode_deptypes(depflag: dt.DepFlag) -> str:
+    """Return the JSON text of the dependency types of an edge, in the hashed text of nodes."""
+    return _HASH_JSON_ENCODER.encode(dt.flag_to_tuple(depflag))
+
 
 class InstallStatus(enum.Enum):
     """Maps install statuses to symbols for display.
@@ -234,6 +249,51 @@ def _make_microarchitecture(name: str) -> archspec.cpu.Microarchitecture:
     return archspec.cpu.TARGETS.get(name, archspec.cpu.generic_microarchitecture(name))
 
 
+@lang.memoized
+def _target_data(target: archspec.cpu.Microarchitecture) -> Dict[str, Any]:
+    # Get rid of compiler flag information before turning the uarch into a dict
+    target_data = target.to_dict()
+    target_data.pop("compilers", None)
+    return target_data
+
+
+def _target_to_dict(target: archspec.cpu.Microarchitecture) -> Dict[str, Any]:
+    """Return the dictionary of a non-generic target in specs. Computing it sorts all the
+    features of the target, so it is cached, and copied for each spec."""
+    target_data = dict(_target_data(target))
+    target_data["features"] = list(target_data["features"])
+    target_data["parents"] = list(target_data["parents"])
+    return target_data
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings, and the strings in lists, read from specfiles"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    elif isinstance(value, list):
+        return [sys.intern(x) if isinstance(x, str) else x for x in value]
+    return value
+
+
+# Concrete specs read from specfiles share the immutable objects below, since large databases,
+# lockfiles and buildcache indexes have many nodes with the same targets and versions. Objects
+# that can be modified in place, like architectures, compilers and version lists, are not shared.
+
+
+def _is_standard_version(value: Any) -> bool:
+    return isinstance(value, str) and not vn.is_git_version(value)
+
+
+@lang.memoized
+def _shared_version(string: str) -> "vn.StandardVersion":
+    return vn.StandardVersion.from_string(string)
+
+
+@lang.memoized
+def _shared_target(name: str) -> archspec.cpu.Microarchitecture:
+    return _make_microarchitecture(name)
+
+
 @lang.lazy_lexicographic_ordering
 class ArchSpec:
     """Aggregate the target platform, the operating system and the target microarchitecture."""
@@ -607,9 +667,7 @@ def to_dict(self):
         if self.target.vendor == "generic":
             target_data = str(self.target)
         else:
-            # Get rid of compiler flag information before turning the uarch into a dict
-            target_data = self.target.to_dict()
-            target_data.pop("compilers", None)
+            target_data = _target_to_dict(self.target)
         return {"arch": {"platform": self.platform, "platform_os": self.os, "target": target_data}}
 
     @staticmethod
@@ -2145,13 +2203,64 @@ def spec_hash(self, hash):
         # this when we move to using package hashing on all specs.
         if hash.override is not None:
             return hash.override(self)
-        node_dict = self.to_node_dict(hash=hash)
-        json_text = json.dumps(
-            node_dict, ensure_ascii=True, indent=None, separators=(",", ":"), sort_keys=False
+        return self._spec_hash(hash, {})
+
+    def _spec_hash(self, hash, memo: Dict[int, str]) -> str:
+        """Compute the hash of this node, memoizing the hashes of the abstract nodes in the DAG,
+        which are not cached on the specs."""
+
+        def child_hash(spec: "Spec") -> str:
+            if spec.concrete or getattr(spec, hash.attr, None):
+                return spec._cached_hash(hash)
+            if id(spec) not in memo:
+                memo[id(spec)] = spec._spec_hash(hash, memo)
+            return memo[id(spec)]
+
+        # This is the JSON text of to_node_dict(), written without creating the dictionaries of
+        # the edges, which are the largest part of it.
+        encode = _encode_json_string
+        chunks = [_HASH_JSON_ENCODER.encode(self._node_dict_without_edges(hash))[:-1]]
+        # Same order as iterating over the sorted _dependencies_dict()
+        edges = sorted(
+            self._dependencies.select(depflag=hash.depflag),
+            key=lambda x: (x.spec.name, _sort_by_dep_types(x)),
         )
+        if edges:
+            hash_key = f",{encode(hash.name)}:"
+            separator = ',"dependencies":[{"name":'
+            for dspec in edges:
+                chunks.extend(
+                    (
+                        separator,
+                        encode(dspec.spec.name) if dspec.spec.name is not None else "null",
+                        hash_key,
+                        encode(child_hash(dspec.spec)),
+                        ',"parameters":{"deptypes":',
+                        _encode_deptypes(dspec.depflag),
+                        ',"virtuals":[',
+                        ",".join(encode(v) for v in dspec.virtuals),
+                        "]}}",
+                    )
+                )
+                separator = ',{"name":'
+            chunks.append("]")
+
+        # Name is included in case this is replacing a virtual.
+        if self._build_spec:
+            chunks.extend(
+                (
+                    ',"build_spec":{"name":',
+                    encode(self.build_spec.name),
+                    f",{encode(hash.name)}:",
+                    encode(child_hash(self.build_spec)),
+                    "}",
+                )
+            )
+        chunks.append("}")
+
         # This implements "frankenhashes", preserving the last 7 characters of the
         # original hash when splicing so that we can avoid relocation issues
-        out = spack.util.hash.b32_hash(json_text)
+        out = spack.util.hash.b32_hash("".join(chunks))
         if self.build_spec is not self:
             return out[:-7] + self.build_spec.spec_hash(hash)[-7:]
         return out
@@ -2331,6 +2440,35 @@ def to_node_dict(self, hash=ht.dag_hash):
         Arguments:
             hash (spack.hash_types.SpecHashDescriptor) type of hash to generate.
         """
+        d = self._node_dict_without_edges(hash)
+
+        # Note: Relies on sorting dict by keys later in algorithm.
+        deps = self._dependencies_dict(depflag=hash.depflag)
+        if deps:
+            d["dependencies"] = [
+                {
+                    "name": name,
+                    hash.name: dspec.spec._cached_hash(hash),
+                    "parameters": {
+                        "deptypes": dt.flag_to_tuple(dspec.depflag),
+                        "virtuals": dspec.virtuals,
+                    },
+                }
+                for name, edges_for_name in sorted(deps.items())
+                for dspec in edges_for_name
+            ]
+
+        # Name is included in case this is replacing a virtual.
+        if self._build_spec:
+            d["build_spec"] = {
+                "name": self.build_spec.name,
+                hash.name: self.build_spec._cached_hash(hash),
+            }
+        return d
+
+    def _node_dict_without_edges(self, hash) -> Dict[str, Any]:
+        """Return the part of ``to_node_dict()`` that does not depend on other nodes, i.e. all
+        the entries except ``dependencies`` and ``build_spec``."""
         d = {"name": self.name}
 
         if self.versions:
@@ -2403,28 +2541,6 @@ def to_node_dict(self, hash=ht.dag_hash):
                 package_hash = package_hash.decode("utf-8")
             d["package_hash"] = package_hash
 
-        # Note: Relies on sorting dict by keys later in algorithm.
-        deps = self._dependencies_dict(depflag=hash.depflag)
-        if deps:
-            d["dependencies"] = [
-                {
-                    "name": name,
-                    hash.name: dspec.spec._cached_hash(hash),
-                    "parameters": {
-                        "deptypes": dt.flag_to_tuple(dspec.depflag),
-                        "virtuals": dspec.virtuals,
-                    },
-                }
-                for name, edges_for_name in sorted(deps.items())
-                for dspec in edges_for_name
-            ]
-
-        # Name is included in case this is replacing a virtual.
-        if self._build_spec:
-            d["build_spec"] = {
-                "name": self.build_spec.name,
-                hash.name: self.build_spec._cached_hash(hash),
-            }
         return d
 
     def to_dict(self, hash=ht.dag_hash):
@@ -4879,23 +4995,43 @@ def from_node_dict(cls, node):
         for h in ht.hashes:
             setattr(spec, h.attr, node.get(h.name, None))
 
-        spec.name = name
-        spec.namespace = node.get("namespace", None)
+        # specs read in are concrete unless marked abstract
+        concrete = node.get("concrete", True)
+
+        spec.name = _intern(name)
+        spec.namespace = _intern(node.get("namespace", None))
 
-        if "version" in node or "versions" in node:
+        version = node.get("version")
+        if concrete and _is_standard_version(version):
+            spec.versions = vn.VersionList([_shared_version(version)])
+        elif "version" in node or "versions" in node:
             spec.versions = vn.VersionList.from_dict(node)
             spec.attach_git_version_lookup()
 
-        if "arch" in node:
+        if concrete and "arch" in node:
+            arch = node["arch"]
+            target = arch["target"]
+            if not isinstance(target, str):
+                target = target["name"]
+            spec.architecture = ArchSpec(
+                (_intern(arch["platform"]), _intern(arch["platform_os"]), _shared_target(target))
+            )
+        elif "arch" in node:
             spec.architecture = ArchSpec.from_dict(node)
 
-        if "compiler" in node:
+        compiler = node.get("compiler")
+        if concrete and compiler and _is_standard_version(compiler.get("version")):
+            spec.compiler = CompilerSpec(
+                _intern(compiler["name"]), vn.VersionList([_shared_version(compiler["version"])])
+            )
+        elif "compiler" in node:
             spec.compiler = CompilerSpec.from_dict(node)
         else:
             spec.compiler = None
 
         propagated_names = node.get("propagate", [])
         for name, values in node.get("parameters", {}).items():
+            name = _intern(name)
             propagate = name in propagated_names
             if name in _valid_compiler_flags:
                 spec.compiler_flags[name] = []
@@ -4903,7 +5039,7 @@ def from_node_dict(cls, node):
                     spec.compiler_flags.add_flag(name, val, propagate)
             else:
                 spec.variants[name] = vt.MultiValuedVariant.from_node_dict(
-                    name, values, propagate=propagate
+                    name, _intern(values), propagate=propagate
                 )
 
         spec.external_path = None
@@ -4920,8 +5056,7 @@ def from_node_dict(cls, node):
                     spec.external_modules = None
                 spec.extra_attributes = node["external"].get("extra_attributes") or {}
 
-        # specs read in are concrete unless marked abstract
-        if node.get("concrete", True):
+        if concrete:
             spec._mark_root_concrete()
 
         if "patches" in node:
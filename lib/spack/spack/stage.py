@@ -34,6 +34,7 @@
 import spack.config
 import spack.error
 import spack.mirrors.layout
+import spack.mirrors.probe
 import spack.mirrors.utils
 import spack.resource
 import spack.spec
@@ -466,10 +467,6 @@ def source_path(self):
         return os.path.join(self.path, _source_path_subdir)
 
     def _generate_fetchers(self, mirror_only=False) -> Generator["fs.FetchStrategy", None, None]:
-        fetchers: List[fs.FetchStrategy] = []
-        if not mirror_only:
-            fetchers.append(self.default_fetcher)
-
         # If this archive is normally fetched from a URL, then use the same digest.
         if isinstance(self.default_fetcher, fs.URLFetchStrategy):
             digest = self.default_fetcher.digest
@@ -480,32 +477,46 @@ def _generate_fetchers(self, mirror_only=False) -> Generator["fs.FetchStrategy",
             expand = True
             extension = None
 
+        if not self.default_fetcher_only and self.mirror_layout and self.default_fetcher.cachable:
+            yield spack.caches.FETCH_CACHE.fetcher(
+                self.mirror_layout.path, digest, expand=expand, extension=extension
+            )
+
         # TODO: move mirror logic out of here and clean it up!
         # TODO: Or @alalazo may have some ideas about how to use a
         # TODO: CompositeFetchStrategy here.
         if not self.default_fetcher_only and self.mirror_layout and self.mirrors:
             # Add URL strategies for all the mirrors with the digest
             # Insert fetchers in the order that the URLs are provided.
-            fetchers[:0] = (
-                fs.from_url_scheme(
-                    url_util.join(mirror.fetch_url, *self.mirror_layout.path.split(os.sep)),
-                    checksum=digest,
-                    expand=expand,
-                    extension=extension,
+            mirror_fetchers = [
+                (
+                    mirror.fetch_url,
+                    fs.from_url_scheme(
+                        url_util.join(mirror.fetch_url, *self.mirror_layout.path.split(os.sep)),
+                        checksum=digest,
+                        expand=expand,
+                        extension=extension,
+                    ),
                 )
                 for mirror in self.mirrors
                 if not mirror.fetch_url.startswith("oci://")  # no support for mirrors yet
-            )
-
-        if not self.default_fetcher_only and self.mirror_layout and self.default_fetcher.cachable:
-            fetchers.insert(
-                0,
-                spack.caches.FETCH_CACHE.fetcher(
-                    self.mirror_layout.path, digest, expand=expand, extension=extension
-                ),
-            )
+            ]
+            # Only fetchers of archives at a url can be probed
+            url_fetchers = [
+                (url, fetcher)
+                for url, fetcher in mirror_fetchers
+                if isinstance(fetcher, fs.URLFetchStrategy)
+            ]
+            if len(url_fetchers) == len(mirror_fetchers) > 1 and spack.config.get(
+                "config:race_mirrors", False
+            ):
+                # Try first the mirrors that answer first, instead of waiting for timeouts
+                yield from spack.mirrors.probe.race(url_fetchers)
+            else:
+                yield from (fetcher for _, fetcher in mirror_fetchers)
 
-        yield from fetchers
+        if not mirror_only:
+            yield self.default_fetcher
 
         # The search function may be expensive, so wait until now to call it so the user can stop
         # if a prior fetcher succeeded
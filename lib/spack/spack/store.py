@@ -152,6 +152,7 @@ class Store:
             truncated to this length
         upstreams: optional list of upstream databases
         lock_cfg: lock configuration for the database
+        journal_cfg: journal configuration for the database
     """
 
     def __init__(
@@ -162,6 +163,7 @@ def __init__(
         hash_length: Optional[int] = None,
         upstreams: Optional[List[spack.database.Database]] = None,
         lock_cfg: spack.database.LockConfiguration = spack.database.NO_LOCK,
+        journal_cfg: spack.database.JournalConfiguration = spack.database.NO_JOURNAL,
     ) -> None:
         self.root = root
         self.unpadded_root = unpadded_root or root
@@ -169,11 +171,16 @@ def __init__(
         self.hash_length = hash_length
         self.upstreams = upstreams
         self.lock_cfg = lock_cfg
+        self.journal_cfg = journal_cfg
         self.layout = spack.directory_layout.DirectoryLayout(
             root, projections=projections, hash_length=hash_length
         )
         self.db = spack.database.Database(
-            root, upstream_dbs=upstreams, lock_cfg=lock_cfg, layout=self.layout
+            root,
+            upstream_dbs=upstreams,
+            lock_cfg=lock_cfg,
+            journal_cfg=journal_cfg,
+            layout=self.layout,
         )
 
         timeout_format_str = (
@@ -200,6 +207,7 @@ def __reduce__(self):
             self.hash_length,
             self.upstreams,
             self.lock_cfg,
+            self.journal_cfg,
         )
 
 
@@ -227,6 +235,7 @@ def create(configuration: spack.config.Configuration) -> Store:
         hash_length=hash_length,
         upstreams=upstreams,
         lock_cfg=spack.database.lock_configuration(configuration),
+        journal_cfg=spack.database.journal_configuration(configuration),
     )
 
 
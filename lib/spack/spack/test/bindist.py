@@ -370,6 +370,39 @@ def test_built_spec_cache(temporary_mirror_dir):
         assert any([r["spec"] == s for r in results])
 
 
+@pytest.mark.usefixtures(
+    "default_config", "cache_directory", "install_dir_non_default_layout", "temporary_mirror"
+)
+def test_built_spec_cache_is_lazy(temporary_mirror_dir):
+    """Tests that specs in the buildcache index are read through a derived hash index, and are
+    constructed only when they are requested."""
+    buildcache_cmd("list", "-a", "-l")
+
+    index = bindist.BINARY_INDEX
+    assert index._mirror_indices and not index._mirrors_for_spec
+    cache_root = index._index_file_cache.root
+    assert any(f.endswith(".hidx") for f in os.listdir(cache_root))
+
+    # Concretization with reuse reads all the specs, so concretize before clearing
+    gspec = spack.concretize.concretize_one("garply")
+    cspec = spack.concretize.concretize_one("corge")
+    index.regenerate_spec_cache(clear_existing=True)
+    (mirror_index,) = index._mirror_indices.values()
+    assert not mirror_index._specs
+
+    # Looking up a leaf constructs no other spec
+    (result,) = bindist.get_mirrors_for_spec(gspec, index_only=True)
+    assert result["spec"] == gspec and result["spec"].concrete
+    assert set(mirror_index._specs) == {gspec.dag_hash()}
+
+    # Dependencies are shared among the specs that are constructed
+    (result,) = bindist.get_mirrors_for_spec(cspec, index_only=True)
+    assert result["spec"] == cspec
+    garply = next(s for s in result["spec"].traverse() if s.name == "garply")
+    assert garply is mirror_index._specs[gspec.dag_hash()]
+    assert len(index.get_all_built_specs()) == len(list(mirror_index.hashes()))
+
+
 def fake_dag_hash(spec, length=None):
     # Generate an arbitrary hash that is intended to be different than
     # whatever a Spec reported before (to test actions that trigger when
@@ -43,3 +43,14 @@ def test_fetch(tmpdir, _fetch_method):
             source_path = stage.source_path
             mkdirp(source_path)
             fetcher.fetch()
+
+
+def test_fetch_hardlinks_cached_archive(tmp_path):
+    """Ensure the stage gets a hardlink to the cached archive, not a copy or a symlink."""
+    cache = tmp_path / "cache.tar.gz"
+    cache.write_bytes(b"archive")
+    fetcher = CacheURLFetchStrategy(url=url_util.path_to_file_url(str(cache)))
+    with Stage(fetcher, path=str(tmp_path / "stage")) as stage:
+        fetcher.fetch()
+        assert not os.path.islink(stage.save_filename)
+        assert os.path.samefile(stage.save_filename, cache)
@@ -7,8 +7,10 @@
 
 import pytest
 
+import spack.caches
 import spack.concretize
 import spack.user_environment as uenv
+import spack.util.file_cache
 from spack.main import SpackCommand
 
 load = SpackCommand("load")
@@ -194,3 +196,32 @@ def test_unload_fails_no_shell(
 
     out = unload("mpileaks", fail_on_error=False)
     assert "To set up shell support" in out
+
+
+def test_load_reuses_cached_environment_modifications(
+    install_mockery, mock_fetch, mock_archive, mock_packages, mutable_config, tmp_path, monkeypatch
+):
+    """Tests that environment modifications are cached until the database changes"""
+    shell = "--bat" if sys.platform == "win32" else "--sh"
+    monkeypatch.setattr(spack.caches, "MISC_CACHE", spack.util.file_cache.FileCache(str(tmp_path)))
+    monkeypatch.setattr(uenv, "CACHE_STATS", uenv.CacheStats())
+    mutable_config.set("config:environment_modifications_cache", True)
+    install("mpileaks")
+
+    expected = load(shell, "mpileaks")
+    assert (uenv.CACHE_STATS.hits, uenv.CACHE_STATS.misses) == (0, 1)
+
+    # The second time around the modifications are read from the cache
+    with monkeypatch.context() as m:
+        m.setattr(uenv, "environment_modifications_for_specs", None)
+        assert load(shell, "mpileaks") == expected
+    assert uenv.CACHE_STATS.hits == 1
+
+    # Writing the database invalidates the cache
+    install("libelf@0.8.12")
+    assert load(shell, "mpileaks") == expected
+    assert uenv.CACHE_STATS.invalidated == 1
+
+    output = load(shell, "--print-cache-stats", "mpileaks")
+    assert output.startswith(expected)
+    assert "hits:        2" in output
@@ -6,13 +6,16 @@
 
 import pytest
 
+import spack.caches
 import spack.cmd.mirror
 import spack.concretize
 import spack.config
 import spack.environment as ev
 import spack.error
+import spack.mirrors.probe
 import spack.mirrors.utils
 import spack.spec
+import spack.util.file_cache
 import spack.util.url as url_util
 import spack.version
 from spack.main import SpackCommand, SpackCommandError
@@ -549,3 +552,20 @@ def test_mirror_add_set_autopush(mutable_config):
     mirror("set", "--autopush", "example")
     assert spack.config.get("mirrors:example") == {"url": "http://example.com", "autopush": True}
     mirror("remove", "example")
+
+
+def test_mirror_stats(mutable_config, tmp_path, monkeypatch):
+    monkeypatch.setattr(spack.caches, "MISC_CACHE", spack.util.file_cache.FileCache(str(tmp_path)))
+    assert "No mirror statistics recorded" in mirror("stats")
+
+    mirror("add", "fast", "https://fast.example.com")
+    spack.mirrors.probe.record_stats(
+        {"https://fast.example.com": (True, 0.01), "https://unknown.example.com": (False, 10.0)}
+    )
+    spack.mirrors.probe.record_stats({"https://fast.example.com": (True, 0.02)})
+
+    lines = mirror("stats").splitlines()
+    assert lines[0].split()[:3] == ["Mirror", "Probes", "Failures"]
+    # Mirrors are sorted by failure rate, and named by their configuration
+    assert lines[1].split()[:4] == ["fast", "2", "0", "13.0"]
+    assert lines[2].split()[:4] == ["https://unknown.example.com", "1", "1", "10000.0"]
@@ -84,3 +84,18 @@ def test_single_spec_verify_cmd(tmpdir, mock_packages, mock_archive, mock_fetch,
     res = sjson.load(results)
     assert len(res) == 1
     assert res[new_file] == ["added"]
+
+
+def test_verify_all_in_parallel(mock_packages, mock_archive, mock_fetch, install_mockery):
+    install("libelf", "libdwarf")
+    libdwarf = spack.concretize.concretize_one("libdwarf")
+
+    assert not verify("--all", "--fast", "--jobs", "2", fail_on_error=False)
+
+    new_file = os.path.join(libdwarf.prefix, "new_file_for_verify_test")
+    with open(new_file, "w", encoding="utf-8") as f:
+        f.write("New file")
+
+    results = verify("--all", "--fast", "--jobs", "2", fail_on_error=False)
+    assert new_file in results
+    assert verify.returncode == 1
@@ -0,0 +1,125 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import os
+
+import pytest
+
+import spack.caches
+import spack.concretize
+import spack.config
+import spack.main
+import spack.solver.asp
+import spack.solver.concretization_cache as cc
+import spack.spec
+import spack.util.file_cache
+
+pytestmark = pytest.mark.usefixtures("mutable_config", "mock_packages")
+
+clean = spack.main.SpackCommand("clean")
+
+
+@pytest.fixture()
+def concretization_cache(tmp_path, monkeypatch):
+    file_cache = spack.util.file_cache.FileCache(str(tmp_path / "misc_cache"))
+    monkeypatch.setattr(spack.caches, "MISC_CACHE", file_cache)
+    spack.config.set("concretizer:concretization_cache", {"enable": True})
+    return cc.ConcretizationCache(file_cache)
+
+
+def test_solve_is_cached(concretization_cache, monkeypatch):
+    """Tests that a second identical solve is answered from the cache, and gives the same
+    concrete specs as the first.
+    """
+    first = spack.concretize.concretize_one("mpileaks ^mpich")
+    assert concretization_cache.stats()["misses"] == 1
+    assert concretization_cache.stats()["entries"] == 1
+
+    # Grounding must not happen on a cache hit
+    monkeypatch.setattr(spack.solver.asp, "default_clingo_control", lambda: _FailingControl())
+    second = spack.concretize.concretize_one("mpileaks ^mpich")
+
+    assert concretization_cache.stats()["hits"] == 1
+    assert first.dag_hash() == second.dag_hash()
+    assert second.concrete
+    assert [x.dag_hash() for x in first.traverse()] == [x.dag_hash() for x in second.traverse()]
+
+
+class _FailingControl:
+    def __getattr__(self, item):
+        raise AssertionError("the solver should not have been called")
+
+
+def test_different_inputs_are_different_entries(concretization_cache):
+    spack.concretize.concretize_one("mpileaks ^mpich")
+    spack.concretize.concretize_one("mpileaks ^zmpi")
+    stats = concretization_cache.stats()
+    assert stats["misses"] == 2 and stats["entries"] == 2
+
+    # A change in configuration is a change in the input
+    spack.config.set("packages:mpich", {"require": "@1"})
+    spack.concretize.concretize_one("mpileaks ^mpich")
+    assert concretization_cache.stats()["entries"] == 3
+
+
+def test_cached_result_preserves_solver_output(concretization_cache):
+    solver = spack.solver.asp.Solver()
+    fresh = solver.solve([spack.spec.Spec("mpileaks")])
+    cached = solver.solve([spack.spec.Spec("mpileaks")])
+
+    assert concretization_cache.stats()["hits"] == 1
+    assert cached.criteria == fresh.criteria
+    assert cached.nmodels == fresh.nmodels
+    assert cached.possible_dependencies == fresh.possible_dependencies
+    assert [s.dag_hash() for s in cached.specs] == [s.dag_hash() for s in fresh.specs]
+
+
+def test_least_recently_used_entries_are_evicted(concretization_cache, tmp_path):
+    concretization_cache.entry_limit = 2
+    for key, mtime in (("aa01", 100), ("bb02", 200), ("cc03", 300)):
+        concretization_cache.store(key, {"key": key})
+        os.utime(concretization_cache._entry_path(key), (mtime, mtime))
+
+    # Reading an entry makes it the most recently used
+    assert concretization_cache.fetch("bb02") == {"key": "bb02"}
+    concretization_cache.store("dd04", {"key": "dd04"})
+
+    assert concretization_cache.fetch("aa01") is None
+    assert concretization_cache.fetch("cc03") is None
+    assert concretization_cache.fetch("bb02") is not None
+    assert concretization_cache.fetch("dd04") is not None
+    assert concretization_cache.stats()["evictions"] == 2
+
+
+def test_size_limit(concretization_cache):
+    concretization_cache.size_limit = 0
+    concretization_cache.store("aa01", {"key": "aa01"})
+    assert concretization_cache.stats()["entries"] == 0
+
+
+def test_corrupted_entries_are_misses(concretization_cache):
+    concretization_cache.store("aa01", {"key": "aa01"})
+    with open(concretization_cache._entry_path("aa01"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert concretization_cache.fetch("aa01") is None
+    assert concretization_cache.stats()["misses"] == 1
+
+
+def test_key_does_not_depend_on_fact_order(tmp_path):
+    lp_file = tmp_path / "test.lp"
+    lp_file.write_text("a :- b.\n")
+    assert cc.compute_key("b.\nc.\n", [str(lp_file)]) == cc.compute_key("c.\nb.\n", [str(lp_file)])
+    assert cc.compute_key("b.\n", [str(lp_file)]) != cc.compute_key("c.\n", [str(lp_file)])
+
+    lp_file.write_text("a :- c.\n")
+    assert cc.compute_key("b.\nc.\n", [str(lp_file)]) != cc.compute_key("b.\nc.\n", [])
+
+
+def test_clean_concretization_cache(concretization_cache):
+    spack.concretize.concretize_one("mpileaks")
+    assert concretization_cache.stats()["entries"] == 1
+
+    output = clean("--concretization-cache")
+    assert "Removing 1 cached concretization results" in output
+    stats = concretization_cache.stats()
+    assert stats["entries"] == 0 and stats["misses"] == 0
@@ -31,6 +31,7 @@
 import spack.spec
 import spack.store
 import spack.util.file_cache
+import spack.util.parallel
 import spack.variant as vt
 from spack.installer import PackageInstaller
 from spack.spec import CompilerSpec, Spec
@@ -3161,6 +3162,39 @@ def test_selecting_reused_sources(
     assert len(specs) == expected_length
 
 
+@pytest.mark.usefixtures("mutable_database", "mock_store", "do_not_check_runtimes_on_reuse")
+def test_preloaded_reusable_specs(mutable_config, monkeypatch):
+    """Tests that preloading reusable specs reads the sources only once"""
+    mutable_config.set("concretizer:reuse", {"from": [{"type": "local"}]})
+    selector = spack.solver.asp.ReusableSpecsSelector(mutable_config)
+    expected = selector.reusable_specs(["mpileaks"])
+
+    selector.preload()
+    monkeypatch.setattr(selector.reuse_sources[0], "factory", lambda: [])
+    assert selector.reusable_specs(["mpileaks"]) == expected
+    assert selector.reusable_specs(["zlib"]) == expected
+
+
+def test_concretize_separately_schedules_largest_first(mutable_config, mock_packages, monkeypatch):
+    """Tests that the roots with more possible dependencies are solved first"""
+    scheduled = []
+
+    def _sequential(f, list_of_args, **kwargs):
+        assert spack.concretize._WORKER_SOLVER is not None
+        scheduled.extend(x[1] for x in list_of_args)
+        return map(f, list_of_args)
+
+    monkeypatch.setattr(spack.util.parallel, "imap_unordered", _sequential)
+    result = spack.concretize.concretize_separately(
+        [(Spec("zlib"), None), (Spec("mpileaks"), None), (Spec("callpath"), None)]
+    )
+
+    assert scheduled == ["mpileaks", "callpath", "zlib"]
+    assert [str(abstract) for abstract, _ in result] == ["zlib", "mpileaks", "callpath"]
+    assert all(concrete.concrete and concrete.satisfies(abstract) for abstract, concrete in result)
+    assert spack.concretize._WORKER_SOLVER is None
+
+
 @pytest.mark.parametrize(
     "specs,include,exclude,expected",
     [
@@ -3238,3 +3272,81 @@ def test_spec_unification(unify, mutable_config, mock_packages):
     maybe_fails = pytest.raises if unify is True else llnl.util.lang.nullcontext
     with maybe_fails(spack.solver.asp.UnsatisfiableSpecError):
         _ = spack.cmd.parse_specs([a_restricted, b], concretize=True)
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [["mpileaks ^mpich"], ["multivalue-variant foo=baz,barbaz", "conditional-variant-pkg"]],
+)
+def test_parallel_setup_is_the_same_as_serial(specs, mutable_config, mock_packages):
+    """Tests that generating package facts in worker processes gives the same problem instance
+    as generating them serially.
+    """
+    spack.config.set("packages:callpath", {"require": ["@:1.0 ^mpich"]})
+    specs = [Spec(s) for s in specs]
+
+    def problem_instance():
+        return spack.solver.asp.SpackSolverSetup().setup(specs, reuse=[])
+
+    serial = problem_instance()
+    spack.config.set("concretizer:setup_jobs", 2)
+    assert problem_instance() == serial
+
+    spec = spack.concretize.concretize_one(specs[0])
+    spack.config.set("concretizer:setup_jobs", 1)
+    assert spack.concretize.concretize_one(specs[0]).dag_hash() == spec.dag_hash()
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        ["mpileaks", "zlib", "mpileaks ^zmpi"],
+        ["multivalue-variant foo=baz", "pkg-a"],
+        # Versions and variant values that are mentioned by a single root
+        ["zlib@=1.2.99", "zlib", "zlib@=1.2.99 ~shared", "zlib@=1.2.98"],
+        ["raiser exc_type=ValueError", "raiser", "raiser exc_type=TypeError"],
+        # Roots that are solved on their own
+        ["zlib target=x86_64", "zlib", "builtin.mock.zlib"],
+    ],
+)
+def test_multi_shot_solves_are_the_same_as_separate(specs, mutable_config, mock_packages):
+    """Tests that solving specs one at a time on a single grounded problem gives the same
+    results as separate solves.
+    """
+    specs = [Spec(s) for s in specs]
+    expected = [spack.concretize.concretize_one(s) for s in specs]
+    results = list(spack.solver.asp.Solver().solve_separately(specs))
+
+    assert [r.specs[0].dag_hash() for r in results] == [s.dag_hash() for s in expected]
+
+    mutable_config.set("concretizer:multi_shot", True)
+    pairs = spack.concretize.concretize_separately([(s, None) for s in specs])
+    assert [c.dag_hash() for _, c in pairs] == [s.dag_hash() for s in expected]
+
+
+def test_multi_shot_roots_are_checked_as_in_separate_solves(mutable_config, mock_packages):
+    """Tests that the roots of multi-shot solves go through the same checks as single solves"""
+    mutable_config.set("concretizer:multi_shot", True)
+    pairs = spack.concretize.concretize_separately([(Spec(x), None) for x in ("mpi", "zlib")])
+    assert [c.dag_hash() for _, c in pairs] == [
+        spack.concretize.concretize_one(x).dag_hash() for x in ("mpi", "zlib")
+    ]
+
+    with pytest.raises(spack.error.UnsatisfiableSpecError):
+        spack.concretize.concretize_separately([(Spec(x), None) for x in ("zlib", "zlib@9:")])
+
+
+def test_multi_shot_problem_guards_values_of_roots(mock_packages):
+    """Tests that versions and variant values mentioned by a root of a multi-shot solve are
+    possible only when solving for that root.
+    """
+    setup = spack.solver.asp.SpackSolverSetup()
+    setup.multi_shot = True
+    problem = setup.setup([Spec("zlib@=1.2.99"), Spec("raiser exc_type=ValueError")], reuse=[])
+    zlib_id, raiser_id = setup.literal_trigger_ids
+
+    declared = [x for x in problem.splitlines() if "version_declared" in x and '"zlib"' in x]
+    assert declared and all(f"solve_literal({zlib_id})." in x for x in declared)
+    ad_hoc_version = f'version_declared("1.2.99",0,"spec")) :- solve_literal({zlib_id}).'
+    assert any(x.endswith(ad_hoc_version) for x in declared)
+    assert f'"ValueError")) :- solve_literal({raiser_id}).' in problem
@@ -115,6 +115,15 @@ def write_file(filename, contents):
 commit_counter = 0
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolate_git_repos_cache_path(tmp_path_factory):
+    """Keep the bare git repositories cached by fetches out of the user's cache"""
+    saved = spack.paths.user_repos_cache_path
+    spack.paths.user_repos_cache_path = str(tmp_path_factory.mktemp("git-repos-cache"))
+    yield
+    spack.paths.user_repos_cache_path = saved
+
+
 @pytest.fixture
 def override_git_repos_cache_path(tmpdir):
     saved = spack.paths.user_repos_cache_path
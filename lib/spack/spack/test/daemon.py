@@ -0,0 +1,180 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import os
+import socket
+import threading
+import time
+
+import pytest
+from spack_installable.main import command_name, forward_to_daemon
+
+import llnl.util.filesystem as fs
+
+import spack.config
+import spack.daemon
+import spack.paths
+import spack.repo
+import spack.store
+
+pytestmark = pytest.mark.not_on_windows("the daemon uses Unix sockets")
+
+
+@pytest.fixture()
+def fake_daemon(tmp_path):
+    """Serve one request on a socket with the given replies, and return what was received."""
+    socket_path = str(tmp_path / "d.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(1)
+    received = {}
+
+    def _serve(*replies):
+        conn, _ = server.accept()
+        with conn:
+            received["request"], fds = spack.daemon.recv_request(conn)
+            received["num_fds"] = len(fds)
+            for fd in fds:
+                os.close(fd)
+            for reply in replies:
+                spack.daemon.send_reply(conn, **reply)
+
+    def _start(*replies):
+        thread = threading.Thread(target=_serve, args=replies)
+        thread.start()
+        return thread
+
+    yield socket_path, _start, received
+    server.close()
+
+
+def test_forward_to_daemon_returns_exit_code(fake_daemon, tmp_path, monkeypatch):
+    socket_path, start, received = fake_daemon
+    monkeypatch.setenv("SPACK_TEST_VARIABLE", "value")
+    thread = start({"pid": os.getpid()}, {"exit_code": 3})
+
+    with fs.working_dir(str(tmp_path)):
+        assert forward_to_daemon(socket_path, spack.paths.prefix, ["find", "-l"]) == 3
+    thread.join()
+
+    request = received["request"]
+    assert request["argv"] == ["find", "-l"]
+    assert request["cwd"] == str(tmp_path)
+    assert request["env"]["SPACK_TEST_VARIABLE"] == "value"
+    assert request["prefix"] == spack.paths.prefix
+    assert received["num_fds"] == 3
+
+
+def test_forward_to_daemon_falls_back(fake_daemon, tmp_path):
+    socket_path, start, _ = fake_daemon
+    thread = start({"fallback": "the client is another Spack instance"})
+    assert forward_to_daemon(socket_path, spack.paths.prefix, ["find"]) is None
+    thread.join()
+
+    # Without a daemon, and for the daemon command itself, commands run in the client
+    assert forward_to_daemon(str(tmp_path / "missing.sock"), spack.paths.prefix, ["find"]) is None
+    assert forward_to_daemon(socket_path, spack.paths.prefix, ["daemon"]) is None
+
+
+def test_forward_to_daemon_without_exit_code(fake_daemon, capfd):
+    socket_path, start, _ = fake_daemon
+    thread = start({"pid": os.getpid()})
+    assert forward_to_daemon(socket_path, spack.paths.prefix, ["find"]) == 1
+    thread.join()
+    assert "did not return the exit code" in capfd.readouterr()[1]
+
+
+@pytest.fixture()
+def daemon(tmp_path, mock_packages, database):
+    """Serve commands from a daemon in a thread, with the state of the test."""
+    server = spack.daemon.Daemon(str(tmp_path / "d.sock"))
+    server.configuration = spack.config.CONFIG
+    server.repo_path = spack.repo.PATH
+    server.store = spack.store.STORE
+    server._generation = server.generation()
+
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    while not spack.daemon.socket_in_use(server.socket_path):
+        time.sleep(0.01)
+    yield server.socket_path
+    server.stop()
+    thread.join()
+
+
+def test_daemon_runs_commands_on_the_streams_of_the_client(daemon, tmp_path, capfd):
+    capfd.readouterr()
+    with fs.working_dir(str(tmp_path)):
+        assert forward_to_daemon(daemon, spack.paths.prefix, ["find", "mpileaks"]) == 0
+    out, err = capfd.readouterr()
+    assert "mpileaks@2.3" in out
+    assert not err
+
+    assert forward_to_daemon(daemon, spack.paths.prefix, ["-e", "nonexistent", "find"]) == 1
+    out, err = capfd.readouterr()
+    assert "nonexistent" in err
+    assert not out
+
+
+@pytest.mark.parametrize(
+    "argv,expected",
+    [
+        (["daemon", "--socket", "d.sock"], "daemon"),
+        (["install", "daemon"], "install"),
+        (["-e", "daemon", "find"], "find"),
+        (["-de", "daemon", "find"], "find"),
+        (["-edaemon", "find"], "find"),
+        (["--env=daemon", "find"], "find"),
+        (["--color", "never", "-d", "daemon"], "daemon"),
+        (["-h"], None),
+    ],
+)
+def test_command_name(argv, expected):
+    assert command_name(argv) == expected
+
+
+@pytest.mark.parametrize(
+    "prefix,variable,expected",
+    [
+        (spack.paths.prefix, None, None),
+        (spack.paths.prefix, "SPACK_USER_CONFIG_PATH", "SPACK_USER_CONFIG_PATH differ"),
+        ("/not/spack", None, "another Spack instance"),
+    ],
+)
+def test_daemon_refuses_commands_it_cannot_run(tmp_path, prefix, variable, expected):
+    daemon = spack.daemon.Daemon(str(tmp_path / "d.sock"))
+    env = dict(os.environ)
+    if variable:
+        env[variable] = str(tmp_path)
+    request = {"argv": ["find"], "cwd": str(tmp_path), "env": env, "prefix": prefix}
+
+    client, conn = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client, conn:
+        reason = daemon._refusal_reason(conn, request, [0, 1, 2])
+        assert reason is None if expected is None else expected in reason
+        assert "standard streams" in daemon._refusal_reason(conn, request, [])
+
+
+def test_daemon_generation(tmp_path, mutable_config, mock_packages, mutable_database):
+    daemon = spack.daemon.Daemon(str(tmp_path / "d.sock"))
+    daemon.configuration = spack.config.CONFIG
+    daemon.repo_path = spack.repo.PATH
+    daemon.store = spack.store.STORE
+    initial = daemon.generation()
+    assert daemon.generation() == initial
+
+    # Writing to the database only changes its part of the generation
+    with spack.store.STORE.db.write_transaction():
+        pass
+    after_write = daemon.generation()
+    assert after_write[:2] == initial[:2] and after_write[2] != initial[2]
+
+    # Adding a configuration file changes the configuration part
+    scope = next(
+        s
+        for s in spack.config.CONFIG.scopes.values()
+        if isinstance(s, spack.config.DirectoryConfigScope)
+    )
+    with open(scope.get_section_filename("packages"), "w", encoding="utf-8") as f:
+        f.write("packages: {}\n")
+    assert daemon.generation()[0] != after_write[0]
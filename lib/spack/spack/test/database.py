@@ -206,8 +206,10 @@ def test_removed_upstream_dep(upstream_and_downstream_db, tmpdir, capsys, config
             upstream_db.remove(z)
         upstream_db._read()
 
-        # then rereading the downstream DB should warn about the missing dep
+        # then rereading the downstream DB should warn about the missing dep, once the
+        # specs are constructed
         downstream_db._read_from_file(downstream_db._index_path)
+        downstream_db.load_all_specs()
         assert (
             f"Missing dependency not in database: y/{y.dag_hash(7)} needs z"
             in capsys.readouterr().err
@@ -1235,3 +1237,169 @@ def test_query_with_predicate_fn(database):
 
     specs = database.query(predicate_fn=lambda x: not spack.repo.PATH.exists(x.spec.name))
     assert not specs
+
+
+@pytest.fixture()
+def journaled_db(tmp_path):
+    journal_cfg = spack.database.JournalConfiguration(enable=True, compact_after=100)
+    return spack.database.Database(str(tmp_path), layout=None, journal_cfg=journal_cfg)
+
+
+@pytest.mark.skipif(not _use_uuid, reason="journaling requires uuid")
+def test_journal_appends_changes(journaled_db, default_mock_concretization):
+    """Tests that changes after the first write are appended to the journal, and that readers
+    replay them on top of index.json."""
+    journaled_db.add(default_mock_concretization("pkg-c"))
+    index_content = journaled_db._index_path.read_text()
+    assert not journaled_db._journal_path.exists()
+
+    mpileaks = default_mock_concretization("mpileaks")
+    journaled_db.add(mpileaks, explicit=True)
+    assert journaled_db._index_path.read_text() == index_content
+    assert journaled_db._journal_path.exists()
+
+    # A reader that doesn't journal sees all the changes
+    reader = spack.database.Database(journaled_db.root, layout=None)
+    assert {s.dag_hash() for s in reader.query_local()} == {
+        s.dag_hash() for s in journaled_db.query_local()
+    }
+    assert reader.get_record(mpileaks).explicit
+    reader._check_ref_counts()
+
+    journaled_db.remove(mpileaks)
+    assert not reader.query_local("mpileaks")
+    assert reader.query_local("pkg-c")
+    reader._check_ref_counts()
+
+
+@pytest.mark.skipif(not _use_uuid, reason="journaling requires uuid")
+def test_journal_is_read_incrementally(journaled_db, default_mock_concretization, monkeypatch):
+    """Tests that a reader which is up to date with the snapshot only replays new entries."""
+    journaled_db.add(default_mock_concretization("pkg-c"))
+    journaled_db.add(default_mock_concretization("pkg-b"))
+    reader = spack.database.Database(journaled_db.root, layout=None)
+    assert len(reader.query_local()) == 2
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("the whole index should not be read")
+
+    monkeypatch.setattr(reader, "_read_from_file", _fail)
+    journaled_db.add(default_mock_concretization("pkg-a"), explicit=True)
+    assert reader.query_local() == journaled_db.query_local()
+    assert reader.query_local("pkg-a", explicit=True)
+    reader._check_ref_counts()
+
+
+@pytest.mark.skipif(not _use_uuid, reason="journaling requires uuid")
+def test_journal_is_compacted(tmp_path, default_mock_concretization):
+    """Tests that the journal is compacted into index.json after enough entries."""
+    journal_cfg = spack.database.JournalConfiguration(enable=True, compact_after=1)
+    db = spack.database.Database(str(tmp_path), layout=None, journal_cfg=journal_cfg)
+    db.add(default_mock_concretization("pkg-c"))
+    db.add(default_mock_concretization("pkg-b"))
+    assert db._journal_path.exists()
+
+    db.add(default_mock_concretization("pkg-a"))
+    assert not db._journal_path.exists()
+    with open(db._index_path, encoding="utf-8") as f:
+        installs = json.load(f)["database"]["installs"]
+    assert len(installs) == len(db.query_local()) == 4  # pkg-a depends on gmake
+    assert {s.dag_hash() for s in db.query_local()} == set(installs)
+
+
+@pytest.mark.skipif(not _use_uuid, reason="journaling requires uuid")
+def test_journal_ignores_incomplete_entries(journaled_db, default_mock_concretization):
+    """Tests that an entry left incomplete by an interrupted process is ignored, and overwritten
+    by the next change."""
+    journaled_db.add(default_mock_concretization("pkg-c"))
+    journaled_db.add(default_mock_concretization("pkg-b"))
+    with open(journaled_db._journal_path, "a", encoding="utf-8") as f:
+        f.write('{"key": "abcdef')
+
+    reader = spack.database.Database(journaled_db.root, layout=None)
+    assert len(reader.query_local()) == 2
+
+    journaled_db.add(default_mock_concretization("pkg-a"))
+    reader = spack.database.Database(journaled_db.root, layout=None)
+    assert reader.query_local() == journaled_db.query_local()
+    assert reader.query_local("pkg-a")
+
+
+@pytest.mark.skipif(not _use_uuid, reason="journaling requires uuid")
+def test_full_write_discards_journal(journaled_db, default_mock_concretization):
+    """Tests that a process that does not journal rewrites index.json with all the changes, and
+    removes the journal."""
+    journaled_db.add(default_mock_concretization("pkg-c"))
+    journaled_db.add(default_mock_concretization("pkg-b"))
+
+    writer = spack.database.Database(journaled_db.root, layout=None)
+    writer.add(default_mock_concretization("pkg-a"))
+    assert not writer._journal_path.exists()
+    assert journaled_db.query_local() == writer.query_local()
+    assert journaled_db.query_local("pkg-a")
+
+    journaled_db.remove(journaled_db.query_local("pkg-a")[0])
+    assert not writer.query_local("pkg-a")
+    assert journaled_db.query_local() == writer.query_local()
+
+
+def test_specs_are_constructed_lazily(mutable_database):
+    """Tests that reading the index constructs no spec, and that a query constructs only the
+    matching specs, their dependencies, and their dependents."""
+    db = spack.database.Database(mutable_database.root, layout=None)
+    with db.read_transaction():
+        assert all(rec._spec is None for rec in db._data.values())
+
+    (libelf,) = db.query_local("libelf")
+    constructed = {h for h, rec in db._data.items() if rec._spec is not None}
+    assert libelf.dag_hash() in constructed
+    assert {s.dag_hash() for s in libelf.traverse(direction="parents")} <= constructed
+    assert all(db._data[h].spec.name != "externaltool" for h in constructed)
+    assert len(constructed) < len(db._data)
+
+    # Dependents are the same as those of specs read eagerly
+    expected = mutable_database.query_local("libelf")[0]
+    assert sorted(s.dag_hash() for s in libelf.dependents()) == sorted(
+        s.dag_hash() for s in expected.dependents()
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "mpileaks",
+        "mpileaks@2.3",
+        "mpileaks@:2.2 ^mpich",
+        "callpath ^zmpi",
+        "^mpich",
+        "^mpi",
+        "%gcc",
+        "%clang",
+        "libelf@0.8.13 %gcc",
+        "target=x86_64",
+        "platform=test",
+        "mpileaks ~shared",
+        "mpileaks +shared",
+        "build_type=Release",
+        "^libdwarf@20130729",
+        "mpi@2",
+    ],
+)
+def test_indexed_query_matches_satisfies(database, query):
+    """Tests that queries narrowed down by the indexes return the same specs as checking all
+    the records with satisfies."""
+    expected = [s for s in database.query_local() if s.satisfies(query)]
+    assert database.query_local(query) == expected
+
+
+def test_query_index_is_rebuilt_when_records_change(mutable_database):
+    """Tests that the indexes built by a query are discarded when a spec is added"""
+    assert not mutable_database.query_local("libelf@0.8.12", installed=InstallRecordStatus.ANY)
+    assert mutable_database._query_index._groups
+
+    libelf = spack.concretize.concretize_one("libelf@0.8.12")
+    mutable_database.add(libelf)
+    assert mutable_database.query_local("libelf@0.8.12", installed=InstallRecordStatus.ANY) == [
+        libelf
+    ]
+    assert not mutable_database.query_local("^libelf@0.8.12", installed=InstallRecordStatus.ANY)
@@ -0,0 +1,117 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Tests for the cache of package directives."""
+import io
+import json
+import os
+import sys
+
+import pytest
+
+import spack.deptypes as dt
+import spack.directives_index
+import spack.repo
+import spack.util.file_cache
+
+
+def test_directives_match_package_class(mock_packages):
+    directives = spack.repo.PATH.package_directives("mpileaks")
+    pkg_cls = spack.repo.PATH.get_pkg_class("mpileaks")
+
+    assert directives.name == "mpileaks"
+    assert directives.description == pkg_cls.__doc__
+    assert directives.homepage == pkg_cls.homepage
+    assert directives.versions == [str(v) for v in sorted(pkg_cls.versions, reverse=True)]
+    assert directives.variants == sorted(pkg_cls.variant_names())
+    assert set(directives.dependencies) == set(pkg_cls.dependency_names())
+    assert all(flag & dt.LINK for _, flag in directives.dependencies["callpath"])
+
+    assert spack.repo.PATH.package_directives("mpich").provides == ["mpi"]
+    assert spack.repo.PATH.package_directives("builtin.mock.mpich").tags == ["tag1", "tag2"]
+
+    with pytest.raises(spack.repo.UnknownPackageError):
+        spack.repo.PATH.package_directives("not-a-package")
+
+
+def test_directives_index_round_trip(mock_packages):
+    index = spack.repo.PATH.repos[0].directives_index
+    stream = io.StringIO()
+    index.to_json(stream)
+    stream.seek(0)
+
+    read = spack.directives_index.DirectivesIndex.from_json(stream, repository=mock_packages)
+    assert dict(read) == dict(index)
+
+    with pytest.raises(spack.directives_index.DirectivesIndexError):
+        spack.directives_index.DirectivesIndex.from_json(io.StringIO('{"tags": {}}'), None)
+
+
+def test_directives_are_read_without_importing_packages(tmp_path, monkeypatch):
+    builder = spack.repo.MockRepositoryBuilder(tmp_path / "repo", namespace="directives")
+    builder.add_package("pkg-a", dependencies=[("pkg-b", "build", None)])
+    builder.add_package("pkg-b")
+    cache = spack.util.file_cache.FileCache(str(tmp_path / "cache"))
+
+    # The first time around the index is built, which imports the packages
+    repo = spack.repo.RepoPath(builder.root, cache=cache)
+    assert repo.package_directives("pkg-a").dependencies == {"pkg-b": [("", dt.BUILD)]}
+
+    # A new repository reads the index from the cache
+    def _fail(*args, **kwargs):
+        raise AssertionError("packages should not be imported")
+
+    monkeypatch.setattr(spack.repo.Repo, "get_pkg_class", _fail)
+    repo = spack.repo.RepoPath(builder.root, cache=cache)
+    assert repo.package_directives("pkg-a").versions == ["3.0", "2.0", "1.0"]
+    assert repo.package_directives("pkg-b").dependencies == {}
+    monkeypatch.undo()
+
+    # A modified package is updated in the index, like for the other repository indexes
+    builder.add_package("pkg-b", dependencies=[("pkg-c", None, "@2:")])
+    index_mtime = cache.mtime("directives/directives-index.json")
+    os.utime(builder.recipe_filename("pkg-b"), (index_mtime + 10, index_mtime + 10))
+    spack.repo.FastPackageChecker(os.path.join(builder.root, "packages")).invalidate()
+    monkeypatch.delitem(sys.modules, "spack.pkg.directives.pkg-b")
+
+    repo = spack.repo.RepoPath(builder.root, cache=cache)
+    dependencies = repo.package_directives("pkg-b").dependencies
+    assert list(dependencies) == ["pkg-c"]
+    assert dependencies["pkg-c"][0][0] == "@2:"
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        # Written by another version of Spack
+        lambda d: json.dumps({**d, "spack": "0.1"}),
+        lambda d: json.dumps({**d, "version": 0}),
+        # With fields that are not known to this version of Spack
+        lambda d: json.dumps({**d, "directives": {"pkg-a": {"name": "pkg-a", "extra": []}}}),
+        # Truncated
+        lambda d: json.dumps(d)[:20],
+    ],
+)
+def test_directives_index_is_regenerated_when_stale(tmp_path, contents):
+    builder = spack.repo.MockRepositoryBuilder(tmp_path / "repo", namespace="directives")
+    builder.add_package("pkg-a")
+    cache = spack.util.file_cache.FileCache(str(tmp_path / "cache"))
+
+    repo = spack.repo.RepoPath(builder.root, cache=cache)
+    assert repo.package_directives("pkg-a").versions == ["3.0", "2.0", "1.0"]
+
+    # Other indexes are built without the directives index
+    repo = spack.repo.RepoPath(builder.root, cache=cache)
+    _ = repo.repos[0].tag_index
+    assert "directives" not in repo.repos[0].index.indexes
+
+    filename = os.path.join(cache.root, "directives", "directives-index.json")
+    with open(filename, encoding="utf-8") as f:
+        data = json.load(f)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(contents(data))
+
+    repo = spack.repo.RepoPath(builder.root, cache=cache)
+    assert repo.package_directives("pkg-a").versions == ["3.0", "2.0", "1.0"]
+    with open(filename, encoding="utf-8") as f:
+        assert json.load(f) == data
@@ -14,8 +14,10 @@
 import spack.environment as ev
 import spack.solver.asp
 import spack.spec
+import spack.util.spack_json
 from spack.environment.environment import (
     EnvironmentManifestFile,
+    LockfileSpecs,
     SpackEnvironmentViewError,
     _error_on_nonempty_view_dir,
 )
@@ -918,3 +920,48 @@ def test_environment_from_name_or_dir(mock_packages, mutable_mock_env_path, tmp_
 
     with pytest.raises(ev.SpackEnvironmentError, match="no such environment"):
         _ = ev.environment_from_name_or_dir("fake-env")
+
+
+def test_lockfile_specs_are_read_on_demand(tmp_path, mock_packages, config):
+    """Tests that reading an environment does not construct specs until they are needed"""
+    env = ev.create_in_dir(tmp_path)
+    for s in ("mpileaks", "pkg-a"):
+        env.add(s)
+    env.concretize()
+    env.write()
+    expected = {s.dag_hash(): s for s in env.all_specs()}
+
+    read_in = ev.Environment(tmp_path)
+    assert isinstance(read_in.specs_by_hash, LockfileSpecs)
+    assert not read_in.specs_by_hash._specs_by_hash
+    assert set(read_in.specs_by_hash) == set(env.concretized_order)
+
+    first = next(read_in.all_specs_generator())
+    assert first.dag_hash() == read_in.concretized_order[0]
+    assert len(read_in.specs_by_hash._specs_by_hash) < len(expected)
+
+    all_specs = read_in.all_specs()
+    assert {s.dag_hash(): s for s in all_specs} == expected
+    assert len({id(s) for s in all_specs}) == len(expected)
+
+
+def test_lockfile_data_is_cached(tmp_path, mock_packages, config, monkeypatch):
+    """Tests that the data in the lockfile is cached, and invalidated when the lockfile changes"""
+    env = ev.create_in_dir(tmp_path)
+    env.add("libelf")
+    env.concretize()
+    env.write()
+    ev.Environment(tmp_path)
+    assert os.path.exists(env._lockfile_cache_path)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("the lockfile should not be parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr(spack.util.spack_json, "load", _fail)
+        assert ev.Environment(tmp_path).concretized_order == env.concretized_order
+
+    env.add("mpileaks")
+    env.concretize()
+    env.write()
+    assert len(ev.Environment(tmp_path).concretized_order) == 2
@@ -16,6 +16,7 @@
 import spack.fetch_strategy
 import spack.platforms
 import spack.repo
+import spack.util.url
 from spack.fetch_strategy import GitFetchStrategy
 from spack.spec import Spec
 from spack.stage import Stage
@@ -429,3 +430,29 @@ def test_git_sparse_paths_partial_clone(
 
         # fixture file is in the sparse-path expansion tree
         assert os.path.isfile(t.file)
+
+
+def test_commit_fetches_share_a_bare_repository(git, mock_git_repository, tmp_path):
+    """Tests that stages of commits clone from the shared bare repository, which keeps working
+    when the remote is not reachable anymore."""
+    remote = tmp_path / "remote"
+    shutil.copytree(mock_git_repository.path, remote, symlinks=True)
+    url = spack.util.url.path_to_file_url(str(remote))
+    commit = mock_git_repository.checks["commit"].revision
+    cache = spack.fetch_strategy.git_repository_cache_path(url)
+
+    fetcher = GitFetchStrategy(git=url, commit=commit)
+    with Stage(fetcher, path=str(tmp_path / "first")) as stage:
+        fetcher.fetch()
+        assert os.path.isdir(cache)
+        with working_dir(stage.source_path):
+            assert git("config", "remote.origin.url", output=str).strip() == url
+
+    shutil.rmtree(remote)
+
+    fetcher = GitFetchStrategy(git=url, commit=commit)
+    with Stage(fetcher, path=str(tmp_path / "second")) as stage:
+        fetcher.fetch()
+        with working_dir(stage.source_path):
+            assert git("rev-parse", "HEAD", output=str).strip() == commit
+            assert git("config", "remote.origin.url", output=str).strip() == url
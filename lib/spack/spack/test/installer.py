@@ -3,9 +3,11 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 import glob
+import hashlib
 import os
 import shutil
 import sys
+import threading
 from typing import List, Optional, Union
 
 import py
@@ -16,7 +18,9 @@
 import llnl.util.tty as tty
 
 import spack.binary_distribution
+import spack.build_environment
 import spack.concretize
+import spack.config
 import spack.database
 import spack.deptypes as dt
 import spack.error
@@ -27,6 +31,7 @@
 import spack.repo
 import spack.spec
 import spack.store
+import spack.util.crypto
 import spack.util.lock as lk
 from spack.installer import PackageInstaller
 from spack.main import SpackCommand
@@ -1335,3 +1340,102 @@ def test_print_install_test_log_failures(
     spack.installer.print_install_test_log(pkg)
     out = capfd.readouterr()[0]
     assert "See test results at" in out
+
+
+def test_install_concurrent_packages(install_mockery, mock_fetch, monkeypatch):
+    """Test that building packages concurrently installs the same set of packages."""
+    installer = create_installer(["pkg-a", "pkg-c"], {"fake": False, "concurrent_packages": 2})
+    assert installer.concurrent_packages == 2
+
+    max_active = []
+    complete_active_tasks = inst.PackageInstaller._complete_active_tasks
+
+    def _track_active(self, *args, **kwargs):
+        max_active.append(len(self.active_tasks))
+        return complete_active_tasks(self, *args, **kwargs)
+
+    monkeypatch.setattr(inst.PackageInstaller, "_complete_active_tasks", _track_active)
+    installer.install()
+
+    assert max(max_active) == 2
+
+    for request in installer.build_requests:
+        assert request.pkg.spec.installed
+        assert spack.store.STORE.db.query_one(request.pkg.spec).installed
+    assert not installer.active_tasks
+
+
+def test_install_concurrent_packages_default(install_mockery, mutable_config):
+    """Test that the number of concurrent packages is read from configuration."""
+    spack.config.set("config:concurrent_packages", 3)
+    assert create_installer(["pkg-b"]).concurrent_packages == 3
+    assert create_installer(["pkg-b"], {"concurrent_packages": 1}).concurrent_packages == 1
+
+
+def test_install_concurrent_packages_failure(install_mockery, mock_fetch, monkeypatch):
+    """Test that a failure in a concurrent build is reported, and leaves no running builds."""
+
+    def _fail(*args, **kwargs):
+        raise MyBuildException("mock build failure")
+
+    monkeypatch.setattr(spack.build_environment, "_setup_pkg_and_run", _fail)
+    installer = create_installer(["pkg-b"], {"fake": False, "concurrent_packages": 2})
+    with pytest.raises(spack.error.InstallError):
+        installer.install()
+    assert not installer.installed
+    assert not installer.active_tasks
+
+
+def test_install_prefetches_binaries(install_mockery, mock_fetch, monkeypatch):
+    """Test that the binaries of all the queued packages are downloaded in background threads,
+    before the installation of the first package."""
+    spack.config.set("mirrors", {"test": "file:///no/such/mirror"})
+    downloads = {}
+
+    def _download(spec, unsigned=False, mirrors_for_spec=None):
+        assert threading.current_thread() is not threading.main_thread()
+        downloads[spec.name] = spec.package.spec.installed
+        return None
+
+    monkeypatch.setattr(spack.binary_distribution, "get_mirrors_for_spec", lambda *a, **kw: [])
+    monkeypatch.setattr(spack.binary_distribution, "download_tarball", _download)
+    installer = create_installer(["pkg-a"], {"fake": True})
+    installer.install()
+
+    spec = installer.build_requests[0].pkg.spec
+    assert spec.installed
+    # Binaries were not found, so packages were built, but only after all the downloads started
+    assert downloads == {s.name: False for s in spec.traverse() if not s.external}
+    assert not installer.prefetcher._downloads
+
+
+def test_binary_prefetcher_removes_unused_downloads(tmp_path, monkeypatch):
+    """Test that downloads that were never consumed are removed on shutdown."""
+    tarball = tmp_path / "pkg.spack"
+    tarball.write_bytes(b"contents")
+    destroyed = []
+
+    class _Stage:
+        def __init__(self, name):
+            self.name = name
+            self.save_filename = str(tarball)
+
+        def destroy(self):
+            destroyed.append(self.name)
+
+    def _download(spec, unsigned=False, mirrors_for_spec=None):
+        return {"tarball_stage": _Stage("tarball"), "specfile_stage": _Stage("specfile")}
+
+    monkeypatch.setattr(spack.binary_distribution, "download_tarball", _download)
+    spec = spack.spec.Spec("pkg-a")
+    spec._mark_concrete()
+
+    prefetcher = inst.BinaryPrefetcher(2)
+    future = prefetcher.prefetch(spec, unsigned=True)
+    assert prefetcher.prefetch(spec, unsigned=True) is future
+    assert future.result()["tarball_checksum"] == spack.util.crypto.checksum(
+        hashlib.sha256, str(tarball)
+    )
+
+    prefetcher.shutdown()
+    assert sorted(destroyed) == ["specfile", "tarball"]
@@ -16,10 +16,12 @@
 import spack.fetch_strategy
 import spack.mirrors.layout
 import spack.mirrors.mirror
+import spack.mirrors.probe
 import spack.mirrors.utils
 import spack.patch
 import spack.stage
 import spack.util.executable
+import spack.util.file_cache
 import spack.util.spack_json as sjson
 import spack.util.url as url_util
 from spack.cmd.common.arguments import mirror_name_or_url
@@ -434,3 +436,43 @@ def test_mirror_name_or_url_dir_parsing(tmp_path):
     with working_dir(curdir):
         assert mirror_name_or_url(".").fetch_url == curdir.as_uri()
         assert mirror_name_or_url("..").fetch_url == tmp_path.as_uri()
+
+
+def test_racing_mirrors_fetches_from_the_mirror_with_the_archive(tmp_path, monkeypatch):
+    """Tests that racing mirrors skips the mirrors without the archive, and records their
+    failures in the statistics."""
+    monkeypatch.setattr(
+        spack.caches, "MISC_CACHE", spack.util.file_cache.FileCache(str(tmp_path / "misc"))
+    )
+    layout = spack.mirrors.layout.DefaultLayout(os.path.join("zlib", "zlib-1.2.11.tar.gz"))
+    roots = [tmp_path / f"mirror{i}" for i in range(3)]
+    archive = roots[2] / layout.path
+    archive.parent.mkdir(parents=True)
+    archive.write_bytes(b"archive")
+    mirrors = [
+        spack.mirrors.mirror.Mirror(url_util.path_to_file_url(str(root)), name=root.name)
+        for root in roots
+    ]
+
+    default_fetcher = spack.fetch_strategy.URLFetchStrategy(
+        url=url_util.path_to_file_url(str(tmp_path / "upstream" / "zlib-1.2.11.tar.gz"))
+    )
+    spack.config.set("config:race_mirrors", True)
+    stage = spack.stage.Stage(
+        default_fetcher, mirror_paths=layout, mirrors=mirrors, path=str(tmp_path / "stage")
+    )
+    with stage:
+        stage.fetch()
+        assert stage.fetcher.url.startswith(mirrors[2].fetch_url)
+
+    stats = spack.mirrors.probe.read_stats()
+    assert {url: entry["failures"] for url, entry in stats.items()} == {
+        mirrors[0].fetch_url: 1,
+        mirrors[1].fetch_url: 1,
+        mirrors[2].fetch_url: 0,
+    }
+
+    # Mirrors that failed are tried last
+    fetchers = list(stage._generate_fetchers())
+    assert fetchers[0].url.startswith(mirrors[2].fetch_url)
+    assert fetchers[-1] is default_fetcher
@@ -183,6 +183,44 @@ def test_relocate_text_bin_raise_if_new_prefix_is_longer(tmpdir):
         spack.relocate.relocate_text_bin([fpath], {short_prefix: long_prefix})
 
 
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_relocate_text_and_binaries(jobs, tmp_path, monkeypatch):
+    """Tests that relocation gives the same results with and without worker processes."""
+    monkeypatch.setattr(spack.relocate, "MIN_FILES_FOR_PARALLEL_RELOCATION", 1)
+    textfiles, binaries = [], []
+    for i in range(20):
+        text, binary = tmp_path / f"text-{i}", tmp_path / f"bin-{i}"
+        text.write_text(f"#!/old/prefix/bin/sh {i}\n")
+        binary.write_bytes(b"\x7fELF /old/prefix/lib/libfoo.so\0 /not/relocated\0")
+        textfiles.append(str(text))
+        binaries.append(str(binary))
+
+    changed = spack.relocate.relocate_text_and_binaries(
+        textfiles, binaries, {"/old/prefix": "/new"}, jobs=jobs
+    )
+
+    assert sorted(changed) == sorted(binaries)
+    for i, (text, binary) in enumerate(zip(textfiles, binaries)):
+        assert open(text, encoding="utf-8").read() == f"#!/new/bin/sh {i}\n"
+        assert open(binary, "rb").read() == b"\x7fELF ////////new/lib/libfoo.so\0 /not/relocated\0"
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_relocate_text_and_binaries_raises_replace_errors(jobs, tmp_path, monkeypatch):
+    """Tests that errors raised in worker processes are re-raised with their own type."""
+    monkeypatch.setattr(spack.relocate, "MIN_FILES_FOR_PARALLEL_RELOCATION", 1)
+    binaries = []
+    for i in range(8):
+        binary = tmp_path / f"bin-{i}"
+        binary.write_bytes(b"/short")
+        binaries.append(str(binary))
+
+    with pytest.raises(relocate_text.CannotGrowString, match="the new prefix is longer"):
+        spack.relocate.relocate_text_and_binaries(
+            [], binaries, {"/short": "/much/longer"}, jobs=jobs
+        )
+
+
 @pytest.mark.requires_executables("install_name_tool", "cc")
 def test_fixup_macos_rpaths(make_dylib, make_object_file):
     compiler_cls = spack.repo.PATH.get_pkg_class("apple-clang")
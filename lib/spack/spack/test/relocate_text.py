@@ -1,7 +1,9 @@
 # Copyright Spack Project Developers. See COPYRIGHT file for details.
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import functools
 import io
+import random
 from collections import OrderedDict
 
 import pytest
@@ -35,15 +37,21 @@ def test_utf8_paths_to_single_binary_regex():
     assert regex.search(string).group(0) == b"/safe/[a-z]/file"
 
 
-def test_ordered_replacement():
+@pytest.mark.parametrize(
+    "replacer_cls",
+    [
+        relocate_text.BinaryFilePrefixReplacer,
+        relocate_text.StreamingBinaryFilePrefixReplacer,
+        functools.partial(relocate_text.StreamingBinaryFilePrefixReplacer, window_size=3),
+    ],
+)
+def test_ordered_replacement(replacer_cls):
     # This tests whether binary text replacement respects order, so that
     # a long package prefix is replaced before a shorter sub-prefix like
     # the root of the spack store (as a fallback).
     def replace_and_expect(prefix_map, before, after=None, suffix_safety_size=7):
         f = io.BytesIO(before)
-        relocater = relocate_text.BinaryFilePrefixReplacer(
-            OrderedDict(prefix_map), suffix_safety_size
-        )
+        relocater = replacer_cls(OrderedDict(prefix_map), suffix_safety_size)
         relocater.apply_to_file(f)
         f.seek(0)
         assert f.read() == after
@@ -177,10 +185,18 @@ def replace_and_expect(prefix_map, before, after=None, suffix_safety_size=7):
         )
 
 
-def test_inplace_text_replacement():
+@pytest.mark.parametrize(
+    "replacer_cls",
+    [
+        relocate_text.TextFilePrefixReplacer,
+        relocate_text.StreamingTextFilePrefixReplacer,
+        functools.partial(relocate_text.StreamingTextFilePrefixReplacer, window_size=3),
+    ],
+)
+def test_inplace_text_replacement(replacer_cls):
     def replace_and_expect(prefix_to_prefix, before: bytes, after: bytes):
         f = io.BytesIO(before)
-        replacer = relocate_text.TextFilePrefixReplacer(OrderedDict(prefix_to_prefix))
+        replacer = replacer_cls(OrderedDict(prefix_to_prefix))
         replacer.apply_to_file(f)
         f.seek(0)
         assert f.read() == after
@@ -236,3 +252,66 @@ def test_relocate_text_filters_redundant_entries():
     replacer_2 = relocate_text.TextFilePrefixReplacer.from_strings_or_bytes(mapping)
     assert not replacer_1.prefix_to_prefix
     assert not replacer_2.prefix_to_prefix
+
+
+def test_multi_prefix_matcher():
+    matcher = relocate_text.MultiPrefixMatcher([b"/a/bc", b"/a/b", b"/x"])
+    data = b"/a/b /a/bcd /x/a/bc"
+    assert list(matcher.finditer(data, 0, len(data))) == [(0, 1), (5, 0), (12, 2), (14, 0)]
+    # Matches may start before the end, but must fit in the data
+    assert list(matcher.finditer(data, 1, 13)) == [(5, 0), (12, 2)]
+    assert list(matcher.finditer(data[:17], 0, 17)) == [(0, 1), (5, 0), (12, 2)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_streaming_replacers_are_equivalent_to_regex_replacers(seed):
+    """Tests that the streaming replacers give the same results as the regex based ones,
+    including when prefixes straddle the edges of windows."""
+    rng = random.Random(seed)
+    chunks = [b"/", b"a", b"-", b"_", b"\0", b" ", b".", b"#!"]
+
+    for _ in range(500):
+        prefixes = list(
+            dict.fromkeys(
+                rng.choice([b"/", b"a"]) + bytes(rng.choices(b"ab/-_", k=rng.randint(1, 5)))
+                for _ in range(rng.randint(1, 4))
+            )
+        )
+        data = b"".join(
+            rng.choice(prefixes) if rng.random() < 0.4 else rng.choice(chunks)
+            for _ in range(rng.randint(0, 20))
+        )
+        window_size = rng.choice([1, 2, 5, 1024])
+
+        text_map = {p: b"/" + b"q" * rng.randint(0, 8) for p in prefixes}
+        expected, actual = io.BytesIO(data), io.BytesIO(data)
+        relocate_text.TextFilePrefixReplacer(text_map).apply_to_file(expected)
+        relocate_text.StreamingTextFilePrefixReplacer(text_map, window_size).apply_to_file(actual)
+        assert actual.getvalue() == expected.getvalue()
+
+        binary_map = {p: b"/" + b"q" * rng.randint(0, len(p) - 1) for p in prefixes}
+        expected, actual = io.BytesIO(data), io.BytesIO(data)
+        results = []
+        for replacer, f in (
+            (relocate_text.BinaryFilePrefixReplacer(binary_map), expected),
+            (relocate_text.StreamingBinaryFilePrefixReplacer(binary_map, 7, window_size), actual),
+        ):
+            try:
+                results.append(replacer.apply_to_file(f))
+            except relocate_text.BinaryTextReplaceError as e:
+                results.append(str(e))
+        assert results[0] == results[1]
+        assert actual.getvalue() == expected.getvalue()
+
+
+def test_streaming_replacers_do_not_write_without_matches():
+    class ReadOnlyFile(io.BytesIO):
+        def write(self, data):
+            raise AssertionError("should not write")
+
+    data = b"/the/prefi /the/prefi_x " * 1000
+    for replacer in (
+        relocate_text.StreamingTextFilePrefixReplacer({b"/the/prefix": b"/new"}, window_size=64),
+        relocate_text.StreamingBinaryFilePrefixReplacer({b"/the/prefix": b"/new"}, window_size=64),
+    ):
+        assert not replacer.apply_to_file(ReadOnlyFile(data))
@@ -160,6 +160,64 @@ def test_repo_path_handles_package_removal(tmpdir, mock_packages):
         assert r.namespace == "builtin.mock"
 
 
+def test_package_stats_snapshot(tmp_path, monkeypatch):
+    """Tests that the stats of package files are persisted, and reused by later processes
+    until a package is added or removed."""
+    builder = spack.repo.MockRepositoryBuilder(tmp_path / "repo", namespace="snapshot")
+    builder.add_package("pkg-a")
+    builder.add_package("pkg-b")
+    packages_path = os.path.join(builder.root, "packages")
+    cache = spack.util.file_cache.FileCache(str(tmp_path / "cache"))
+
+    monkeypatch.setattr(spack.repo.FastPackageChecker, "_paths_cache", {})
+    checker = spack.repo.FastPackageChecker(packages_path, cache=cache)
+    assert set(checker) == {"pkg-a", "pkg-b"}
+    expected_mtime = checker.last_mtime()
+
+    # A new process reads the snapshot, without listing the packages directory
+    def _fail(*args, **kwargs):
+        raise AssertionError("the packages directory should not be listed")
+
+    monkeypatch.setattr(spack.repo.FastPackageChecker, "_paths_cache", {})
+    with monkeypatch.context() as m:
+        m.setattr(os, "listdir", _fail)
+        checker = spack.repo.FastPackageChecker(packages_path, cache=cache)
+    assert set(checker) == {"pkg-a", "pkg-b"}
+    assert checker.last_mtime() == expected_mtime
+
+    # Adding a package invalidates the snapshot
+    builder.add_package("pkg-c")
+    os.utime(packages_path, ns=(0, os.stat(packages_path).st_mtime_ns + 10**9))
+    monkeypatch.setattr(spack.repo.FastPackageChecker, "_paths_cache", {})
+    checker = spack.repo.FastPackageChecker(packages_path, cache=cache)
+    assert set(checker) == {"pkg-a", "pkg-b", "pkg-c"}
+
+    # So does an update of the git checkout containing the repository
+    git_index = tmp_path / "repo" / ".git" / "index"
+    git_index.parent.mkdir()
+    git_index.write_text("index")
+    packages_mtime = os.stat(packages_path).st_mtime_ns
+    builder.remove("pkg-c")
+    os.utime(packages_path, ns=(0, packages_mtime))
+    monkeypatch.setattr(spack.repo.FastPackageChecker, "_paths_cache", {})
+    checker = spack.repo.FastPackageChecker(packages_path, cache=cache)
+    assert set(checker) == {"pkg-a", "pkg-b"}
+
+
+def test_git_index_path(tmp_path):
+    (tmp_path / "repo" / ".git").mkdir(parents=True)
+    (tmp_path / "repo" / "packages").mkdir()
+    assert spack.repo._git_index_path(str(tmp_path / "repo" / "packages")) == str(
+        tmp_path / "repo" / ".git" / "index"
+    )
+
+    (tmp_path / "worktree" / "packages").mkdir(parents=True)
+    (tmp_path / "worktree" / ".git").write_text("gitdir: ../repo/.git/worktrees/wt\n")
+    assert spack.repo._git_index_path(str(tmp_path / "worktree" / "packages")) == str(
+        tmp_path / "worktree" / "../repo/.git/worktrees/wt" / "index"
+    )
+
+
 def test_repo_dump_virtuals(tmpdir, mutable_mock_repo, mock_packages, ensure_debug, capsys):
     # Start with a package-less virtual
     vspec = spack.spec.Spec("something")
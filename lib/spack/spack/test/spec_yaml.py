@@ -24,6 +24,7 @@
 import spack.paths
 import spack.repo
 import spack.spec
+import spack.util.hash
 import spack.util.spack_json as sjson
 import spack.util.spack_yaml as syaml
 from spack.spec import Spec, save_dependency_specfiles
@@ -501,3 +502,62 @@ def test_pickle_roundtrip_for_abstract_specs(spec_str):
     t = pickle.loads(pickle.dumps(s))
     assert s == t
     assert str(s) == str(t)
+
+
+def _node_dict_hash(spec, hash):
+    """Hash of a node computed from its to_node_dict(), as Spack did before hashing the JSON
+    text of nodes without building the dictionaries of their edges."""
+    json_text = json.dumps(
+        spec.to_node_dict(hash=hash),
+        ensure_ascii=True,
+        indent=None,
+        separators=(",", ":"),
+        sort_keys=False,
+    )
+    out = spack.util.hash.b32_hash(json_text)
+    if spec.build_spec is not spec:
+        return out[:-7] + _node_dict_hash(spec.build_spec, hash)[-7:]
+    return out
+
+
+@pytest.mark.parametrize("hash", [ht.dag_hash, ht.process_hash])
+def test_spec_hash_is_the_hash_of_the_node_dict(hash, default_mock_concretization):
+    abstract = Spec("mpileaks ^callpath cflags==-O3 ^mpich++debug")
+    spliced = default_mock_concretization("splice-t").splice(
+        default_mock_concretization("splice-h+foo"), True
+    )
+    specs = [
+        default_mock_concretization("mpileaks"),
+        default_mock_concretization("patch-several-dependencies"),
+        default_mock_concretization("externaltest"),
+        spliced,
+        abstract,
+        Spec("mpileaks ^[virtuals=mpi] %gcc"),
+    ]
+    for spec in specs:
+        for node in spec.traverse(deptype=hash.depflag):
+            assert node.spec_hash(hash) == _node_dict_hash(node, hash)
+
+
+def test_concrete_specs_read_from_dict_share_attributes(default_mock_concretization):
+    """Tests that the nodes of concrete specs read from specfiles share their immutable
+    attributes with the nodes of other specs, but own the attributes that can be modified."""
+    spec = default_mock_concretization("mpileaks")
+    first = Spec.from_dict(spec.to_dict())
+    second = Spec.from_dict(spec.to_dict())
+    assert first == second and first.dag_hash() == spec.dag_hash()
+
+    for x, y in zip(first.traverse(), second.traverse()):
+        assert x.architecture.target is y.architecture.target
+        assert x.version is y.version
+        assert x.architecture is not y.architecture
+        assert x.compiler is not y.compiler
+        assert x.versions is not y.versions
+
+    # Modifying a spec in place doesn't modify the other specs read from the same data
+    first.architecture.os = "hostos"
+    first.architecture.target = "x86_64_v4"
+    first.compiler.versions.versions.clear()
+    assert second.architecture == spec.architecture
+    assert second.compiler == spec.compiler
+    assert Spec.from_dict(spec.to_dict()).architecture == spec.architecture
@@ -4,6 +4,7 @@
 
 
 import io
+import os
 
 import pytest
 
@@ -176,6 +177,49 @@ def test_elf_get_and_replace_rpaths_and_pt_interp(binary_with_rpaths):
     assert info.value.pt_interp.new_value == b"/very/long/prefix-b/lib/ld.so"
 
 
+@pytest.mark.requires_executables("gcc")
+@skip_unless_linux
+def test_elf_grow_rpaths_and_pt_interp(tmp_path):
+    """Tests that an rpath and an interpreter that don't fit in place are written to a new
+    segment, and that the resulting executable still runs."""
+    gcc = spack.util.executable.which("gcc")
+    source = tmp_path / "main.c"
+    source.write_text('#include <stdio.h>\nint main(){printf("Hello world!");}\n')
+    executable = str(tmp_path / "main.x")
+    gcc("-Wl,-rpath,/short", str(source), "-o", executable)
+
+    # Make the current interpreter available under a longer path
+    interpreter = elf.get_interpreter(executable)
+    long_dir = tmp_path / "very" / "long" / "path" / "to" / "the" / "interpreter"
+    long_dir.mkdir(parents=True)
+    (long_dir / os.path.basename(interpreter)).symlink_to(interpreter)
+
+    replacements = {
+        b"/short": b"/very/long/rpath" * 16,
+        os.path.dirname(interpreter).encode(): str(long_dir).encode(),
+    }
+    assert elf.substitute_rpath_and_pt_interp_or_raise(executable, replacements)
+
+    assert elf.get_rpaths(executable) == ["/very/long/rpath" * 16]
+    assert elf.get_interpreter(executable) == str(long_dir / os.path.basename(interpreter))
+    assert spack.util.executable.Executable(executable)(output=str) == "Hello world!"
+
+
+@pytest.mark.requires_executables("gcc")
+@skip_unless_linux
+def test_elf_grow_is_not_attempted_with_too_much_padding(binary_with_rpaths, monkeypatch):
+    executable = str(binary_with_rpaths(rpaths=["/short"]))
+    with open(executable, "rb") as f:
+        before = f.read()
+
+    monkeypatch.setattr(elf, "MAX_SEGMENT_PADDING", -1)
+    with pytest.raises(elf.ElfCStringUpdatesFailed):
+        elf.substitute_rpath_and_pt_interp_or_raise(executable, {b"/short": b"/much/longer"})
+
+    with open(executable, "rb") as f:
+        assert f.read() == before
+
+
 @pytest.mark.requires_executables("gcc")
 @skip_unless_linux
 def test_drop_redundant_rpath(tmpdir, binary_with_rpaths):
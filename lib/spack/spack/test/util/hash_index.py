@@ -0,0 +1,55 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import pytest
+
+import spack.util.hash_index as hash_index
+
+
+@pytest.fixture()
+def index_path(tmp_path):
+    path = str(tmp_path / "test.hidx")
+    records = [("bbbb", b'{"name":"b"}', 1), ("aaaa", b'{"name":"a"}', 0), ("cccc", b"", 1)]
+    hash_index.write(path, records, {"version": "7"})
+    return path
+
+
+def test_lookup(index_path):
+    with hash_index.HashIndex(index_path) as index:
+        assert len(index) == 3
+        assert index.metadata == {"version": "7"}
+        assert index.get("aaaa") == (b'{"name":"a"}', 0)
+        assert index.get("bbbb") == (b'{"name":"b"}', 1)
+        assert index.get("cccc") == (b"", 1)
+        assert "bbbb" in index
+        assert "abcd" not in index and "aaaaa" not in index
+        assert index.get("dddd") is None
+
+
+def test_keys_are_sorted_and_filtered(index_path):
+    with hash_index.HashIndex(index_path) as index:
+        assert list(index.keys()) == ["aaaa", "bbbb", "cccc"]
+        assert list(index.keys(flags=1)) == ["bbbb", "cccc"]
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "empty.hidx")
+    hash_index.write(path, [])
+    with hash_index.HashIndex(path) as index:
+        assert len(index) == 0
+        assert "aaaa" not in index
+        assert list(index.keys()) == []
+
+
+def test_keys_must_have_the_same_length(tmp_path):
+    with pytest.raises(ValueError):
+        hash_index.write(str(tmp_path / "bad.hidx"), [("a", b"", 0), ("bb", b"", 0)])
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("content", [b"", b"SPACKHIX", b"not a hash index at all, really"])
+def test_invalid_files(tmp_path, content):
+    path = tmp_path / "invalid.hidx"
+    path.write_bytes(content)
+    with pytest.raises(hash_index.HashIndexError):
+        hash_index.HashIndex(str(path))
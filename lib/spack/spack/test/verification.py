@@ -109,6 +109,36 @@ def test_file_manifest_entry(tmpdir):
     assert sorted(results.errors[file]) == sorted(expected)
 
 
+def test_file_manifest_entry_trusting_stat(tmpdir, monkeypatch):
+    file = str(tmpdir.join("file"))
+    with open(file, "w", encoding="utf-8") as f:
+        f.write("This is a file")
+
+    data = spack.verify.create_manifest_entry(file)
+    assert all(x in data for x in ("mtime_ns", "ctime_ns", "ino"))
+
+    # Files whose stat matches the manifest are not hashed
+    def _fail(path):
+        raise AssertionError(f"{path} should not be hashed")
+
+    monkeypatch.setattr(spack.verify, "compute_hash", _fail)
+    assert not spack.verify.check_entry(file, data, trust_stat=True).has_errors()
+    monkeypatch.undo()
+
+    # Changing the content and restoring size and mtime still changes the ctime
+    with open(file, "w", encoding="utf-8") as f:
+        f.write("This is a fake")
+    os.utime(file, ns=(data["mtime_ns"], data["mtime_ns"]))
+    results = spack.verify.check_entry(file, data, trust_stat=True)
+    assert results.errors[file] == ["hash"]
+
+    # Manifests without the stat of files are always hashed
+    for key in ("mtime_ns", "ctime_ns", "ino"):
+        del data[key]
+    results = spack.verify.check_entry(file, data, trust_stat=True)
+    assert results.errors[file] == ["hash"]
+
+
 def test_check_chmod_manifest_entry(tmpdir):
     # Check that the verification properly identifies errors for files whose
     # permissions have been modified.
@@ -184,6 +214,33 @@ def test_check_prefix_manifest(tmpdir):
     assert results.errors[spec.prefix] == ["manifest corrupted"]
 
 
+def test_check_prefix_manifest_in_parallel(tmpdir, monkeypatch):
+    prefix = str(tmpdir.join("prefix"))
+    spec = spack.spec.Spec("libelf")
+    spec._mark_concrete()
+    spec.prefix = prefix
+
+    fs.mkdirp(os.path.join(prefix, ".spack"))
+    for i in range(20):
+        fs.mkdirp(os.path.join(prefix, "lib", str(i)))
+        with open(os.path.join(prefix, "lib", str(i), "file"), "w", encoding="utf-8") as f:
+            f.write(str(i))
+
+    monkeypatch.setattr(spack.verify, "_CHUNK_SIZE", 4)
+    spack.verify.write_manifest(spec, jobs=4)
+    assert not spack.verify.check_spec_manifest(spec, jobs=4).has_errors()
+
+    changed = [os.path.join(prefix, "lib", str(i), "file") for i in (3, 17)]
+    for path in changed:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x")
+
+    serial = spack.verify.check_spec_manifest(spec)
+    parallel = spack.verify.check_spec_manifest(spec, trust_stat=True, jobs=4)
+    assert list(serial.errors) == list(parallel.errors) == changed
+    assert serial.errors == parallel.errors
+
+
 def test_single_file_verification(tmpdir):
     # Test the API to verify a single file, including finding the package
     # to which it belongs
@@ -3,10 +3,13 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 import os
+import shutil
+import threading
 
 import pytest
 
 import spack.concretize
+import spack.filesystem_view
 from spack.directory_layout import DirectoryLayout
 from spack.filesystem_view import SimpleFilesystemView, YamlFilesystemView
 from spack.installer import PackageInstaller
@@ -65,3 +68,162 @@ def pkg_a_add_files_to_view(view, merge_map, skip_if_exists=True):
     view.add_specs(a, b)
     assert os.path.lexists(os.path.join(view_dir, "file"))
     assert os.path.lexists(os.path.join(view_dir, "subdir", "file"))
+
+
+def _fake_installed_spec(name, prefix, files):
+    spec = Spec(name)
+    spec.prefix = str(prefix)
+    spec._mark_concrete()
+    os.makedirs(os.path.join(spec.prefix, ".spack"))
+    for path in files:
+        path = os.path.join(spec.prefix, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(name)
+    return spec
+
+
+def _tree(root):
+    """Return the directories and the symlinks in a view, except for its ownership index"""
+    result = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root)
+        result.update(os.path.join(rel, d) for d in dirnames)
+        result.update(
+            (os.path.join(rel, f), os.readlink(os.path.join(dirpath, f)))
+            for f in filenames
+            if f != "view-index.json"
+        )
+    return result
+
+
+def test_incremental_view_is_the_same_as_from_scratch(mock_packages, tmp_path):
+    a = _fake_installed_spec("pkg-a", tmp_path / "a", ["bin/a", "share/a/data"])
+    b = _fake_installed_spec("pkg-b", tmp_path / "b", ["bin/b", "lib/libb.so"])
+    c = _fake_installed_spec("pkg-c", tmp_path / "c", ["bin/c", "share/c/data"])
+    layout = DirectoryLayout(str(tmp_path / "store"))
+    old_root, new_root, scratch_root = tmp_path / "old", tmp_path / "new", tmp_path / "scratch"
+    for root in (old_root, new_root, scratch_root):
+        root.mkdir()
+
+    SimpleFilesystemView(str(old_root), layout).add_specs(a, b)
+    old_tree = _tree(old_root)
+
+    # Only the files of the removed and added specs change, without touching the old view
+    SimpleFilesystemView(str(new_root), layout).add_specs_incrementally(str(old_root), b, c)
+    SimpleFilesystemView(str(scratch_root), layout).add_specs(b, c)
+    assert _tree(new_root) == _tree(scratch_root)
+    assert _tree(old_root) == old_tree
+    assert not (new_root / "share" / "a").exists()
+    assert os.lstat(old_root / "bin" / "b").st_ino == os.lstat(new_root / "bin" / "b").st_ino
+
+
+def test_incremental_view_relinks_reinstalled_specs(mock_packages, tmp_path):
+    a = _fake_installed_spec("pkg-a", tmp_path / "a", ["bin/a"])
+    b = _fake_installed_spec("pkg-b", tmp_path / "b", ["bin/b"])
+    layout = DirectoryLayout(str(tmp_path / "store"))
+    old_root, new_root = tmp_path / "old", tmp_path / "new"
+    old_root.mkdir()
+    new_root.mkdir()
+    SimpleFilesystemView(str(old_root), layout, link_type="hardlink").add_specs(a, b)
+
+    # Install pkg-b again at the same prefix, as with "spack install --overwrite"
+    os.rename(b.prefix, tmp_path / "backup")
+    _fake_installed_spec("pkg-b", tmp_path / "b", ["bin/b", "bin/b-tool"])
+    shutil.rmtree(tmp_path / "backup")
+
+    view = SimpleFilesystemView(str(new_root), layout, link_type="hardlink")
+    view.add_specs_incrementally(str(old_root), a, b)
+    for name in ("a", "b", "b-tool"):
+        prefix = a.prefix if name == "a" else b.prefix
+        view_file, installed_file = new_root / "bin" / name, os.path.join(prefix, "bin", name)
+        assert os.stat(view_file).st_ino == os.stat(installed_file).st_ino
+
+
+def test_incremental_view_falls_back_on_shared_files(mock_packages, tmp_path):
+    a = _fake_installed_spec("pkg-a", tmp_path / "a", ["bin/tool", "bin/a"])
+    b = _fake_installed_spec("pkg-b", tmp_path / "b", ["bin/tool"])
+    layout = DirectoryLayout(str(tmp_path / "store"))
+    old_root, new_root = tmp_path / "old", tmp_path / "new"
+    old_root.mkdir()
+    new_root.mkdir()
+
+    SimpleFilesystemView(str(old_root), layout, ignore_conflicts=True).add_specs(a, b)
+    assert os.readlink(old_root / "bin" / "tool") == os.path.join(a.prefix, "bin", "tool")
+
+    # Removing the spec that owns a shared file links the other one from scratch
+    view = SimpleFilesystemView(str(new_root), layout, ignore_conflicts=True)
+    view.add_specs_incrementally(str(old_root), b)
+    assert os.readlink(new_root / "bin" / "tool") == os.path.join(b.prefix, "bin", "tool")
+    assert not (new_root / "bin" / "a").exists()
+
+
+def test_incremental_copy_view_is_relocated_to_its_root(mock_packages, tmp_path):
+    a = _fake_installed_spec("pkg-a", tmp_path / "a", ["bin/a"])
+    b = _fake_installed_spec("pkg-b", tmp_path / "b", ["bin/real"])
+    with open(os.path.join(b.prefix, "bin", "b"), "w", encoding="utf-8") as f:
+        f.write(f"exec {b.prefix}/bin/real\n")
+    layout = DirectoryLayout(str(tmp_path / "store"))
+    old_root, new_root = tmp_path / "old", tmp_path / "new"
+    old_root.mkdir()
+    new_root.mkdir()
+
+    SimpleFilesystemView(str(old_root), layout, link_type="copy").add_specs(a, b)
+    assert (old_root / "bin" / "b").read_text() == f"exec {old_root}/bin/real\n"
+
+    view = SimpleFilesystemView(str(new_root), layout, link_type="copy")
+    view.add_specs_incrementally(str(old_root), b)
+    assert (new_root / "bin" / "b").read_text() == f"exec {new_root}/bin/real\n"
+    assert not (new_root / "bin" / "a").exists()
+
+
+def test_incremental_view_patches_shebangs_of_kept_extensions(config, mock_packages, tmp_path):
+    extension = spack.concretize.concretize_one("py-extension1")
+    for node in extension.traverse():
+        node.prefix = str(tmp_path / node.name)
+        os.makedirs(os.path.join(node.prefix, ".spack"))
+    python, *_ = extension.dependencies("python-venv") or extension.dependencies("python")
+    os.makedirs(os.path.join(extension.prefix, "bin"))
+    tool = os.path.join(extension.prefix, "bin", "tool")
+    with open(tool, "w", encoding="utf-8") as f:
+        f.write(f"#!{python.prefix}/bin/python\n")
+    os.chmod(tool, 0o755)
+    specs = list(extension.traverse())
+    layout = DirectoryLayout(str(tmp_path / "store"))
+    old_root, new_root = tmp_path / "old", tmp_path / "new"
+    old_root.mkdir()
+    new_root.mkdir()
+
+    SimpleFilesystemView(str(old_root), layout).add_specs(*specs)
+    assert (old_root / "bin" / "tool").read_text() == f"#!{old_root}/bin/python\n"
+
+    # The shebang of the kept extension must point to the new view, not to the old one
+    SimpleFilesystemView(str(new_root), layout).add_specs_incrementally(str(old_root), *specs)
+    assert (new_root / "bin" / "tool").read_text() == f"#!{new_root}/bin/python\n"
+
+
+def test_concurrent_linking_is_the_same_as_serial(mock_packages, tmp_path, monkeypatch):
+    specs = [
+        _fake_installed_spec(name, tmp_path / name, [f"lib/{d}/{name}{i}" for i in range(50)])
+        for name, d in (("pkg-a", "x"), ("pkg-b", "x/y"), ("pkg-c", "z"))
+    ]
+    layout = DirectoryLayout(str(tmp_path / "store"))
+    serial, concurrent = tmp_path / "serial", tmp_path / "concurrent"
+    serial.mkdir()
+    concurrent.mkdir()
+
+    SimpleFilesystemView(str(serial), layout).add_specs(*specs)
+
+    monkeypatch.setattr(spack.filesystem_view, "_LINK_CHUNK_SIZE", 8)
+    view = SimpleFilesystemView(str(concurrent), layout, link_jobs=4)
+    threads = set()
+    link = view._link
+
+    def _link(*args):
+        threads.add(threading.current_thread().name)
+        link(*args)
+
+    view._link = _link
+    view.add_specs(*specs)
+    assert _tree(serial) == _tree(concurrent)
+    assert all(name.startswith("spack-view") for name in threads)
@@ -1,13 +1,24 @@
 # Copyright Spack Project Developers. See COPYRIGHT file for details.
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import contextlib
+import hashlib
+import json
 import os
+import pickle
 import re
 import sys
+import time
 
+import llnl.util.tty as tty
+from llnl.util.filesystem import mkdirp
+
+import spack
 import spack.build_environment
+import spack.caches
 import spack.config
 import spack.spec
+import spack.store
 import spack.util.environment as environment
 from spack import traverse
 from spack.context import Context
@@ -15,6 +26,9 @@
 #: Environment variable name Spack uses to track individually loaded packages
 spack_loaded_hashes_var = "SPACK_LOADED_HASHES"
 
+#: Directory of the misc cache where environment modifications are cached
+_CACHE_DIR = "environment-modifications"
+
 
 def prefix_inspections(platform):
     """Get list of prefix inspections for platform
@@ -116,3 +130,96 @@ def environment_modifications_for_specs(
         project_env_mods(*topo_ordered, view=view, env=env)
 
     return env
+
+
+class CacheStats:
+    """Statistics of the cache of environment modifications in the current process."""
+
+    __slots__ = ("hits", "misses", "invalidated", "seconds")
+
+    def __init__(self):
+        #: Number of lookups answered by the cache
+        self.hits = 0
+        #: Number of lookups of sets of specs that were not cached
+        self.misses = 0
+        #: Number of lookups whose cached entry was out of date
+        self.invalidated = 0
+        #: Time spent computing or reading environment modifications, in seconds
+        self.seconds = 0.0
+
+
+#: Statistics of the cache of environment modifications
+CACHE_STATS = CacheStats()
+
+
+def cache_directory() -> str:
+    """Return the directory where environment modifications are cached."""
+    return spack.caches.MISC_CACHE.cache_path(_CACHE_DIR)
+
+
+def _cache_path(*specs: spack.spec.Spec, view=None) -> str:
+    """Return the path of the cache entry for the environment modifications of specs, which
+    depend on the specs, the view, and the configuration of prefix inspections."""
+    key = {
+        "spack": spack.spack_version,
+        "hashes": [s.dag_hash() for s in specs],
+        "view": view.root if view else None,
+        "inspections": {s.platform: prefix_inspections(s.platform) for s in specs},
+    }
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+    return os.path.join(cache_directory(), f"{digest}.pickle")
+
+
+def _cache_generation(view=None):
+    """Return the state the cached environment modifications are valid for. It changes when the
+    store database is written, or when the view is regenerated."""
+    view_generation = os.path.realpath(view.root) if view else None
+    return spack.store.STORE.db.generation(), view_generation
+
+
+def cached_environment_modifications_for_specs(
+    *specs: spack.spec.Spec, view=None
+) -> environment.EnvironmentModifications:
+    """Same as ``environment_modifications_for_specs``, but reuse the environment modifications
+    computed by previous calls with the same specs and view, when the
+    ``config:environment_modifications_cache`` option is set. Cached modifications are
+    recomputed after the store database is written, or the view is regenerated.
+
+    Changes to the ``package.py`` files of installed specs are not detected.
+    """
+    if not spack.config.get("config:environment_modifications_cache", False):
+        return environment_modifications_for_specs(*specs, view=view)
+
+    start = time.perf_counter()
+    path = _cache_path(*specs, view=view)
+    generation = _cache_generation(view)
+
+    try:
+        with open(path, "rb") as f:
+            cached_generation, env = pickle.load(f)
+        if cached_generation == generation:
+            CACHE_STATS.hits += 1
+            CACHE_STATS.seconds += time.perf_counter() - start
+            return env
+        CACHE_STATS.invalidated += 1
+    except FileNotFoundError:
+        CACHE_STATS.misses += 1
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError) as e:
+        tty.debug(f"Ignoring cached environment modifications in {path}: {e}")
+        CACHE_STATS.misses += 1
+
+    env = environment_modifications_for_specs(*specs, view=view)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        mkdirp(os.path.dirname(path))
+        with open(tmp, "wb") as f:
+            pickle.dump((generation, env), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError) as e:
+        tty.debug(f"Cannot cache environment modifications in {path}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+    CACHE_STATS.seconds += time.perf_counter() - start
+    return env
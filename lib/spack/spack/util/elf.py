@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 import bisect
+import io
 import re
 import struct
 from struct import calcsize, unpack, unpack_from
@@ -71,12 +72,16 @@ class ELF_CONSTANTS:
     PT_LOAD = 1
     PT_DYNAMIC = 2
     PT_INTERP = 3
+    PT_PHDR = 6
+    PF_R = 4
     DT_NULL = 0
     DT_NEEDED = 1
     DT_STRTAB = 5
+    DT_STRSZ = 10
     DT_SONAME = 14
     DT_RPATH = 15
     DT_RUNPATH = 29
+    SHT_PROGBITS = 1
     SHT_STRTAB = 3
 
 
@@ -636,13 +641,185 @@ def _get_pt_interp_substitution(
     )
 
 
-def substitute_rpath_and_pt_interp_in_place_or_raise(
-    path: str, substitutions: Dict[bytes, bytes]
+#: Alignment of the segment appended to ELF files for C-strings that do not fit in place. This is
+#: the largest page size in common use, so the segment never shares a page with existing ones.
+SEGMENT_ALIGNMENT = 0x10000
+
+#: Maximum number of zero bytes an ELF file is padded with, so that the appended segment can be
+#: mapped after the existing ones. Files that need more padding are left to other tools.
+MAX_SEGMENT_PADDING = 0x400000
+
+
+def _round_up(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _unpack_program_header(elf: ElfFile, data: bytes, offset: int) -> ProgramHeader64:
+    """Unpack a program header, using the 64-bit field order also for 32-bit ELF files."""
+    if elf.is_64_bit:
+        return ProgramHeader64(*unpack_from(elf.byte_order + "LLQQQQQQ", data, offset))
+    ph = ProgramHeader32(*unpack_from(elf.byte_order + "LLLLLLLL", data, offset))
+    return ProgramHeader64(**ph._asdict())
+
+
+def _pack_program_header(elf: ElfFile, ph: ProgramHeader64) -> bytes:
+    if elf.is_64_bit:
+        return struct.pack(elf.byte_order + "LLQQQQQQ", *ph)
+    return struct.pack(elf.byte_order + "LLLLLLLL", *ProgramHeader32(**ph._asdict()))
+
+
+def _append_c_strings_segment(
+    f: BinaryIO,
+    elf: ElfFile,
+    rpath: Optional[UpdateCStringAction],
+    pt_interp: Optional[UpdateCStringAction],
+) -> bool:
+    """Write the rpath and interpreter that do not fit in place to a new PT_LOAD segment at the
+    end of the file, and point the dynamic section and the program headers to them.
+
+    The new segment starts with a copy of the program header table, with an extra entry for the
+    segment itself. The copy has to be mapped, since the dynamic linker reads it from memory. It
+    is followed by a copy of the dynamic string table with the new rpath appended, so that all
+    the other offsets into the table remain valid, and by the new interpreter.
+
+    Returns False without modifying the file if its layout is not supported."""
+    hdr = elf.elf_hdr
+    ph_size = calcsize(elf.byte_order + ("LLQQQQQQ" if elf.is_64_bit else "LLLLLLLL"))
+    sh_fmt = elf.byte_order + ("LLQQQQLLQQ" if elf.is_64_bit else "LLLLLLLLLL")
+    sh_size = calcsize(sh_fmt)
+    dynamic_array_fmt = elf.byte_order + ("qQ" if elf.is_64_bit else "lL")
+    dynamic_array_size = calcsize(dynamic_array_fmt)
+
+    if hdr.e_phentsize != ph_size or hdr.e_shentsize != sh_size or hdr.e_phnum >= 0xFFFF:
+        return False
+
+    f.seek(hdr.e_phoff)
+    data = read_exactly(f, hdr.e_phnum * ph_size, "Malformed program header")
+    phdrs = [_unpack_program_header(elf, data, i * ph_size) for i in range(hdr.e_phnum)]
+    loads = [i for i, ph in enumerate(phdrs) if ph.p_type == ELF_CONSTANTS.PT_LOAD]
+    if not loads:
+        return False
+
+    # The kernel locates the program header table in memory relative to the first PT_LOAD
+    # segment, so the new segment must be mapped at the same distance from its file offset.
+    first_load = phdrs[loads[0]]
+    base = first_load.p_vaddr - first_load.p_offset
+    end = max(phdrs[i].p_vaddr + phdrs[i].p_memsz for i in loads)
+    file_size = f.seek(0, io.SEEK_END)
+    offset = max(_round_up(file_size, SEGMENT_ALIGNMENT), _round_up(end, SEGMENT_ALIGNMENT) - base)
+    if offset - file_size > MAX_SEGMENT_PADDING:
+        return False
+
+    phnum = hdr.e_phnum + 1
+    contents = bytearray(phnum * ph_size)
+    dynamic_updates: Dict[int, int] = {}
+    section_updates: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    interp_ph: Optional[Tuple[int, int]] = None
+
+    if rpath and not rpath.inplace:
+        strtab = retrieve_strtab(f, elf, elf.pt_dynamic_strtab_offset)
+        strtab_offset = offset + len(contents)
+        contents += strtab + rpath.new_value + b"\0"
+        rpath_tag = ELF_CONSTANTS.DT_RUNPATH if elf.is_runpath else ELF_CONSTANTS.DT_RPATH
+        dynamic_updates[ELF_CONSTANTS.DT_STRTAB] = base + strtab_offset
+        dynamic_updates[ELF_CONSTANTS.DT_STRSZ] = len(strtab) + len(rpath.new_value) + 1
+        dynamic_updates[rpath_tag] = len(strtab)
+        section_updates[(ELF_CONSTANTS.SHT_STRTAB, elf.pt_dynamic_strtab_offset)] = (
+            strtab_offset,
+            dynamic_updates[ELF_CONSTANTS.DT_STRSZ],
+        )
+
+    if pt_interp and not pt_interp.inplace:
+        interp_offset = offset + len(contents)
+        contents += pt_interp.new_value + b"\0"
+        interp_ph = (interp_offset, len(pt_interp.new_value) + 1)
+        section_updates[(ELF_CONSTANTS.SHT_PROGBITS, elf.pt_interp_p_offset)] = interp_ph
+
+    # Locate the section headers to update, which other tools (and this module) rely on.
+    f.seek(hdr.e_shoff)
+    sh_data = read_exactly(f, hdr.e_shnum * sh_size, "Malformed section header")
+    section_writes = []
+    for i in range(hdr.e_shnum):
+        sh = SectionHeader(*unpack_from(sh_fmt, sh_data, i * sh_size))
+        update = section_updates.pop((sh.sh_type, sh.sh_offset), None)
+        if update is not None:
+            new_offset, new_size = update
+            new_sh = sh._replace(sh_offset=new_offset, sh_addr=base + new_offset, sh_size=new_size)
+            section_writes.append((hdr.e_shoff + i * sh_size, struct.pack(sh_fmt, *new_sh)))
+
+    if section_updates:
+        return False
+
+    # Locate the dynamic array entries to update.
+    dynamic_writes = []
+    f.seek(elf.pt_dynamic_p_offset)
+    for i in range(elf.pt_dynamic_p_filesz // dynamic_array_size):
+        data = read_exactly(f, dynamic_array_size, "Malformed dynamic array entry")
+        tag, _ = unpack(dynamic_array_fmt, data)
+        if tag == ELF_CONSTANTS.DT_NULL:
+            break
+        if tag in dynamic_updates:
+            dynamic_writes.append(
+                (
+                    elf.pt_dynamic_p_offset + i * dynamic_array_size,
+                    struct.pack(dynamic_array_fmt, tag, dynamic_updates[tag]),
+                )
+            )
+
+    # Program headers pointing to the moved data, followed by the new PT_LOAD segment.
+    new_phdrs = []
+    for ph in phdrs:
+        if ph.p_type == ELF_CONSTANTS.PT_PHDR:
+            ph = ph._replace(
+                p_offset=offset,
+                p_vaddr=base + offset,
+                p_paddr=base + offset,
+                p_filesz=phnum * ph_size,
+                p_memsz=phnum * ph_size,
+            )
+        elif ph.p_type == ELF_CONSTANTS.PT_INTERP and interp_ph:
+            ph = ph._replace(
+                p_offset=interp_ph[0],
+                p_vaddr=base + interp_ph[0],
+                p_paddr=base + interp_ph[0],
+                p_filesz=interp_ph[1],
+                p_memsz=interp_ph[1],
+            )
+        new_phdrs.append(ph)
+
+    new_phdrs.insert(
+        loads[-1] + 1,
+        ProgramHeader64(
+            p_type=ELF_CONSTANTS.PT_LOAD,
+            p_flags=ELF_CONSTANTS.PF_R,
+            p_offset=offset,
+            p_vaddr=base + offset,
+            p_paddr=base + offset,
+            p_filesz=len(contents),
+            p_memsz=len(contents),
+            p_align=max(first_load.p_align, 1),
+        ),
+    )
+    contents[: phnum * ph_size] = b"".join(_pack_program_header(elf, ph) for ph in new_phdrs)
+
+    # Only now modify the file: append the segment, then update the existing structures.
+    f.truncate(offset)
+    f.seek(offset)
+    f.write(contents)
+
+    for write_offset, data in section_writes + dynamic_writes:
+        f.seek(write_offset)
+        f.write(data)
+
+    f.seek(16)
+    elf_header_fmt = elf.byte_order + ("HHLQQQLHHHHHH" if elf.is_64_bit else "HHLLLLLHHHHHH")
+    f.write(struct.pack(elf_header_fmt, *hdr._replace(e_phoff=offset, e_phnum=phnum)))
+    return True
+
+
+def _substitute_rpath_and_pt_interp(
+    path: str, substitutions: Dict[bytes, bytes], grow: bool
 ) -> bool:
-    """Returns true if the rpath and interpreter were modified, false if there was nothing to do.
-    Raises ElfCStringUpdatesFailed if the ELF file cannot be updated in-place. This exception
-    contains a list of actions to perform with other tools. The file is left untouched in this
-    case."""
     regex = re.compile(b"|".join(re.escape(p) for p in substitutions.keys()))
 
     try:
@@ -657,15 +834,21 @@ def substitute_rpath_and_pt_interp_in_place_or_raise(
             if not rpath and not pt_interp:
                 return False
 
-            # If we can't update in-place, leave it to other tools, don't do partial updates.
+            # If we can't update in-place, either append a segment for the strings that grow,
+            # or leave it to other tools. Don't do partial updates.
             if rpath and not rpath.inplace or pt_interp and not pt_interp.inplace:
-                raise ElfCStringUpdatesFailed(rpath, pt_interp)
+                try:
+                    grown = grow and _append_c_strings_segment(f, elf, rpath, pt_interp)
+                except ElfParsingError:
+                    grown = False
+                if not grown:
+                    raise ElfCStringUpdatesFailed(rpath, pt_interp)
 
             # Otherwise, apply the updates.
-            if rpath:
+            if rpath and rpath.inplace:
                 rpath.apply(f)
 
-            if pt_interp:
+            if pt_interp and pt_interp.inplace:
                 pt_interp.apply(f)
 
             return True
@@ -676,6 +859,24 @@ def substitute_rpath_and_pt_interp_in_place_or_raise(
         return False
 
 
+def substitute_rpath_and_pt_interp_in_place_or_raise(
+    path: str, substitutions: Dict[bytes, bytes]
+) -> bool:
+    """Returns true if the rpath and interpreter were modified, false if there was nothing to do.
+    Raises ElfCStringUpdatesFailed if the ELF file cannot be updated in-place. This exception
+    contains a list of actions to perform with other tools. The file is left untouched in this
+    case."""
+    return _substitute_rpath_and_pt_interp(path, substitutions, grow=False)
+
+
+def substitute_rpath_and_pt_interp_or_raise(path: str, substitutions: Dict[bytes, bytes]) -> bool:
+    """Like ``substitute_rpath_and_pt_interp_in_place_or_raise``, but an rpath or interpreter that
+    is longer than the current one is written to a new segment appended to the file. Raises
+    ElfCStringUpdatesFailed only if the layout of the file is not supported, for example because
+    it would need too much padding; the file is left untouched in this case."""
+    return _substitute_rpath_and_pt_interp(path, substitutions, grow=True)
+
+
 def pt_interp(path: str) -> Optional[str]:
     """Retrieve the interpreter of an executable at `path`."""
     try:
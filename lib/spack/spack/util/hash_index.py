@@ -0,0 +1,167 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Read-only, memory-mapped files mapping fixed-size keys (e.g. DAG hashes) to opaque records.
+
+The layout of a file is:
+
+1. A header with a magic string, the format version, the size of keys, the number of records
+   and the location of a JSON metadata blob.
+2. A table of ``(key, offset, length, flags)`` entries, sorted by key.
+3. The metadata blob, followed by the records.
+
+Lookups bisect the table directly in the mapped memory, so opening a file and retrieving a few
+records takes time proportional to the size of those records, not to the size of the file.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from llnl.util.filesystem import rename
+
+from spack.error import SpackError
+
+#: Magic string at the beginning of every file
+MAGIC = b"SPACKHIX"
+
+#: Version of the file layout
+FORMAT_VERSION = 1
+
+#: magic, format version, key size, number of records, metadata offset and metadata length
+_HEADER = struct.Struct("<8sHHIQI")
+
+#: offset, length and flags of a record, following its key in the table
+_ENTRY = struct.Struct("<QIB")
+
+
+class HashIndexError(SpackError):
+    """Raised when a hash index file cannot be read."""
+
+
+def write(
+    path: str, records: Iterable[Tuple[str, bytes, int]], metadata: Optional[Dict] = None
+) -> None:
+    """Atomically write a hash index file.
+
+    Args:
+        path: path of the file to be written
+        records: tuples of ``(key, data, flags)``, where all the keys have the same length and
+            flags fit in a byte
+        metadata: JSON serializable data to be stored along with the records
+    """
+    entries = sorted((key.encode("ascii"), data, flags) for key, data, flags in records)
+    key_size = len(entries[0][0]) if entries else 0
+    if any(len(key) != key_size for key, _, _ in entries):
+        raise ValueError("all the keys in a hash index must have the same length")
+
+    meta = json.dumps(metadata or {}, separators=(",", ":")).encode("utf-8")
+    meta_offset = _HEADER.size + len(entries) * (key_size + _ENTRY.size)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(
+                _HEADER.pack(MAGIC, FORMAT_VERSION, key_size, len(entries), meta_offset, len(meta))
+            )
+            offset = meta_offset + len(meta)
+            for key, data, flags in entries:
+                f.write(key)
+                f.write(_ENTRY.pack(offset, len(data), flags))
+                offset += len(data)
+            f.write(meta)
+            for _, data, _ in entries:
+                f.write(data)
+        rename(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class HashIndex:
+    """A hash index file, mapped in memory for reading."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise HashIndexError(f"cannot map hash index '{path}'", str(e)) from e
+
+        try:
+            magic, version, self._key_size, self._count, meta_offset, meta_length = (
+                _HEADER.unpack_from(self._mmap, 0)
+            )
+        except struct.error as e:
+            self.close()
+            raise HashIndexError(f"hash index '{path}' is truncated") from e
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise HashIndexError(f"'{path}' is not a hash index in a supported format")
+
+        self._entry_size = self._key_size + _ENTRY.size
+        if meta_offset + meta_length > len(self._mmap) or meta_offset != (
+            _HEADER.size + self._count * self._entry_size
+        ):
+            self.close()
+            raise HashIndexError(f"hash index '{path}' is truncated")
+
+        self.metadata: Dict[str, Any] = json.loads(
+            self._mmap[meta_offset : meta_offset + meta_length]
+        )
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "HashIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key(self, i: int) -> bytes:
+        start = _HEADER.size + i * self._entry_size
+        return self._mmap[start : start + self._key_size]
+
+    def _entry(self, i: int) -> Tuple[int, int, int]:
+        return _ENTRY.unpack_from(self._mmap, _HEADER.size + i * self._entry_size + self._key_size)
+
+    def _find(self, key: str) -> int:
+        """Return the position of a key in the table, or -1 if it is not there."""
+        needle = key.encode("ascii")
+        if len(needle) != self._key_size:
+            return -1
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < needle:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._count and self._key(lo) == needle else -1
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) >= 0
+
+    def get(self, key: str) -> Optional[Tuple[bytes, int]]:
+        """Return the data and flags stored for a key, or None if the key is not there."""
+        i = self._find(key)
+        if i < 0:
+            return None
+        offset, length, flags = self._entry(i)
+        return self._mmap[offset : offset + length], flags
+
+    def keys(self, flags: int = 0) -> Iterator[str]:
+        """Iterate over the keys in sorted order. If ``flags`` is not zero, only keys of records
+        that have all those flags set are returned."""
+        for i in range(self._count):
+            if flags and self._entry(i)[2] & flags != flags:
+                continue
+            yield self._key(i).decode("ascii")
@@ -293,6 +293,14 @@ class AbstractVariant:
     values.
     """
 
+    __slots__ = (
+        "name",
+        "propagate",
+        "_value",
+        "_original_value",
+        "_patches_in_order_of_appearance",
+    )
+
     name: str
     propagate: bool
     _value: ValueType
@@ -471,6 +479,8 @@ def __str__(self) -> str:
 class MultiValuedVariant(AbstractVariant):
     """A variant that can hold multiple values at once."""
 
+    __slots__ = ()
+
     @implicit_variant_conversion
     def satisfies(self, other: AbstractVariant) -> bool:
         """Returns true if ``other.name == self.name`` and ``other.value`` is
@@ -519,6 +529,8 @@ def __str__(self) -> str:
 class SingleValuedVariant(AbstractVariant):
     """A variant that can hold multiple values, but one at a time."""
 
+    __slots__ = ()
+
     def _value_setter(self, value: ValueType) -> None:
         # Treat the value as a multi-valued variant
         super()._value_setter(value)
@@ -579,6 +591,8 @@ class BoolValuedVariant(SingleValuedVariant):
     BoolValuedVariant can also hold the value '*', for coerced
     comparisons between ``foo=*`` and ``+foo`` or ``~foo``."""
 
+    __slots__ = ()
+
     def _value_setter(self, value: ValueType) -> None:
         # Check the string representation of the value and turn
         # it to a boolean
@@ -2,32 +2,56 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 import base64
+import concurrent.futures
 import hashlib
 import os
 import stat
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import llnl.util.tty as tty
 from llnl.util.symlink import readlink
 
+import spack.config
 import spack.store
 import spack.util.file_permissions as fp
 import spack.util.spack_json as sjson
 from spack.package_base import spack_times_log
 
+#: Number of manifest entries created or checked by a single task of a thread pool
+_CHUNK_SIZE = 256
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def compute_hash(path: str, block_size: int = 1048576) -> str:
     # why is this not using spack.util.crypto.checksum...
     hasher = hashlib.sha1()
-    with open(path, "rb") as file:
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as file:
         while True:
-            data = file.read(block_size)
-            if not data:
+            size = file.readinto(buffer)
+            if not size:
                 break
-            hasher.update(data)
+            hasher.update(view[:size])
     return base64.b32encode(hasher.digest()).decode()
 
 
+def _map_in_chunks(f: Callable[[T], R], items: List[T], jobs: int) -> List[R]:
+    """Apply f to all items, with up to jobs threads working on chunks of items. Hashing and
+    reading files release the GIL, so threads are enough to keep a filesystem busy."""
+    if jobs <= 1 or len(items) <= _CHUNK_SIZE:
+        return [f(x) for x in items]
+
+    chunks = [items[i : i + _CHUNK_SIZE] for i in range(0, len(items), _CHUNK_SIZE)]
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="spack-verify"
+    ) as executor:
+        results = executor.map(lambda chunk: [f(x) for x in chunk], chunks)
+        return [r for chunk in results for r in chunk]
+
+
 def create_manifest_entry(path: str) -> Dict[str, Any]:
     try:
         s = os.lstat(path)
@@ -43,11 +67,15 @@ def create_manifest_entry(path: str) -> Dict[str, Any]:
         data["hash"] = compute_hash(path)
         data["time"] = s.st_mtime
         data["size"] = s.st_size
+        # Used to skip hashing files that did not change, see check_entry
+        data["mtime_ns"] = s.st_mtime_ns
+        data["ctime_ns"] = s.st_ctime_ns
+        data["ino"] = s.st_ino
 
     return data
 
 
-def write_manifest(spec):
+def write_manifest(spec, jobs: Optional[int] = None):
     manifest_file = os.path.join(
         spec.prefix,
         spack.store.STORE.layout.metadata_dir,
@@ -57,12 +85,16 @@ def write_manifest(spec):
     if not os.path.exists(manifest_file):
         tty.debug("Writing manifest file: No manifest from binary")
 
-        manifest = {}
+        paths = []
         for root, dirs, files in os.walk(spec.prefix):
             for entry in list(dirs + files):
-                path = os.path.join(root, entry)
-                manifest[path] = create_manifest_entry(path)
-        manifest[spec.prefix] = create_manifest_entry(spec.prefix)
+                paths.append(os.path.join(root, entry))
+        paths.append(spec.prefix)
+
+        if jobs is None:
+            jobs = spack.config.determine_number_of_jobs(parallel=True)
+        entries = _map_in_chunks(create_manifest_entry, paths, jobs)
+        manifest = dict(zip(paths, entries))
 
         with open(manifest_file, "w", encoding="utf-8") as f:
             sjson.dump(manifest, f)
@@ -70,7 +102,30 @@ def write_manifest(spec):
         fp.set_permissions_by_spec(manifest_file, spec)
 
 
-def check_entry(path, data):
+def _stat_matches(s: os.stat_result, data: Dict[str, Any]) -> bool:
+    """Whether the stat of a regular file matches the one recorded in its manifest entry. If so,
+    the file is assumed not to have changed since the manifest was written."""
+    try:
+        return (
+            s.st_size == data["size"]
+            and s.st_mtime_ns == data["mtime_ns"]
+            and s.st_ctime_ns == data["ctime_ns"]
+            and s.st_ino == data["ino"]
+        )
+    except KeyError:
+        # Manifests written by older versions of Spack
+        return False
+
+
+def check_entry(path, data, *, trust_stat: bool = False):
+    """Check a file against its manifest entry.
+
+    Args:
+        path: path of the file
+        data: manifest entry of the file
+        trust_stat: if True, don't hash regular files whose size, mtime, ctime and inode match
+            the manifest entry
+    """
     res = VerificationResults()
 
     if not data:
@@ -98,7 +153,7 @@ def check_entry(path, data):
             res.add_error(path, "size")
         if s.st_mtime != data["time"]:
             res.add_error(path, "mtime")
-        if compute_hash(path) != data.get("hash"):
+        if not (trust_stat and _stat_matches(s, data)) and compute_hash(path) != data.get("hash"):
             res.add_error(path, "hash")
 
     return res
@@ -136,7 +191,15 @@ def check_file_manifest(filename):
     return results
 
 
-def check_spec_manifest(spec):
+def check_spec_manifest(spec, *, trust_stat: bool = False, jobs: int = 1):
+    """Check all the files in the prefix of a spec against its manifest.
+
+    Args:
+        spec: spec to be checked
+        trust_stat: if True, don't hash regular files whose size, mtime, ctime and inode match
+            the manifest
+        jobs: number of threads checking files
+    """
     prefix = spec.prefix
 
     results = VerificationResults()
@@ -155,6 +218,7 @@ def check_spec_manifest(spec):
         results.add_error(prefix, "manifest corrupted")
         return results
 
+    entries: List[Tuple[str, Dict[str, Any]]] = []
     for root, dirs, files in os.walk(prefix):
         for entry in list(dirs + files):
             path = os.path.join(root, entry)
@@ -167,10 +231,15 @@ def check_spec_manifest(spec):
             if entry == spack_times_log:
                 continue
 
-            data = manifest.pop(path, {})
-            results += check_entry(path, data)
+            entries.append((path, manifest.pop(path, {})))
+
+    entries.append((prefix, manifest.pop(prefix, {})))
+
+    def _check(entry):
+        return check_entry(*entry, trust_stat=trust_stat)
 
-    results += check_entry(prefix, manifest.pop(prefix, {}))
+    for entry_results in _map_in_chunks(_check, entries, jobs):
+        results += entry_results
 
     for path in manifest:
         results.add_error(path, "deleted")
@@ -126,8 +126,7 @@ def lookup_ref(self, ref) -> Tuple[Optional[str], int]:
         known version prior to the commit, as well as the distance from that version
         to the commit in the git repo. Those values are used to compare Version objects.
         """
-        pathlib_dest = Path(spack.paths.user_repos_cache_path) / self.repository_uri
-        dest = str(pathlib_dest)
+        dest = spack.fetch_strategy.git_repository_cache_path(self.pkg.git)
 
         # prepare a cache for the repository
         dest_parent = os.path.dirname(dest)
@@ -1,7 +1,12 @@
 # Copyright Spack Project Developers. See COPYRIGHT file for details.
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import array
+import json
 import os
+import signal
+import socket
+import struct
 import sys
 from os.path import dirname as dn
 
@@ -16,11 +21,103 @@ def get_spack_sys_paths(spack_prefix):
     return [external_libs, vendored_libs, spack_libs]
 
 
+#: Options of spack that take a value, which may be the next argument
+_LONG_OPTIONS_WITH_VALUE = (
+    "--color",
+    "--config",
+    "--config-scope",
+    "--env",
+    "--env-dir",
+    "--sorted-profile",
+    "--lines",
+    "--print-shell-vars",
+)
+_SHORT_OPTIONS_WITH_VALUE = "cCeD"
+
+
+def command_name(argv):
+    """Return the name of the command in the arguments of spack, or None if there is none.
+    This does not import Spack, so it only knows about the options of spack that take a value.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg in _LONG_OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif arg.startswith("-") and not arg.startswith("--"):
+            # Short options may be grouped, and the value of the last one may follow
+            for i, flag in enumerate(arg[1:], 1):
+                if flag in _SHORT_OPTIONS_WITH_VALUE:
+                    if i == len(arg) - 1:
+                        next(args, None)
+                    break
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def forward_to_daemon(socket_path, spack_prefix, argv):
+    """Run a command in the Spack daemon listening on socket_path, see ``spack.daemon``.
+
+    Return the exit code of the command, or None if the command must run in this process.
+    """
+    if not hasattr(socket, "AF_UNIX") or command_name(argv) == "daemon":
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        request = json.dumps(
+            {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ), "prefix": spack_prefix}
+        ).encode("utf-8")
+        fds = array.array("i", [0, 1, 2])
+        client.sendmsg(
+            [struct.pack("!I", len(request))],
+            [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds.tobytes())],
+        )
+        client.sendall(request)
+        replies = client.makefile("r", encoding="utf-8")
+        accepted = json.loads(replies.readline() or "{}")
+    except (OSError, ValueError):
+        client.close()
+        return None
+    if "pid" not in accepted:
+        client.close()
+        return None
+
+    # From here on the command runs in the daemon, and must not run again in this process
+    with client:
+        while True:
+            try:
+                line = replies.readline()
+                break
+            except KeyboardInterrupt:
+                os.kill(accepted["pid"], signal.SIGINT)
+            except OSError:
+                line = ""
+                break
+    try:
+        return json.loads(line)["exit_code"]
+    except (ValueError, KeyError):
+        sys.stderr.write(
+            "==> Error: the Spack daemon did not return the exit code of the command\n"
+        )
+        return 1
+
+
 def main(argv=None):
     # Find spack's location and its prefix.
     this_file = os.path.realpath(os.path.expanduser(__file__))
     spack_prefix = dn(dn(dn(dn(this_file))))
 
+    # Run the command in the Spack daemon, if there is one, without importing Spack
+    daemon_socket = os.environ.get("SPACK_DAEMON")
+    if daemon_socket:
+        exit_code = forward_to_daemon(
+            daemon_socket, spack_prefix, sys.argv[1:] if argv is None else argv
+        )
+        if exit_code is not None:
+            sys.exit(exit_code)
+
     # Add all the sys paths that allow spack libs to be imported
     sys.path[:0] = get_spack_sys_paths(spack_prefix)
 
@@ -0,0 +1,152 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Measure the memory taken by the specs of a large synthetic installation database, and the
+time taken by queries.
+
+Run with:
+
+    spack python share/spack/qa/benchmarks/database_memory.py [--records N] [--mock SPEC ...]
+        [--query SPEC ...]
+
+The database is made of copies of the nodes of specs concretized against the mock repository,
+and of the specfiles in the test data, with different hashes. The script reports the memory
+allocated to read the index, and to construct the specs of all its records. Run it before and
+after a change to compare. Queries are timed against checking every record with satisfies.
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import spack.concretize
+import spack.database
+import spack.hash_types as ht
+import spack.paths
+import spack.repo
+import spack.spec
+import spack.traverse
+import spack.util.hash
+
+
+def template_records(specs):
+    """Return the install records of all the nodes of the specs, keyed by hash"""
+    records = {}
+    for node in spack.traverse.traverse_nodes(specs, deptype=ht.dag_hash.depflag):
+        node_dict = node.node_dict_with_hashes(hash=ht.dag_hash)
+        node_dict.pop("build_spec", None)
+        records[node.dag_hash()] = {
+            "spec": node_dict,
+            "path": f"/opt/spack/{node.name}-{node.dag_hash()}",
+            "installed": True,
+            "ref_count": 0,
+            "explicit": True,
+            "installation_time": time.time(),
+        }
+    return records
+
+
+def write_index(root: str, templates: dict, num_records: int) -> int:
+    """Write an index with copies of the template records, until it has at least num_records"""
+    installs = {}
+    copy = 0
+    while len(installs) < num_records:
+        renamed = {h: spack.util.hash.b32_hash(f"{h}-{copy}") for h in templates}
+        for h, template in templates.items():
+            record = json.loads(json.dumps(template))
+            record["spec"]["hash"] = renamed[h]
+            record["path"] += f"-{copy}"
+            for dep in record["spec"].get("dependencies", []):
+                dep["hash"] = renamed[dep["hash"]]
+            installs[renamed[h]] = record
+        copy += 1
+
+    db_dir = os.path.join(root, ".spack-db")
+    os.makedirs(db_dir)
+    index = {"database": {"version": str(spack.database._DB_VERSION), "installs": installs}}
+    with open(os.path.join(db_dir, spack.database.INDEX_JSON_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return len(installs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000, help="number of install records")
+    parser.add_argument(
+        "--mock",
+        nargs="*",
+        default=["mpileaks", "patch-several-dependencies", "splice-t", "externaltest"],
+        help="specs to concretize with the mock repository",
+    )
+    parser.add_argument(
+        "--query",
+        nargs="*",
+        default=["libdwarf@20130729", "mpileaks ^mpich", "%gcc", "+shared", "^openssl"],
+        help="queries to time",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs of each query")
+    args = parser.parse_args()
+
+    specs = []
+    with spack.repo.use_repositories(spack.paths.mock_packages_path):
+        specs.extend(spack.concretize.concretize_one(s) for s in args.mock)
+    specfiles = glob.glob(os.path.join(spack.paths.test_path, "data", "specfiles", "*.json.gz"))
+    for specfile in sorted(specfiles):
+        with gzip.open(specfile, "rt", encoding="utf-8") as f:
+            specs.append(spack.spec.Spec.from_dict(json.load(f)))
+    templates = template_records(specs)
+
+    with tempfile.TemporaryDirectory() as root:
+        num_records = write_index(root, templates, args.records)
+        db = spack.database.Database(root, lock_cfg=spack.database.NO_LOCK)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with db.read_transaction():
+            read_time = time.perf_counter() - start
+            index_memory, _ = tracemalloc.get_traced_memory()
+            records = list(db._data.values())
+            for record in records:
+                record.spec
+            specs_time = time.perf_counter() - start - read_time
+            total_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        specs_memory = total_memory - index_memory
+        print(f"Database of {num_records} records, from {len(templates)} distinct nodes")
+        print(f"  read index       {index_memory / 2**20:8.1f} MiB {read_time:8.2f} s")
+        print(f"  construct specs  {specs_memory / 2**20:8.1f} MiB {specs_time:8.2f} s")
+        print(f"  per spec         {specs_memory / num_records / 2**10:8.2f} KiB")
+
+        print(f"  {'query':<24} {'cold':>9} {'warm':>9} {'satisfies':>9} {'results':>8}")
+        with db.read_transaction():
+            for query in args.query:
+                query_spec = spack.spec.Spec(query)
+                cold_times, warm_times, linear_times = [], [], []
+                for _ in range(args.repeat):
+                    # Discard the indexes, so that cold queries pay for building them
+                    db._query_index = None
+                    start = time.perf_counter()
+                    indexed = db.query_local(query_spec)
+                    cold_times.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    db.query_local(query_spec)
+                    warm_times.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    linear = [s for s in db.query_local() if s.satisfies(query_spec)]
+                    linear_times.append(time.perf_counter() - start)
+                assert indexed == linear, f"results of {query} differ"
+                print(
+                    f"  {query:<24} {statistics.median(cold_times):8.3f}s "
+                    f"{statistics.median(warm_times):8.3f}s "
+                    f"{statistics.median(linear_times):8.3f}s {len(indexed):8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
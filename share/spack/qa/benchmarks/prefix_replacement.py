@@ -0,0 +1,106 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Compare the regex based prefix replacers with the streaming ones.
+
+Run with:
+
+    spack python share/spack/qa/benchmarks/prefix_replacement.py [--prefixes N] [--size MB]
+
+The synthetic data contains many paths that share the old store root, but only a few of them
+are prefixes to be relocated, which is typical of binaries depending on many packages.
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+
+import spack.relocate_text as relocate_text
+
+OLD_ROOT = b"/home/user/spack/opt/spack/linux-x86_64/gcc-13.2.0"
+NEW_ROOT = b"/opt/spack/linux-x86_64/gcc-13.2.0"
+
+
+def make_prefix_to_prefix(num_prefixes: int):
+    rng = random.Random(0)
+    result = {}
+    for i in range(num_prefixes):
+        digest = bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz0123456789", k=32))
+        name = b"pkg%d-1.0-" % i + digest
+        result[OLD_ROOT + b"/" + name] = NEW_ROOT + b"/" + name
+    result[OLD_ROOT] = NEW_ROOT
+    return result
+
+
+def make_data(prefix_to_prefix, size_mb: int) -> bytes:
+    rng = random.Random(1)
+    prefixes = list(prefix_to_prefix)
+    chunks = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        if rng.random() < 0.01:
+            chunk = rng.choice(prefixes) + b"/lib/libfoo.so\0"
+        else:
+            chunk = OLD_ROOT[: rng.randint(1, len(OLD_ROOT))] + bytes(rng.choices(b"xyz \0", k=64))
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks)
+
+
+def measure(replacer, data: bytes):
+    """Return the time and the peak memory allocated to relocate the data in a file, together
+    with the relocated data. Memory is measured in a separate run, since tracing allocations
+    slows down the replacers."""
+    with tempfile.TemporaryFile() as f:
+        f.write(data)
+        f.seek(0)
+        start = time.perf_counter()
+        replacer.apply_to_file(f)
+        elapsed = time.perf_counter() - start
+        f.seek(0)
+        result = f.read()
+
+    with tempfile.TemporaryFile() as f:
+        f.write(data)
+        f.seek(0)
+        tracemalloc.start()
+        replacer.apply_to_file(f)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prefixes", type=int, default=200, help="number of prefixes")
+    parser.add_argument("--size", type=int, default=16, help="size of the data in MB")
+    args = parser.parse_args()
+
+    prefix_to_prefix = make_prefix_to_prefix(args.prefixes)
+    data = make_data(prefix_to_prefix, args.size)
+    print(f"Replacing {len(prefix_to_prefix)} prefixes in {args.size} MB of data")
+
+    for kind, regex_cls, streaming_cls in (
+        (
+            "text",
+            relocate_text.TextFilePrefixReplacer,
+            relocate_text.StreamingTextFilePrefixReplacer,
+        ),
+        (
+            "binary",
+            relocate_text.BinaryFilePrefixReplacer,
+            relocate_text.StreamingBinaryFilePrefixReplacer,
+        ),
+    ):
+        regex_time, regex_mem, expected = measure(regex_cls(prefix_to_prefix), data)
+        stream_time, stream_mem, actual = measure(streaming_cls(prefix_to_prefix), data)
+        assert actual == expected, f"{kind} replacers give different results"
+        print(f"  {kind:<7} regex     {regex_time:8.3f} s  {regex_mem / 2**20:8.1f} MB peak")
+        print(f"  {kind:<7} streaming {stream_time:8.3f} s  {stream_mem / 2**20:8.1f} MB peak")
+        print(f"  {kind:<7} speedup   {regex_time / stream_time:8.2f} x")
+
+
+if __name__ == "__main__":
+    main()
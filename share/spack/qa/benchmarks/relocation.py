@@ -0,0 +1,82 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Compare serial and parallel relocation of a synthetic install prefix.
+
+Run with:
+
+    spack python share/spack/qa/benchmarks/relocation.py [--files N] [--size KB] [--jobs N]
+
+Half of the files are text files and half are binaries. Every file contains the old prefix a few
+times, both as plain text and as null-terminated C-strings.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import spack.config
+import spack.relocate
+
+OLD_PREFIX = "/old/" + "padding" * 20 + "/prefix"
+NEW_PREFIX = "/new/prefix"
+
+
+def make_prefix(root: str, num_files: int, size_kb: int):
+    textfiles, binaries = [], []
+    filler = os.urandom(1024).replace(b"\0", b"x")
+    for i in range(num_files):
+        if i % 2:
+            path = os.path.join(root, f"lib{i}.so")
+            chunk = filler + f"{OLD_PREFIX}/lib/lib{i}.so.1\0".encode()
+            binaries.append(path)
+        else:
+            path = os.path.join(root, f"script{i}.sh")
+            chunk = f"# generated\nexport PATH={OLD_PREFIX}/bin:$PATH\n".encode() * 16
+            textfiles.append(path)
+        with open(path, "wb") as f:
+            f.write(chunk * max(1, (size_kb * 1024) // len(chunk)))
+    return textfiles, binaries
+
+
+def time_relocation(template: str, jobs: int) -> float:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        prefix = os.path.join(tmpdir, "prefix")
+        shutil.copytree(template, prefix)
+        textfiles = [os.path.join(prefix, f) for f in sorted(os.listdir(prefix)) if "script" in f]
+        binaries = [os.path.join(prefix, f) for f in sorted(os.listdir(prefix)) if "lib" in f]
+        start = time.perf_counter()
+        spack.relocate.relocate_text_and_binaries(
+            textfiles, binaries, {OLD_PREFIX: NEW_PREFIX}, jobs=jobs
+        )
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000, help="number of files in the prefix")
+    parser.add_argument("--size", type=int, default=64, help="size of each file in KB")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=spack.config.determine_number_of_jobs(parallel=True),
+        help="number of worker processes for the parallel run",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of each mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as template:
+        make_prefix(template, args.files, args.size)
+        print(f"Relocating {args.files} files of {args.size} KB")
+        results = {}
+        for label, jobs in (("serial", 1), (f"parallel ({args.jobs} jobs)", args.jobs)):
+            results[label] = min(time_relocation(template, jobs) for _ in range(args.repeat))
+            print(f"  {label:<24} {results[label]:8.3f} s")
+
+    serial, parallel = results.values()
+    print(f"  speedup                  {serial / parallel:8.2f} x")
+
+
+if __name__ == "__main__":
+    main()
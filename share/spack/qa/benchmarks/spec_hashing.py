@@ -0,0 +1,133 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Compare hashing nodes from their to_node_dict() with the streaming hashing of Spec.spec_hash.
+
+Run with:
+
+    spack python share/spack/qa/benchmarks/spec_hashing.py [--mock SPEC ...] [--builtin SPEC ...]
+
+Specs are concretized against the mock and the builtin repositories. The specfiles in the test
+data, which come from the builtin repository, are always included. The script checks that both
+methods give the same hash for every node, for all the hash types, before timing them.
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import statistics
+import time
+
+import spack.concretize
+import spack.hash_types as ht
+import spack.paths
+import spack.repo
+import spack.spec
+import spack.traverse
+import spack.util.hash
+
+HASHES = [ht.dag_hash, ht.process_hash]
+
+
+def uncached_target_to_dict(target):
+    """Dictionary of a target in specs, as Spack used to compute it for every node"""
+    target_data = target.to_dict()
+    target_data.pop("compilers", None)
+    return target_data
+
+
+def node_dict_hash(spec, hash):
+    """Hash of a node computed from its to_node_dict(), as Spack used to do"""
+    json_text = json.dumps(
+        spec.to_node_dict(hash=hash),
+        ensure_ascii=True,
+        indent=None,
+        separators=(",", ":"),
+        sort_keys=False,
+    )
+    out = spack.util.hash.b32_hash(json_text)
+    if spec.build_spec is not spec:
+        return out[:-7] + node_dict_hash(spec.build_spec, hash)[-7:]
+    return out
+
+
+def streaming_hash(spec, hash):
+    return spec.spec_hash(hash)
+
+
+def all_nodes(specs):
+    return list(
+        spack.traverse.traverse_nodes(specs, order="post", deptype=ht.process_hash.depflag)
+    )
+
+
+def time_hashing(nodes, hash_fn) -> float:
+    """Hash all the nodes from the leaves to the roots, as it happens when specs are concretized,
+    and return the time it took."""
+    for node in nodes:
+        for hash in HASHES:
+            setattr(node, hash.attr, None)
+    start = time.perf_counter()
+    for node in nodes:
+        for hash in HASHES:
+            setattr(node, hash.attr, hash_fn(node, hash))
+    return time.perf_counter() - start
+
+
+def time_node_dict_hashing(nodes) -> float:
+    """Time hashing nodes from their to_node_dict(), without the cache of target dictionaries"""
+    cached_target_to_dict = spack.spec._target_to_dict
+    spack.spec._target_to_dict = uncached_target_to_dict
+    try:
+        return time_hashing(nodes, node_dict_hash)
+    finally:
+        spack.spec._target_to_dict = cached_target_to_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--mock",
+        nargs="*",
+        default=["mpileaks", "patch-several-dependencies", "splice-t", "externaltest"],
+        help="specs to concretize with the mock repository",
+    )
+    parser.add_argument(
+        "--builtin", nargs="*", default=[], help="specs to concretize with the builtin repository"
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="number of runs of each method")
+    args = parser.parse_args()
+
+    specs = []
+    with spack.repo.use_repositories(spack.paths.mock_packages_path):
+        specs.extend(spack.concretize.concretize_one(s) for s in args.mock)
+    specs.extend(spack.concretize.concretize_one(s) for s in args.builtin)
+    specfiles = glob.glob(os.path.join(spack.paths.test_path, "data", "specfiles", "*.json.gz"))
+    for specfile in sorted(specfiles):
+        with gzip.open(specfile, "rt", encoding="utf-8") as f:
+            specs.append(spack.spec.Spec.from_dict(json.load(f)))
+
+    nodes = all_nodes(specs)
+    for node in nodes:
+        for hash in HASHES:
+            expected = node_dict_hash(node, hash)
+            actual = streaming_hash(node, hash)
+            assert actual == expected, f"{hash.name} of {node.name} differ"
+    print(f"Hashes of {len(nodes)} nodes of {len(specs)} specs are identical")
+
+    # Alternate the methods, so that both are equally affected by the load of the machine
+    node_dict_times, streaming_times = [], []
+    for _ in range(args.repeat):
+        node_dict_times.append(time_node_dict_hashing(nodes))
+        streaming_times.append(time_hashing(nodes, streaming_hash))
+    node_dict_time = statistics.median(node_dict_times)
+    streaming_time = statistics.median(streaming_times)
+    speedup = statistics.median(a / b for a, b in zip(node_dict_times, streaming_times))
+    print(f"  to_node_dict  {node_dict_time * 1000:8.2f} ms")
+    print(f"  streaming     {streaming_time * 1000:8.2f} ms")
+    print(f"  speedup       {speedup:8.2f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Copyright Spack Project Developers. See COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Compare serial and concurrent linking of a view of synthetic install prefixes.
+
+Run with:
+
+    spack python share/spack/qa/benchmarks/view_linking.py [--specs N] [--files N] [--jobs N]
+
+Each prefix contains files spread over a few nested directories. Use ``--latency`` to emulate a
+network filesystem, where every link costs a round trip to the server.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import spack.filesystem_view as fsv
+import spack.repo
+import spack.spec
+import spack.store
+
+
+def make_specs(root: str, num_specs: int, num_files: int):
+    specs = []
+    for name in spack.repo.PATH.all_package_names():
+        if len(specs) == num_specs:
+            break
+        spec = spack.spec.Spec(name)
+        spec.prefix = os.path.join(root, name)
+        spec._mark_concrete()
+        if fsv._add_files_to_view_module(spec) != "spack.package_base":
+            continue
+        os.makedirs(os.path.join(spec.prefix, spack.store.STORE.layout.metadata_dir))
+        for i in range(num_files):
+            directory = os.path.join(spec.prefix, f"lib{i % 4}", f"sub{i % 16}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"{name}-{i}"), "w", encoding="utf-8") as f:
+                f.write(name)
+        specs.append(spec)
+    return specs
+
+
+def time_linking(specs, jobs: int, link_type: str, latency: float) -> float:
+    with tempfile.TemporaryDirectory() as root:
+        view = fsv.SimpleFilesystemView(
+            root, spack.store.STORE.layout, link_type=link_type, link_jobs=jobs
+        )
+        if latency:
+            link = view._link
+
+            def slow_link(*args):
+                time.sleep(latency)
+                link(*args)
+
+            view._link = slow_link
+
+        start = time.perf_counter()
+        view.add_specs(*specs)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--specs", type=int, default=50, help="number of prefixes in the view")
+    parser.add_argument("--files", type=int, default=2000, help="number of files per prefix")
+    parser.add_argument(
+        "--jobs", type=int, default=8, help="number of threads for the concurrent run"
+    )
+    parser.add_argument(
+        "--link-type", default="symlink", choices=["symlink", "hardlink", "copy"], help="link type"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="emulated latency of each link in ms"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of each mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as store:
+        specs = make_specs(store, args.specs, args.files)
+        print(
+            f"Linking {len(specs)} prefixes of {args.files} files with {args.link_type}s, "
+            f"{args.latency} ms latency"
+        )
+        results = {}
+        for label, jobs in (("serial", 1), (f"concurrent ({args.jobs} jobs)", args.jobs)):
+            results[label] = min(
+                time_linking(specs, jobs, args.link_type, args.latency / 1000)
+                for _ in range(args.repeat)
+            )
+            print(f"  {label:<24} {results[label]:8.3f} s")
+
+    serial, concurrent = results.values()
+    print(f"  speedup                  {serial / concurrent:8.2f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -369,6 +369,7 @@ complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a config -d 'get an
 complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a containerize -d 'creates recipes to build images for different container runtimes'
 complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a containerise -d 'creates recipes to build images for different container runtimes'
 complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a create -d 'create a new package file'
+complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a daemon -d 'serve Spack commands from a long-lived process'
 complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a debug -d 'debugging commands for troubleshooting Spack'
 complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a deconcretize -d 'remove specs from the concretized lockfile of an environment'
 complete -c spack -n '__fish_spack_using_command_pos 0 ' -f -a dependencies -d 'show dependencies of a package'
@@ -1017,7 +1018,7 @@ complete -c spack -n '__fish_spack_using_command ci reproduce-build' -l gpg-url
 complete -c spack -n '__fish_spack_using_command ci reproduce-build' -l gpg-url -r -d 'URL to public GPG key for validating binary cache installs'
 
 # spack clean
-set -g __fish_spack_optspecs_spack_clean h/help s/stage d/downloads f/failures m/misc-cache p/python-cache b/bootstrap a/all
+set -g __fish_spack_optspecs_spack_clean h/help s/stage d/downloads f/failures m/misc-cache concretization-cache p/python-cache b/bootstrap a/all
 complete -c spack -n '__fish_spack_using_command_pos_remainder 0 clean' -f -k -a '(__fish_spack_specs)'
 complete -c spack -n '__fish_spack_using_command clean' -s h -l help -f -a help
 complete -c spack -n '__fish_spack_using_command clean' -s h -l help -d 'show this help message and exit'
@@ -1029,6 +1030,8 @@ complete -c spack -n '__fish_spack_using_command clean' -s f -l failures -f -a f
 complete -c spack -n '__fish_spack_using_command clean' -s f -l failures -d 'force removal of all install failure tracking markers'
 complete -c spack -n '__fish_spack_using_command clean' -s m -l misc-cache -f -a misc_cache
 complete -c spack -n '__fish_spack_using_command clean' -s m -l misc-cache -d 'remove long-lived caches, like the virtual package index'
+complete -c spack -n '__fish_spack_using_command clean' -l concretization-cache -f -a concretization_cache
+complete -c spack -n '__fish_spack_using_command clean' -l concretization-cache -d 'remove cached concretization results'
 complete -c spack -n '__fish_spack_using_command clean' -s p -l python-cache -f -a python_cache
 complete -c spack -n '__fish_spack_using_command clean' -s p -l python-cache -d 'remove .pyc, .pyo files and __pycache__ folders'
 complete -c spack -n '__fish_spack_using_command clean' -s b -l bootstrap -f -a bootstrap
@@ -1317,6 +1320,13 @@ complete -c spack -n '__fish_spack_using_command create' -l skip-editor -d 'skip
 complete -c spack -n '__fish_spack_using_command create' -s b -l batch -f -a batch
 complete -c spack -n '__fish_spack_using_command create' -s b -l batch -d 'don'"'"'t ask which versions to checksum'
 
+# spack daemon
+set -g __fish_spack_optspecs_spack_daemon h/help socket=
+complete -c spack -n '__fish_spack_using_command daemon' -s h -l help -f -a help
+complete -c spack -n '__fish_spack_using_command daemon' -s h -l help -d 'show this help message and exit'
+complete -c spack -n '__fish_spack_using_command daemon' -l socket -r -f -a socket
+complete -c spack -n '__fish_spack_using_command daemon' -l socket -r -d 'path of the Unix socket to listen on'
+
 # spack debug
 set -g __fish_spack_optspecs_spack_debug h/help
 complete -c spack -n '__fish_spack_using_command_pos 0 debug' -f -a report -d 'print information useful for bug reports'
@@ -2014,7 +2024,7 @@ complete -c spack -n '__fish_spack_using_command info' -l variants-by-name -f -a
 complete -c spack -n '__fish_spack_using_command info' -l variants-by-name -d 'list variants in strict name order; don'"'"'t group by condition'
 
 # spack install
-set -g __fish_spack_optspecs_spack_install h/help only= u/until= j/jobs= overwrite fail-fast keep-prefix keep-stage dont-restage use-cache no-cache cache-only use-buildcache= include-build-deps no-check-signature show-log-on-error source n/no-checksum v/verbose fake only-concrete add no-add f/file= clean dirty test= log-format= log-file= help-cdash cdash-upload-url= cdash-build= cdash-site= cdash-track= cdash-buildstamp= y/yes-to-all U/fresh reuse fresh-roots deprecated
+set -g __fish_spack_optspecs_spack_install h/help only= u/until= j/jobs= overwrite fail-fast keep-prefix keep-stage dont-restage use-cache no-cache cache-only use-buildcache= include-build-deps no-check-signature show-log-on-error source n/no-checksum v/verbose fake p/concurrent-packages= only-concrete add no-add f/file= clean dirty test= log-format= log-file= help-cdash cdash-upload-url= cdash-build= cdash-site= cdash-track= cdash-buildstamp= y/yes-to-all U/fresh reuse fresh-roots deprecated
 complete -c spack -n '__fish_spack_using_command_pos_remainder 0 install' -f -k -a '(__fish_spack_specs)'
 complete -c spack -n '__fish_spack_using_command install' -s h -l help -f -a help
 complete -c spack -n '__fish_spack_using_command install' -s h -l help -d 'show this help message and exit'
@@ -2056,6 +2066,8 @@ complete -c spack -n '__fish_spack_using_command install' -s v -l verbose -f -a
 complete -c spack -n '__fish_spack_using_command install' -s v -l verbose -d 'display verbose build output while installing'
 complete -c spack -n '__fish_spack_using_command install' -l fake -f -a fake
 complete -c spack -n '__fish_spack_using_command install' -l fake -d 'fake install for debug purposes'
+complete -c spack -n '__fish_spack_using_command install' -s p -l concurrent-packages -r -f -a concurrent_packages
+complete -c spack -n '__fish_spack_using_command install' -s p -l concurrent-packages -r -d 'build up to N packages at the same time (overrides config:concurrent_packages)'
 complete -c spack -n '__fish_spack_using_command install' -l only-concrete -f -a only_concrete
 complete -c spack -n '__fish_spack_using_command install' -l only-concrete -d '(with environment) only install already concretized specs'
 complete -c spack -n '__fish_spack_using_command install' -l add -f -a add
@@ -2132,7 +2144,7 @@ complete -c spack -n '__fish_spack_using_command list' -l update -r -f -a update
 complete -c spack -n '__fish_spack_using_command list' -l update -r -d 'write output to the specified file, if any package is newer'
 
 # spack load
-set -g __fish_spack_optspecs_spack_load h/help sh csh fish bat pwsh first list
+set -g __fish_spack_optspecs_spack_load h/help sh csh fish bat pwsh first list print-cache-stats
 complete -c spack -n '__fish_spack_using_command_pos_remainder 0 load' -f -a '(__fish_spack_installed_specs)'
 complete -c spack -n '__fish_spack_using_command load' -s h -l help -f -a help
 complete -c spack -n '__fish_spack_using_command load' -s h -l help -d 'show this help message and exit'
@@ -2150,6 +2162,8 @@ complete -c spack -n '__fish_spack_using_command load' -l first -f -a load_first
 complete -c spack -n '__fish_spack_using_command load' -l first -d 'load the first match if multiple packages match the spec'
 complete -c spack -n '__fish_spack_using_command load' -l list -f -a list
 complete -c spack -n '__fish_spack_using_command load' -l list -d 'show loaded packages: same as `spack find --loaded`'
+complete -c spack -n '__fish_spack_using_command load' -l print-cache-stats -f -a print_cache_stats
+complete -c spack -n '__fish_spack_using_command load' -l print-cache-stats -d 'print statistics of the cache of environment modifications to stderr'
 
 # spack location
 set -g __fish_spack_optspecs_spack_location h/help m/module-dir r/spack-root i/install-dir p/package-dir P/packages s/stage-dir S/stages c/source-dir b/build-dir e/env= first
@@ -2249,6 +2263,7 @@ complete -c spack -n '__fish_spack_using_command_pos 0 mirror' -f -a rm -d 'remo
 complete -c spack -n '__fish_spack_using_command_pos 0 mirror' -f -a set-url -d 'change the URL of a mirror'
 complete -c spack -n '__fish_spack_using_command_pos 0 mirror' -f -a set -d 'configure the connection details of a mirror'
 complete -c spack -n '__fish_spack_using_command_pos 0 mirror' -f -a list -d 'print out available mirrors to the console'
+complete -c spack -n '__fish_spack_using_command_pos 0 mirror' -f -a stats -d 'show the latency and failures of source mirrors, recorded when racing them'
 complete -c spack -n '__fish_spack_using_command mirror' -s h -l help -f -a help
 complete -c spack -n '__fish_spack_using_command mirror' -s h -l help -d 'show this help message and exit'
 complete -c spack -n '__fish_spack_using_command mirror' -s n -l no-checksum -f -a no_checksum
@@ -2442,6 +2457,11 @@ complete -c spack -n '__fish_spack_using_command mirror list' -s h -l help -d 's
 complete -c spack -n '__fish_spack_using_command mirror list' -l scope -r -f -a '_builtin defaults system site user command_line'
 complete -c spack -n '__fish_spack_using_command mirror list' -l scope -r -d 'configuration scope to read from'
 
+# spack mirror stats
+set -g __fish_spack_optspecs_spack_mirror_stats h/help
+complete -c spack -n '__fish_spack_using_command mirror stats' -s h -l help -f -a help
+complete -c spack -n '__fish_spack_using_command mirror stats' -s h -l help -d 'show this help message and exit'
+
 # spack module
 set -g __fish_spack_optspecs_spack_module h/help
 complete -c spack -n '__fish_spack_using_command_pos 0 module' -f -a lmod -d 'manipulate hierarchical module files'
@@ -3153,7 +3173,7 @@ complete -c spack -n '__fish_spack_using_command url stats' -l show-issues -f -a
 complete -c spack -n '__fish_spack_using_command url stats' -l show-issues -d 'show packages with issues (md5 hashes, http urls)'
 
 # spack verify
-set -g __fish_spack_optspecs_spack_verify h/help l/local j/json a/all s/specs f/files
+set -g __fish_spack_optspecs_spack_verify h/help l/local j/json a/all fast jobs= s/specs f/files
 complete -c spack -n '__fish_spack_using_command_pos_remainder 0 verify' $__fish_spack_force_files -a '(__fish_spack_installed_specs)'
 complete -c spack -n '__fish_spack_using_command verify' -s h -l help -f -a help
 complete -c spack -n '__fish_spack_using_command verify' -s h -l help -d 'show this help message and exit'
@@ -3163,6 +3183,10 @@ complete -c spack -n '__fish_spack_using_command verify' -s j -l json -f -a json
 complete -c spack -n '__fish_spack_using_command verify' -s j -l json -d 'ouptut json-formatted errors'
 complete -c spack -n '__fish_spack_using_command verify' -s a -l all -f -a all
 complete -c spack -n '__fish_spack_using_command verify' -s a -l all -d 'verify all packages'
+complete -c spack -n '__fish_spack_using_command verify' -l fast -f -a fast
+complete -c spack -n '__fish_spack_using_command verify' -l fast -d 'don'"'"'t hash files whose size, mtime, ctime and inode match the manifest'
+complete -c spack -n '__fish_spack_using_command verify' -l jobs -r -f -a jobs
+complete -c spack -n '__fish_spack_using_command verify' -l jobs -r -d 'number of threads hashing files (default: number of available cpus)'
 complete -c spack -n '__fish_spack_using_command verify' -s s -l specs -f -a type
 complete -c spack -n '__fish_spack_using_command verify' -s s -l specs -d 'treat entries as specs (default)'
 complete -c spack -n '__fish_spack_using_command verify' -s f -l files -f -a type